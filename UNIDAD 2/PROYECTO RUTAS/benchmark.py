@@ -0,0 +1,232 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import numpy as np
+import pandas as pd
+from typing import Callable, List, Tuple, Optional, Dict, Any
+
+from distancia import generarMatrizDistancias
+from funcionDeCosto import calcularCosto, calcularCostoArcos
+from solucion import solucionInicial, TIPO_CD, TIPO_TIENDA
+from solucionArreglo import SolucionArreglo
+from recocidoSimulado import recocidoSimulado
+from candidatos import construirCandidatos
+from vecindario import Vecindario, MEZCLA_DEFAULT
+
+# caja geografica de los datos de Culiacan (lat min, lat max, lon min, lon max)
+CAJA_CULIACAN = (24.70, 24.90, -107.50, -107.30)
+
+# rango del costo de combustible por km de los datos reales
+COSTO_MIN = 0.02
+COSTO_MAX = 4.1
+
+# recocido corto y fijo para que los tiempos sean comparables entre corridas
+PARAMETROS_RECOCIDO = {"T0": 2.0, "TF": 0.1, "alpha": 0.9, "L": 200}
+
+DIR_BASE = os.path.dirname(os.path.abspath(__file__))
+SALIDA_JSON = os.path.join(DIR_BASE, "benchmark_resultados.json")
+
+
+# funcion para generar una instancia sintetica con n nodos de los cuales m son CDs
+def generarInstancia(
+    n: int,
+    m: int,
+    semilla: int = 0,
+    caja: Tuple[float, float, float, float] = CAJA_CULIACAN
+) -> Tuple[pd.DataFrame, np.ndarray]:
+    # devuelve (coordenadas, costo de combustible) con el mismo formato que los CSV de datos/:
+    # los m primeros nodos son CDs y el resto tiendas, repartidos uniformemente en la caja
+    # el costo de combustible es simetrico y con diagonal cero como la matriz real
+    if not 0 < m < n:
+        raise ValueError(f"se necesitan 0 < m < n (n = {n}, m = {m})")
+    gen = np.random.default_rng(semilla)
+    latMin, latMax, lonMin, lonMax = caja
+    tiendas = n - m
+    coordenadas = pd.DataFrame({
+        "Tipo": [TIPO_CD] * m + [TIPO_TIENDA] * tiendas,
+        "Nombre": [f"{TIPO_CD} {i + 1}" for i in range(m)] + [f"{TIPO_TIENDA} {i + 1}" for i in range(tiendas)],
+        "Latitud_WGS84": gen.uniform(latMin, latMax, n).round(6),
+        "Longitud_WGS84": gen.uniform(lonMin, lonMax, n).round(6),
+        "Capacidad_Venta": gen.integers(5000, 27000, n),
+        "Capacidad_Almacenamiento": gen.integers(3000, 50000, n),
+        "Nivel_Tienda": ["N/A"] * m + gen.choice(["A", "B", "C"], tiendas).tolist(),
+    })
+    costo = np.triu(gen.uniform(COSTO_MIN, COSTO_MAX, (n, n)), 1)
+    costo += costo.T
+    return coordenadas, costo
+
+# funcion para escribir una instancia sintetica como los CSV de datos/
+def guardarInstancia(directorio: str, coordenadas: pd.DataFrame, costo: np.ndarray) -> Tuple[str, str]:
+    # devuelve (archivo de coordenadas, archivo de costo) para usarlos con cargarDatos
+    os.makedirs(directorio, exist_ok=True)
+    archCoords = os.path.join(directorio, "coordenadas.csv")
+    archCosto = os.path.join(directorio, "costo_combustible.csv")
+    coordenadas.to_csv(archCoords, index=False, encoding='latin1')
+    columnas = [f"Nodo_{i + 1}" for i in range(len(costo))]
+    pd.DataFrame(costo, columns=columnas).to_csv(archCosto, index=False)
+    return archCoords, archCosto
+
+# funcion para medir el tiempo de una funcion
+def cronometrar(funcion: Callable[[], Any], repeticiones: int = 5, llamadas: int = 1) -> Dict[str, float]:
+    # ejecuta la funcion una vez para calentar y despues `repeticiones` veces `llamadas`
+    # seguidas; los tiempos se reportan por llamada (min, mediana y media en segundos)
+    funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(llamadas):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / llamadas)
+    tiempos = np.array(tiempos)
+    return {
+        "min": float(tiempos.min()),
+        "mediana": float(np.median(tiempos)),
+        "media": float(tiempos.mean()),
+        "repeticiones": repeticiones,
+        "llamadas": llamadas,
+    }
+
+# funcion para medir todas las etapas sobre una instancia de n nodos y m CDs
+def benchmarkInstancia(
+    n: int,
+    m: int,
+    semilla: int = 0,
+    repeticiones: int = 5,
+    conRecocido: bool = True
+) -> Dict[str, Any]:
+    coordenadas, costo = generarInstancia(n, m, semilla)
+    etapas: Dict[str, Any] = {}
+
+    etapas["generarMatrizDistancias"] = cronometrar(lambda: generarMatrizDistancias(coordenadas), repeticiones)
+    distancia = generarMatrizDistancias(coordenadas)
+    arcos = np.ascontiguousarray(distancia * costo)
+    solucion = solucionInicial(distancia, coordenadas)
+
+    # funcion de costo original (tramo por tramo) y con la matriz de arcos precalculada
+    etapas["calcularCosto"] = cronometrar(lambda: calcularCosto(solucion, distancia, costo), repeticiones)
+    etapas["calcularCostoArcos"] = cronometrar(lambda: calcularCostoArcos(solucion, arcos), repeticiones)
+
+    # un vecino por llamada (swap en sitio sobre el arreglo, como en el recocido):
+    # se mide en grupos para que el reloj tenga resolucion
+    random.seed(semilla)
+    arreglo = SolucionArreglo.desdeRutas(solucion)
+    def generarVecino():
+        movimiento = arreglo.proponerSwap()
+        if movimiento is not None:
+            arreglo.aplicarSwap(*movimiento)
+    etapas["generarVecinos"] = cronometrar(generarVecino, repeticiones, llamadas=100)
+
+    if conRecocido:
+        candidatos = construirCandidatos(
+            coordenadas['Latitud_WGS84'].values, coordenadas['Longitud_WGS84'].values, 8,
+            (coordenadas['Tipo'] == TIPO_TIENDA).values
+        )
+        vecindario = Vecindario(MEZCLA_DEFAULT, candidatos=candidatos)
+        inicio = time.perf_counter()
+        _, costoFinal, historial = recocidoSimulado(
+            distancia, costo, matrizArcos=arcos, semilla=semilla, verbose=False,
+            vecindario=vecindario, solucionInicio=solucion, **PARAMETROS_RECOCIDO
+        )
+        segundos = time.perf_counter() - inicio
+        etapas["recocidoSimulado"] = {
+            "segundos": segundos,
+            "iteraciones": len(historial),
+            "iteracionesPorSegundo": len(historial) / segundos,
+            "costoInicial": historial.primero,
+            "costoFinal": costoFinal,
+            "parametros": PARAMETROS_RECOCIDO,
+        }
+
+    return {"n": n, "m": m, "semilla": semilla, "etapas": etapas}
+
+# funcion para correr el benchmark sobre varios tamanos y guardar el JSON
+def ejecutarBenchmarks(
+    tamanos: List[int],
+    cds: int = 10,
+    semilla: int = 0,
+    repeticiones: int = 5,
+    conRecocido: bool = True,
+    salida: Optional[str] = SALIDA_JSON
+) -> Dict[str, Any]:
+    resultados = {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesador": platform.processor() or platform.machine(),
+        "instancias": [],
+    }
+    print("\n| Nodos | CDs | Distancias (s) | Costo (ms) | Costo arcos (ms) | Vecino (us) | Recocido (it/s) |")
+    print("|-------|-----|----------------|------------|------------------|-------------|-----------------|")
+    for n in tamanos:
+        instancia = benchmarkInstancia(n, cds, semilla, repeticiones, conRecocido)
+        resultados["instancias"].append(instancia)
+        e = instancia["etapas"]
+        recocido = f"{e['recocidoSimulado']['iteracionesPorSegundo']:,.0f}" if conRecocido else "-"
+        print(f"| {n:^5} | {cds:^3} | {e['generarMatrizDistancias']['mediana']:^14.4f} "
+              f"| {e['calcularCosto']['mediana'] * 1e3:^10.3f} | {e['calcularCostoArcos']['mediana'] * 1e3:^16.3f} "
+              f"| {e['generarVecinos']['mediana'] * 1e6:^11.1f} | {recocido:^15} |")
+
+    if salida:
+        with open(salida, 'w', encoding='utf-8') as f:
+            json.dump(resultados, f, indent=1)
+        print(f"\nResultados guardados en '{salida}'")
+    return resultados
+
+# funcion para comparar dos archivos de resultados (anterior vs actual)
+def compararBenchmarks(anterior: Dict[str, Any], actual: Dict[str, Any], tolerancia: float = 1.2) -> List[Tuple[int, str, float]]:
+    # compara las medianas de cada etapa por tamano de instancia; devuelve las
+    # regresiones (n, etapa, razon) con razon = actual / anterior mayor que la tolerancia
+    previas = {(i["n"], i["m"]): i["etapas"] for i in anterior["instancias"]}
+    regresiones = []
+    print("\n| Nodos | Etapa                   | Anterior (s) | Actual (s) | Razon |")
+    print("|-------|-------------------------|--------------|------------|-------|")
+    for instancia in actual["instancias"]:
+        etapasPrevias = previas.get((instancia["n"], instancia["m"]))
+        if etapasPrevias is None:
+            continue
+        for etapa, medida in instancia["etapas"].items():
+            if etapa not in etapasPrevias:
+                continue
+            # el recocido se compara por su tiempo total, las demas etapas por la mediana
+            clave = "segundos" if etapa == "recocidoSimulado" else "mediana"
+            antes, ahora = etapasPrevias[etapa][clave], medida[clave]
+            razon = ahora / antes if antes > 0 else float("inf")
+            marca = " <-" if razon > tolerancia else ""
+            print(f"| {instancia['n']:^5} | {etapa:<23} | {antes:^12.6f} | {ahora:^10.6f} | {razon:^5.2f} |{marca}")
+            if razon > tolerancia:
+                regresiones.append((instancia["n"], etapa, razon))
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark del optimizador de rutas con instancias sinteticas")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[100, 500, 1000, 2000], help="numero de nodos de cada instancia")
+    parser.add_argument("--cds", type=int, default=10, help="numero de centros de distribucion")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--sin-recocido", action="store_true", help="omite la corrida del recocido")
+    parser.add_argument("--salida", default=SALIDA_JSON, help="archivo JSON de resultados")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para detectar regresiones")
+    argumentos = parser.parse_args()
+
+    # la corrida anterior se lee antes de medir: si --comparar y --salida son el mismo
+    # archivo, el nuevo resultado lo sobrescribe y se compararia la corrida consigo misma
+    anterior = None
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding='utf-8') as f:
+            anterior = json.load(f)
+
+    resultados = ejecutarBenchmarks(
+        argumentos.tamanos, argumentos.cds, argumentos.semilla,
+        argumentos.repeticiones, not argumentos.sin_recocido, argumentos.salida
+    )
+    if anterior is not None:
+        regresiones = compararBenchmarks(anterior, resultados)
+        if regresiones:
+            print(f"\n{len(regresiones)} etapas mas lentas que la corrida anterior")
+            sys.exit(1)
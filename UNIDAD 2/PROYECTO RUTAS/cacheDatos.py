@@ -0,0 +1,63 @@
+import os
+import hashlib
+import numpy as np
+from typing import List, Optional
+
+# version del formato de la cache, cambiarla invalida todas las matrices guardadas
+VERSION_CACHE = 1
+
+# funcion para calcular la clave de cache a partir de los archivos fuente
+def claveCache(archivos: List[str], extra: str = "") -> str:
+    # la clave combina el hash del contenido, la fecha de modificacion y el tamaño
+    # de cada archivo, cualquier cambio en los datos genera una clave nueva
+    h = hashlib.sha1(f"v{VERSION_CACHE}|{extra}".encode())
+    for archivo in archivos:
+        info = os.stat(archivo)
+        h.update(f"|{os.path.basename(archivo)}|{info.st_mtime_ns}|{info.st_size}|".encode())
+        with open(archivo, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloque)
+    return h.hexdigest()[:16]
+
+# funcion para obtener la ruta del archivo binario de una matriz en la cache
+def rutaCache(dirCache: str, nombre: str, clave: str) -> str:
+    return os.path.join(dirCache, f"{nombre}_{clave}.npy")
+
+# funcion para guardar una matriz en la cache
+def guardarMatriz(ruta: str, matriz: np.ndarray) -> None:
+    # se escribe primero a un archivo temporal y luego se renombra para que
+    # una ejecucion interrumpida nunca deje una matriz a medias en la cache
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = ruta + ".tmp"
+    with open(temporal, 'wb') as f:
+        np.save(f, np.ascontiguousarray(matriz))
+    os.replace(temporal, ruta)
+
+# funcion para cargar una matriz de la cache como mapa de memoria
+def cargarMatriz(ruta: str) -> Optional[np.ndarray]:
+    # devuelve None si la matriz no esta en la cache
+    if not os.path.exists(ruta):
+        return None
+    # mmap_mode evita leer la matriz completa a RAM, las paginas se cargan al usarse
+    # np.asarray deja una vista ndarray sobre el mapa (sin copia) para indexar mas rapido
+    return np.asarray(np.load(ruta, mmap_mode='r'))
+
+# funcion para limpiar versiones viejas de una matriz en la cache
+def limpiarCache(dirCache: str, nombre: str, clave: str) -> None:
+    if not os.path.isdir(dirCache):
+        return
+    vigente = os.path.basename(rutaCache(dirCache, nombre, clave))
+    for archivo in os.listdir(dirCache):
+        if archivo.startswith(f"{nombre}_") and archivo.endswith(".npy") and archivo != vigente:
+            os.remove(os.path.join(dirCache, archivo))
+
+# funcion para encontrar la clave de la version mas reciente de una matriz en la cache
+def claveAnterior(dirCache: str, nombre: str) -> Optional[str]:
+    # sirve para reutilizar una matriz vieja cuando los datos cambiaron solo un poco
+    if not os.path.isdir(dirCache):
+        return None
+    archivos = [a for a in os.listdir(dirCache) if a.startswith(f"{nombre}_") and a.endswith(".npy")]
+    if not archivos:
+        return None
+    reciente = max(archivos, key=lambda a: os.path.getmtime(os.path.join(dirCache, a)))
+    return reciente[len(nombre) + 1:-len(".npy")]
@@ -0,0 +1,74 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import Optional
+
+from distancia import trigCoordenadas, haversineTrig
+from cacheDatos import claveCache, rutaCache, guardarMatriz, cargarMatriz, limpiarCache
+
+# funcion para construir las listas de candidatos (k tiendas mas cercanas de cada nodo)
+def construirCandidatos(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    k: int,
+    esTienda: np.ndarray,
+    tamBloque: int = 1024
+) -> np.ndarray:
+    # calcula haversine por bloques de filas contra todas las tiendas y se queda con
+    # las k columnas mas cercanas con argpartition; nunca forma la matriz n x n completa
+    n = len(lats)
+    tiendas = np.flatnonzero(esTienda)
+    k = min(k, len(tiendas) - 1)
+    trig = trigCoordenadas(lats, lons)
+
+    candidatos = np.empty((n, k), dtype=np.int32)
+    for inicio in range(0, n, tamBloque):
+        fin = min(inicio + tamBloque, n)
+        # filas = nodos del bloque, columnas = todas las tiendas
+        bloque = haversineTrig(trig, (slice(inicio, fin), None), (None, tiendas))
+        # un nodo no es candidato de si mismo
+        filas = np.arange(inicio, fin)
+        propias = np.searchsorted(tiendas, filas)
+        esPropia = (propias < len(tiendas)) & (tiendas[np.minimum(propias, len(tiendas) - 1)] == filas)
+        bloque[np.flatnonzero(esPropia), propias[esPropia]] = np.inf
+        # k mas cercanos sin ordenar y luego ordenados por distancia
+        cercanos = np.argpartition(bloque, k - 1, axis=1)[:, :k]
+        orden = np.argsort(np.take_along_axis(bloque, cercanos, axis=1), axis=1)
+        candidatos[inicio:fin] = tiendas[np.take_along_axis(cercanos, orden, axis=1)]
+    return candidatos
+
+# funcion para cargar (o construir y guardar) las listas de candidatos en la cache de la instancia
+def cargarCandidatos(
+    coordArchivo: str,
+    coordenadas: pd.DataFrame,
+    k: int = 10,
+    dirCache: Optional[str] = None,
+    usarCache: bool = True
+) -> np.ndarray:
+    # el indice se guarda junto a las matrices, con clave del archivo de coordenadas y k
+    if dirCache is None:
+        dirCache = os.path.join(os.path.dirname(os.path.abspath(coordArchivo)), "cache")
+    clave = claveCache([coordArchivo], extra=f"k{k}")
+    ruta = rutaCache(dirCache, "candidatos", clave)
+
+    if usarCache:
+        candidatos = cargarMatriz(ruta)
+        if candidatos is not None:
+            print(f"Candidatos ({k} vecinos) cargados desde la cache ({clave})")
+            return candidatos
+
+    inicio = time.perf_counter()
+    esTienda = (coordenadas['Tipo'] == 'Tienda').values
+    candidatos = construirCandidatos(
+        coordenadas['Latitud_WGS84'].values,
+        coordenadas['Longitud_WGS84'].values,
+        k,
+        esTienda
+    )
+    print(f"Candidatos ({k} vecinos) construidos en {time.perf_counter() - inicio:.2f} s")
+
+    if usarCache:
+        guardarMatriz(ruta, candidatos)
+        limpiarCache(dirCache, "candidatos", clave)
+    return candidatos
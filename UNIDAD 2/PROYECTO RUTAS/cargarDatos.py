@@ -1,35 +1,133 @@
+import os
 import pandas as pd
 import numpy as np
-from distancia import generarMatrizDistancias 
-from typing import List, Tuple
+from distancia import generarMatrizDistancias, actualizarMatrizHaversine
+from redVial import generarMatrizRed
+from cacheDatos import claveCache, rutaCache, guardarMatriz, cargarMatriz, limpiarCache, claveAnterior
+from proveedorDistancia import crearProveedor, ProveedorDistancia, ProveedorCondensado, ProveedorArcos
+from typing import List, Tuple, Optional
 
 # funcion para cargar datos desde archivos CSV
 def cargarDatos(
-    coordArchivo: str, 
-    matrizDistancia: str, 
-    matrizGasolina: str
-    ) -> tuple[pd.DataFrame, np.ndarray, np.ndarray]: # (coordenadas, distancia, costo)
+    coordArchivo: str,
+    matrizDistancia: str,
+    matrizGasolina: str,
+    usarCache: bool = True,
+    dtype: type = np.float64,
+    dirCache: Optional[str] = None,
+    almacenamiento: str = "densa",  # densa, condensada o haversine
+    archivoRed: Optional[str] = None,  # red vial (.csv de aristas u .osm) para distancias por calle
+    simetria: str = "media",           # con red vial: "media" o "minima" de los dos sentidos de cada par
+    procesos: Optional[int] = None,    # procesos para los caminos mas cortos de la red vial
+    verbose: bool = True               # reporta el rendimiento del calculo de la matriz haversine
+    ) -> tuple[pd.DataFrame, np.ndarray, np.ndarray, np.ndarray]: # (coordenadas, distancia, costo, arcos)
     # proceso de carga dentro de un bloque try-except para manejo de errores
     try:
         # cargar coordenadas
-        coordenadas = pd.read_csv(coordArchivo, encoding='latin1')       
+        coordenadas = pd.read_csv(coordArchivo, encoding='latin1')
         print(f"{len(coordenadas)} nodos cargados")
-        
+
+        # para instancias grandes las matrices no se forman completas:
+        # se usa un proveedor condensado (triangulo superior) o haversine al vuelo
+        if almacenamiento != "densa":
+            if archivoRed is not None:
+                raise ValueError("las distancias por red vial solo se admiten con almacenamiento denso")
+            return cargarProveedores(coordenadas, matrizGasolina, almacenamiento)
+
+        # la cache se guarda junto a los datos si no se indica otra carpeta
+        if dirCache is None:
+            dirCache = os.path.join(os.path.dirname(os.path.abspath(coordArchivo)), "cache")
+        # con red vial la clave incluye el archivo del grafo: otra red es otra matriz
+        fuentes = [coordArchivo, matrizGasolina] + ([archivoRed] if archivoRed else [])
+        # (y la forma de hacerla simetrica: "media" y "minima" son matrices distintas)
+        clave = claveCache(fuentes, extra=np.dtype(dtype).name + (f"|red:{simetria}" if archivoRed else ""))
+        rutas = {nombre: rutaCache(dirCache, nombre, clave) for nombre in ("distancia", "costo", "arcos", "nodos")}
+
+        # si las matrices ya estan en la cache se cargan como mapas de memoria
+        # y se evita leer el CSV de costos y recalcular HAVERSINE
+        if usarCache:
+            matrices = {nombre: cargarMatriz(ruta) for nombre, ruta in rutas.items() if nombre != "nodos"}
+            if all(m is not None for m in matrices.values()):
+                print(f"Matrices {matrices['arcos'].shape} cargadas desde la cache ({clave})")
+                print("Datos cargados correctamente.")
+                return coordenadas, matrices["distancia"], matrices["costo"], matrices["arcos"]
+
         # generar la matriz de distancia usando la formula HAVERSINE
-        distancia = generarMatrizDistancias(coordenadas)
-        
+        # si la cache tiene la matriz de una version anterior de los datos solo se
+        # calculan las filas y columnas de los nodos que cambiaron
+        # con red vial se usan los caminos mas cortos por las calles
+        nodos = coordenadas[['Latitud_WGS84', 'Longitud_WGS84']].values.astype(np.float64)
+        distancia = None
+        if archivoRed is not None:
+            distancia = generarMatrizRed(coordenadas, archivoRed, dtype=dtype, procesos=procesos, simetria=simetria)
+        elif usarCache:
+            distancia = actualizarDistancias(dirCache, nodos, dtype)
+        if distancia is None:
+            distancia = generarMatrizDistancias(coordenadas, dtype=dtype, verbose=verbose)
+
         # cargar la matriz de costos de combustible
         costo = pd.read_csv(matrizGasolina, encoding='latin1').values
-        costo = costo.astype(float)
+        costo = costo.astype(dtype)
         print(f"Matriz de Costo {costo.shape} cargada")
-        
+
+        # matriz combinada de costo por tramo (distancia * costo de combustible)
+        # se calcula una sola vez como arreglo contiguo para la funcion de costo
+        arcos = np.ascontiguousarray(distancia * costo, dtype=dtype)
+
+        if usarCache:
+            # una matriz por red vial no guarda sus nodos: no puede actualizarse con haversine
+            guardar = [("distancia", distancia), ("costo", costo), ("arcos", arcos)]
+            if archivoRed is None:
+                guardar.append(("nodos", nodos))
+            for nombre, matriz in guardar:
+                guardarMatriz(rutas[nombre], matriz)
+                limpiarCache(dirCache, nombre, clave)
+            print(f"Matrices guardadas en la cache ({clave})")
+
         print("Datos cargados correctamente.")
         # devolver los datos cargados
-        return coordenadas, distancia, costo
-        
+        return coordenadas, distancia, costo, arcos
+
     except FileNotFoundError as fnfe:
         print(f"error verificar que los archivos esten en la carpeta datos {fnfe}")
         raise
     except Exception as e:
         print(f"Error al cargar o recalcular datos: {e}")
-        raise
\ No newline at end of file
+        raise
+
+# funcion para actualizar la matriz de distancias de la cache anterior a los nodos actuales
+def actualizarDistancias(dirCache: str, nodos: np.ndarray, dtype: type) -> Optional[np.ndarray]:
+    # devuelve None si no hay una matriz anterior compatible (se calcula completa)
+    clave = claveAnterior(dirCache, "distancia")
+    if clave is None:
+        return None
+    nodosViejos = cargarMatriz(rutaCache(dirCache, "nodos", clave))
+    distanciaVieja = cargarMatriz(rutaCache(dirCache, "distancia", clave))
+    if nodosViejos is None or distanciaVieja is None or distanciaVieja.dtype != np.dtype(dtype):
+        return None
+    distancia, calculados = actualizarMatrizHaversine(
+        nodosViejos[:, 0], nodosViejos[:, 1], distanciaVieja, nodos[:, 0], nodos[:, 1], dtype
+    )
+    print(f"Matriz de distancias actualizada desde la cache ({clave}): {calculados} de {len(nodos)} nodos recalculados")
+    return distancia
+
+# funcion para cargar la instancia con proveedores de distancia en lugar de matrices densas
+def cargarProveedores(
+    coordenadas: pd.DataFrame,
+    matrizGasolina: str,
+    almacenamiento: str
+    ) -> tuple[pd.DataFrame, ProveedorDistancia, ProveedorCondensado, ProveedorArcos]: # (coordenadas, distancia, costo, arcos)
+    lats = coordenadas['Latitud_WGS84'].values
+    lons = coordenadas['Longitud_WGS84'].values
+    distancia = crearProveedor(almacenamiento, lats, lons)
+
+    # el costo de combustible es simetrico, se lee por bloques de filas y se guarda
+    # condensado en float32 sin formar la matriz completa
+    costo = ProveedorCondensado.desdeCSV(matrizGasolina)
+    print(f"Matriz de Costo {costo.shape} cargada (condensada)")
+
+    # el costo por tramo se calcula al vuelo a partir de los dos proveedores
+    arcos = ProveedorArcos(distancia, costo)
+    print(f"Almacenamiento '{almacenamiento}': {arcos.nbytes / 1e6:,.2f} MB en matrices")
+    print("Datos cargados correctamente.")
+    return coordenadas, distancia, costo, arcos
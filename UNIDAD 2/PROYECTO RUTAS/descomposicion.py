@@ -0,0 +1,164 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple, Optional, Dict, Any
+
+from funcionDeCosto import Solucion, calcularCostoArcos, deltaSwap
+from solucion import solucionInicial
+from solucionArreglo import SolucionArreglo
+from multiInicio import compartirMatriz, ejecutarCadena
+from proveedorDistancia import MatrizDistancia, matrizArcosDe
+from vecindario import Vecindario, OperadorReubicar
+
+# dentro de un cluster solo hay rutas del mismo CD: basta con movimientos dentro de la ruta
+# (sin candidatos, las listas de candidatos apuntan tambien a tiendas de otros clusters)
+MEZCLA_CLUSTER = {"2opt": 0.5, "oropt": 0.3, "swap": 0.2}
+
+
+# funcion para agrupar las rutas de una solucion por su CD
+def clustersPorCD(solucion: Solucion) -> Dict[int, List[List[int]]]:
+    clusters: Dict[int, List[List[int]]] = {}
+    for ruta in solucion:
+        clusters.setdefault(ruta[0], []).append(ruta)
+    return clusters
+
+# funcion para encontrar las tiendas en la frontera entre clusters
+def tiendasFrontera(solucion: SolucionArreglo, candidatos: np.ndarray) -> np.ndarray:
+    # una tienda es de frontera si alguno de sus vecinos cercanos pertenece a otro CD
+    cdDe = np.full(len(candidatos), -1, dtype=np.int64)
+    for ruta in solucion:
+        cdDe[ruta[1:-1]] = ruta[0]
+    tiendas = np.flatnonzero(cdDe >= 0)
+    otroCD = cdDe[candidatos[tiendas]] != cdDe[tiendas][:, None]
+    return tiendas[otroCD.any(axis=1)]
+
+# funcion para la reparacion de frontera despues de unir los clusters
+def reparacionFrontera(
+    solucion: SolucionArreglo,
+    frontera: np.ndarray,
+    candidatos: np.ndarray,
+    matrizArcos: MatrizDistancia,
+    pasadas: int = 3
+) -> int:
+    # busqueda local de mejor mejora solo sobre las tiendas de frontera: cada tienda prueba
+    # pasarse junto a (antes o despues de) un vecino cercano de otra ruta, o intercambiarse
+    # con el; se aplica el mejor movimiento que baje el costo y se repite hasta `pasadas`
+    # veces o hasta que ninguna tienda mejore; devuelve el numero de movimientos aplicados
+    reubicar = OperadorReubicar()
+    aplicados = 0
+    for _ in range(pasadas):
+        mejoras = 0
+        for x in frontera.tolist():
+            origen = int(solucion.posiciones[x])
+            rutaOrigen = solucion.rutaDe(origen)
+            mejorDelta, mejorMovimiento = -1e-9, None
+            for y in candidatos[x].tolist():
+                j = int(solucion.posiciones[y])
+                if j < 0 or solucion.rutaDe(j) == rutaOrigen:
+                    continue
+                for destino in (j, j + 1):
+                    delta = reubicar.delta(solucion, (origen, destino), matrizArcos)
+                    if delta < mejorDelta:
+                        mejorDelta, mejorMovimiento = delta, ("reubicar", origen, destino)
+                delta = deltaSwap(solucion.paradas, origen, j, matrizArcos)
+                if delta < mejorDelta:
+                    mejorDelta, mejorMovimiento = delta, ("intercambio", origen, j)
+            if mejorMovimiento is not None:
+                tipo, p1, p2 = mejorMovimiento
+                if tipo == "reubicar":
+                    solucion.moverParada(p1, p2)
+                else:
+                    solucion.aplicarSwap(p1, p2)
+                mejoras += 1
+        aplicados += mejoras
+        if mejoras == 0:
+            break
+    return aplicados
+
+# funcion para resolver la instancia por clusters de CD en paralelo y unirlos
+def recocidoDescomposicion(
+    matrizDistancia: MatrizDistancia,
+    matrizCosto: Optional[MatrizDistancia],
+    solucionInicio: Optional[Solucion] = None,
+    coordenadas: Optional[pd.DataFrame] = None,  # nodos con su columna Tipo (necesarias si no hay solucionInicio)
+    candidatos: Optional[np.ndarray] = None,  # para la reparacion de frontera (None = sin reparacion)
+    procesos: Optional[int] = None,           # None usa todos los nucleos
+    semillaBase: int = 0,
+    matrizArcos: Optional[MatrizDistancia] = None,
+    pasadasReparacion: int = 3,
+    mezcla: Optional[Dict[str, float]] = None,
+    **parametros                              # T0, TF, alpha, L, enfriamiento, parada... del recocido
+) -> Tuple[Solucion, float, Dict[str, Any]]:
+    # cada CD con sus tiendas es un subproblema independiente (las rutas no comparten
+    # tiendas), asi que los clusters se resuelven a la vez en un pool de procesos con las
+    # matrices en memoria compartida; despues se unen y se reparan las tiendas de frontera
+
+    if matrizArcos is None:
+        matrizArcos = matrizArcosDe(matrizDistancia, matrizCosto)
+    if solucionInicio is None:
+        solucionInicio = solucionInicial(matrizDistancia, coordenadas)
+    vecindario = Vecindario(mezcla or MEZCLA_CLUSTER)
+
+    # los clusters mas grandes se envian primero para repartir mejor la carga
+    clusters = sorted(clustersPorCD(solucionInicio).items(), key=lambda c: -sum(len(r) for r in c[1]))
+    semillas = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(semillaBase).spawn(len(clusters))]
+
+    inicio = time.perf_counter()
+    bloques: List[shared_memory.SharedMemory] = []
+    try:
+        distanciaCompartida = compartirMatriz(matrizDistancia, bloques)
+        arcosCompartida = compartirMatriz(matrizArcos, bloques)
+
+        print(f"Resolviendo {len(clusters)} clusters de CD en {procesos or os.cpu_count()} procesos...")
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [
+                ejecutor.submit(
+                    ejecutarCadena, cd, semilla, distanciaCompartida, arcosCompartida,
+                    dict(parametros, vecindario=vecindario, solucionInicio=rutas)
+                )
+                for (cd, rutas), semilla in zip(clusters, semillas)
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+    segundosClusters = time.perf_counter() - inicio
+
+    # se unen las rutas en el orden original de los CDs
+    rutasPorCD = {r["cadena"]: r["solucion"] for r in resultados}
+    unida = SolucionArreglo.desdeRutas([ruta for cd in clustersPorCD(solucionInicio) for ruta in rutasPorCD[cd]])
+    costoUnido = calcularCostoArcos(unida, matrizArcos)
+
+    # reparacion de frontera sobre la solucion completa
+    inicioReparacion = time.perf_counter()
+    frontera = np.empty(0, dtype=np.int64)
+    movimientosReparacion = 0
+    if candidatos is not None and pasadasReparacion > 0:
+        frontera = tiendasFrontera(unida, candidatos)
+        movimientosReparacion = reparacionFrontera(unida, frontera, candidatos, matrizArcos, pasadasReparacion)
+    costoFinal = calcularCostoArcos(unida, matrizArcos)
+
+    estadisticas = {
+        "clusters": [
+            {
+                "cd": r["cadena"],
+                "tiendas": sum(len(ruta) - 2 for ruta in r["solucion"]),
+                "costoInicial": r["costoInicial"],
+                "costoFinal": r["costoFinal"],
+                "segundos": r["segundos"],
+                "pid": r["pid"],
+            }
+            for r in resultados
+        ],
+        "costoUnido": costoUnido,
+        "tiendasFrontera": len(frontera),
+        "movimientosReparacion": movimientosReparacion,
+        "segundosClusters": segundosClusters,
+        "segundosReparacion": time.perf_counter() - inicioReparacion,
+        "segundos": time.perf_counter() - inicio,
+    }
+    return unida.comoRutas(), costoFinal, estadisticas
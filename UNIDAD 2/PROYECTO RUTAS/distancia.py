@@ -1,6 +1,8 @@
+import time
 import numpy as np
 import pandas as pd
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple, Optional
 
 # radio de la tierra en km
 radioTierra = 6371.0
@@ -31,22 +33,140 @@ def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return distance_km
 
 # funcion para generar la matriz de distancias entre todos los nodos
-def generarMatrizDistancias(coordenadas: pd.DataFrame) -> np.ndarray:
+def generarMatrizDistancias(
+    coordenadas: pd.DataFrame,
+    dtype: type = np.float64,
+    hilos: int = 1,
+    archivoSalida: Optional[str] = None,  # .npy mapeado en memoria para instancias que no caben en RAM
+    verbose: bool = False
+) -> np.ndarray:
 
     # genera la matriz de distancias usando la formula de haversine
-    n = len(coordenadas)
-    matriz_haversine = np.zeros((n, n))
-    
     # extraer las coordenadas como arrays para un acceso mas rapido
     lats = coordenadas['Latitud_WGS84'].values
     lons = coordenadas['Longitud_WGS84'].values
-    
-    # llenar la matriz en forma de vector 
-    for i in range(n):
-        matriz_haversine[i, :] = haversine(lats[i], lons[i], lats, lons)
 
-    # retornar la matriz de distancias    
-    return matriz_haversine
+    # la matriz se construye por bloques con broadcasting de numpy
+    return construirMatrizHaversine(lats, lons, dtype=dtype, hilos=hilos, archivoSalida=archivoSalida, verbose=verbose)
+
+# funcion para precalcular senos y cosenos de las coordenadas
+def trigCoordenadas(lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, ...]:
+    # se calculan una sola vez por nodo y se reutilizan en todos los pares:
+    # senos y cosenos de la mitad de cada angulo y el coseno de la latitud
+    latRad = np.radians(np.asarray(lats, dtype=np.float64))
+    lonRad = np.radians(np.asarray(lons, dtype=np.float64))
+    return (np.sin(latRad / 2), np.cos(latRad / 2), np.sin(lonRad / 2), np.cos(lonRad / 2), np.cos(latRad))
+
+# funcion para calcular haversine a partir de senos y cosenos precalculados
+def haversineTrig(trig: Tuple[np.ndarray, ...], i, j) -> np.ndarray:
+    # i y j son indices, arreglos de indices o (slice, None) que se combinan con broadcasting
+    # usa la forma sin^2(dlat/2) + cos(lat1)cos(lat2)sin^2(dlon/2) con
+    # sin((a - b)/2) = sin(a/2)cos(b/2) - cos(a/2)sin(b/2): cada par solo necesita productos,
+    # sumas y un arcoseno, y a diferencia de 1 - cos(d) no pierde precision entre puntos a metros
+    sinMedLat, cosMedLat, sinMedLon, cosMedLon, cosLat = trig
+    sinDLat = sinMedLat[i] * cosMedLat[j] - cosMedLat[i] * sinMedLat[j]
+    sinDLon = sinMedLon[i] * cosMedLon[j] - cosMedLon[i] * sinMedLon[j]
+    a = sinDLat * sinDLat + cosLat[i] * cosLat[j] * (sinDLon * sinDLon)
+    # recortar el redondeo para que el arcoseno este definido
+    a = np.clip(a, 0.0, 1.0)
+    return 2.0 * radioTierra * np.arcsin(np.sqrt(a))
+
+# funcion para calcular un bloque de la matriz de haversine
+def bloqueHaversine(trig: Tuple[np.ndarray, ...], filas: slice, columnas: slice) -> np.ndarray:
+    # las filas van como columna y las columnas como renglon para formar el bloque
+    return haversineTrig(trig, (filas, None), (None, columnas))
+
+# funcion para construir la matriz de distancias por bloques (sirve para instancias grandes)
+def construirMatrizHaversine(
+    lats: np.ndarray,
+    lons: np.ndarray,
+    dtype: type = np.float64,
+    tamBloque: int = 2048,
+    hilos: int = 1,
+    archivoSalida: Optional[str] = None,
+    verbose: bool = False
+) -> np.ndarray:
+    # construye la matriz n x n de distancias haversine en bloques de tamBloque x tamBloque
+    # los bloques se calculan en float64 y se guardan en el tipo pedido (float32 usa la mitad de memoria)
+    # si se da archivoSalida la matriz se escribe directo a un archivo .npy mapeado en memoria
+    # y nunca tiene que caber completa en RAM
+
+    n = len(lats)
+    inicio = time.perf_counter()
+
+    # senos y cosenos precalculados una sola vez por nodo
+    trig = trigCoordenadas(lats, lons)
+
+    # destino de la matriz: arreglo en memoria o archivo mapeado
+    if archivoSalida is None:
+        matriz = np.empty((n, n), dtype=dtype)
+    else:
+        matriz = np.lib.format.open_memmap(archivoSalida, mode='w+', dtype=dtype, shape=(n, n))
+
+    # la matriz es simetrica: solo se calculan los bloques de la diagonal hacia arriba
+    # y cada bloque se copia tambien a su posicion transpuesta
+    bordes = list(range(0, n, tamBloque))
+    bloques = [(i, j) for i in bordes for j in bordes if j >= i]
+
+    def llenarBloque(bloque: Tuple[int, int]) -> None:
+        i, j = bloque
+        filas = slice(i, min(i + tamBloque, n))
+        columnas = slice(j, min(j + tamBloque, n))
+        valores = bloqueHaversine(trig, filas, columnas)
+        matriz[filas, columnas] = valores
+        if i != j:
+            matriz[columnas, filas] = valores.T
+
+    # numpy libera el GIL en las operaciones del bloque, por eso los hilos si trabajan en paralelo
+    if hilos > 1:
+        with ThreadPoolExecutor(max_workers=hilos) as ejecutor:
+            list(ejecutor.map(llenarBloque, bloques))
+    else:
+        for bloque in bloques:
+            llenarBloque(bloque)
+
+    # la diagonal es exactamente cero
+    np.fill_diagonal(matriz, 0)
+
+    if archivoSalida is not None:
+        matriz.flush()
+
+    # reportar el rendimiento en pares de nodos por segundo
+    duracion = time.perf_counter() - inicio
+    if verbose:
+        pares = n * n
+        print(f"Matriz haversine {n}x{n} ({np.dtype(dtype).name}) en {duracion:.2f} s, "
+              f"{pares / max(duracion, 1e-9):,.0f} pares/s con {hilos} hilo(s)")
+
+    # retornar la matriz de distancias
+    return matriz
+
+# funcion para actualizar una matriz de distancias cuando cambian algunos nodos
+def actualizarMatrizHaversine(
+    latsViejas: np.ndarray,
+    lonsViejas: np.ndarray,
+    matrizVieja: np.ndarray,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    dtype: type = np.float64
+) -> Tuple[np.ndarray, int]:
+    # los nodos que conservan sus coordenadas copian sus distancias de la matriz vieja
+    # (aunque cambien de posicion en el archivo), solo se calculan las filas y columnas
+    # de los nodos nuevos o movidos; devuelve la matriz y el numero de nodos calculados
+    n = len(lats)
+    viejos = {par: k for k, par in enumerate(zip(latsViejas.tolist(), lonsViejas.tolist()))}
+    origen = np.array([viejos.get(par, -1) for par in zip(lats.tolist(), lons.tolist())], dtype=np.int64)
+    conservados = np.flatnonzero(origen >= 0)
+    nuevos = np.flatnonzero(origen < 0)
+
+    matriz = np.empty((n, n), dtype=dtype)
+    matriz[np.ix_(conservados, conservados)] = matrizVieja[np.ix_(origen[conservados], origen[conservados])]
+    if len(nuevos):
+        trig = trigCoordenadas(lats, lons)
+        filas = haversineTrig(trig, nuevos[:, None], np.arange(n)[None, :]).astype(dtype)
+        matriz[nuevos, :] = filas
+        matriz[:, nuevos] = filas.T
+    return matriz, len(nuevos)
 
 # funcion para encontrar CD mas cercano a una tienda
 def cdCercano(tienda_idx: int, matriz_distancia: np.ndarray, cds_indices: list) -> int:
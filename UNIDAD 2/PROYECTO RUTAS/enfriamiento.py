@@ -0,0 +1,146 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, Tuple
+
+# motivos por los que termina un recocido
+PARADA_TEMPERATURA = "temperatura_final"
+PARADA_ESTANCAMIENTO = "estancamiento"
+PARADA_TIEMPO = "tiempo"
+PARADA_OBJETIVO = "costo_objetivo"
+PARADA_CICLOS = "max_ciclos"
+
+
+class Enfriamiento(ABC):
+    # esquema de enfriamiento: decide la temperatura del siguiente ciclo a partir de la
+    # actual, la tasa de aceptacion del ciclo y si el ciclo mejoro la mejor solucion
+    # los atributos de CAMPOS_ESTADO cambian durante el recocido (van en el punto de
+    # control); los demas son la configuracion del esquema y deben coincidir al reanudar
+    CAMPOS_ESTADO: Tuple[str, ...] = ()
+
+    def iniciar(self) -> None:
+        # reinicia el estado interno al empezar un recocido
+        pass
+
+    def parametros(self) -> Dict[str, Any]:
+        # configuracion con la que se creo el esquema
+        return {clave: valor for clave, valor in vars(self).items() if clave not in self.CAMPOS_ESTADO}
+
+    def estado(self) -> Dict[str, Any]:
+        # estado interno actual (contadores)
+        return {clave: getattr(self, clave) for clave in self.CAMPOS_ESTADO}
+
+    def restaurar(self, estado: Dict[str, Any]) -> None:
+        # recupera solo el estado interno, la configuracion actual se conserva
+        for clave in self.CAMPOS_ESTADO:
+            setattr(self, clave, estado[clave])
+
+    @abstractmethod
+    def siguiente(self, T: float, tasaAceptacion: float, mejoro: bool) -> float:
+        ...
+
+
+class EnfriamientoGeometrico(Enfriamiento):
+    # enfriamiento original: T *= alpha en cada ciclo
+
+    def __init__(self, alpha: float = 0.95):
+        self.alpha = alpha
+
+    def siguiente(self, T, tasaAceptacion, mejoro):
+        return T * self.alpha
+
+
+class EnfriamientoAdaptativo(Enfriamiento):
+    # enfria rapido mientras se acepta mas de la tasa objetivo (la cadena todavia camina
+    # al azar) y lento cuando la aceptacion ya es baja (fase de refinamiento)
+    # si pasan `recalentarTras` ciclos sin mejorar, multiplica T por factorRecalentar
+    # para salir del minimo local, como maximo maxRecalentamientos veces
+    CAMPOS_ESTADO = ("recalentamientos", "sinMejora")
+
+    def __init__(
+        self,
+        alpha: float = 0.95,            # factor cuando la aceptacion esta por debajo del objetivo
+        alphaRapido: float = 0.8,       # factor cuando la aceptacion esta por encima del objetivo
+        tasaObjetivo: float = 0.3,
+        recalentarTras: Optional[int] = 20,
+        factorRecalentar: float = 4.0,
+        maxRecalentamientos: int = 3
+    ):
+        self.alpha = alpha
+        self.alphaRapido = alphaRapido
+        self.tasaObjetivo = tasaObjetivo
+        self.recalentarTras = recalentarTras
+        self.factorRecalentar = factorRecalentar
+        self.maxRecalentamientos = maxRecalentamientos
+        self.iniciar()
+
+    def iniciar(self):
+        self.recalentamientos = 0
+        self.sinMejora = 0
+
+    def siguiente(self, T, tasaAceptacion, mejoro):
+        self.sinMejora = 0 if mejoro else self.sinMejora + 1
+        if (self.recalentarTras is not None and self.sinMejora >= self.recalentarTras
+                and self.recalentamientos < self.maxRecalentamientos):
+            self.recalentamientos += 1
+            self.sinMejora = 0
+            return T * self.factorRecalentar
+        return T * (self.alphaRapido if tasaAceptacion > self.tasaObjetivo else self.alpha)
+
+
+class CriterioParada:
+    # reglas de parada ademas de la temperatura final; la primera que se cumple termina
+    # el recocido y queda registrada en `motivo` junto con el estado al parar
+    # (el objeto se pasa al recocido y despues se consulta su reporte)
+
+    def __init__(
+        self,
+        ventanaEstancamiento: Optional[int] = None,  # ciclos seguidos sin mejorar la mejor solucion
+        tiempoMaximo: Optional[float] = None,        # segundos de reloj
+        costoObjetivo: Optional[float] = None,       # se detiene al alcanzar este costo
+        maxCiclos: Optional[int] = None
+    ):
+        self.ventanaEstancamiento = ventanaEstancamiento
+        self.tiempoMaximo = tiempoMaximo
+        self.costoObjetivo = costoObjetivo
+        self.maxCiclos = maxCiclos
+        self.iniciar()
+
+    def iniciar(self) -> None:
+        self.inicio = time.perf_counter()
+        self.motivo: Optional[str] = None
+        self.ciclos = 0
+        self.ciclosSinMejora = 0
+        self.temperatura = None
+        self.mejorCosto = None
+        self.segundos = 0.0
+
+    def registrarCiclo(self, mejoro: bool) -> None:
+        self.ciclos += 1
+        self.ciclosSinMejora = 0 if mejoro else self.ciclosSinMejora + 1
+
+    def evaluar(self, T: float, TF: float, mejorCosto: float) -> Optional[str]:
+        # devuelve el motivo de parada o None si el recocido debe seguir
+        self.temperatura = T
+        self.mejorCosto = mejorCosto
+        self.segundos = time.perf_counter() - self.inicio
+        if self.costoObjetivo is not None and mejorCosto <= self.costoObjetivo:
+            self.motivo = PARADA_OBJETIVO
+        elif T <= TF:
+            self.motivo = PARADA_TEMPERATURA
+        elif self.ventanaEstancamiento is not None and self.ciclosSinMejora >= self.ventanaEstancamiento:
+            self.motivo = PARADA_ESTANCAMIENTO
+        elif self.tiempoMaximo is not None and self.segundos >= self.tiempoMaximo:
+            self.motivo = PARADA_TIEMPO
+        elif self.maxCiclos is not None and self.ciclos >= self.maxCiclos:
+            self.motivo = PARADA_CICLOS
+        return self.motivo
+
+    def reporte(self) -> Dict[str, Any]:
+        return {
+            "motivo": self.motivo,
+            "ciclos": self.ciclos,
+            "ciclosSinMejora": self.ciclosSinMejora,
+            "temperatura": self.temperatura,
+            "mejorCosto": self.mejorCosto,
+            "segundos": self.segundos,
+        }
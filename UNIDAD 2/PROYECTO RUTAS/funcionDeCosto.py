@@ -1,5 +1,6 @@
 import numpy as np
-from typing import List
+from typing import List, Union
+from solucionArreglo import SolucionArreglo
 
 # definimos variable solucion como una lista de rutas
 Solucion = List[List[int]]
@@ -33,4 +34,51 @@ def calcularCosto(
             # el costo de este tramo es Distancia * Costo por unidad de distancia
             costoTotal += distancia * costoGasolina
         
-    return costoTotal
\ No newline at end of file
+    return costoTotal
+
+def calcularCostoArcos(solucion: Union[Solucion, SolucionArreglo], matrizArcos: np.ndarray) -> float:
+    # calcula el costo total (FO) usando la matriz de costo por tramo precalculada
+    # matrizArcos[i, j] = matrizDistancia[i, j] * matrizCosto[i, j]
+    if isinstance(solucion, SolucionArreglo):
+        return calcularCostoArreglo(solucion, matrizArcos)
+
+    costoTotal = 0.0
+    for ruta in solucion:
+        if len(ruta) < 2:
+            continue
+        # se suman todos los tramos de la ruta con una sola lectura indexada
+        costoTotal += float(matrizArcos[ruta[:-1], ruta[1:]].sum())
+    return costoTotal
+
+def calcularCostoArreglo(solucion: SolucionArreglo, matrizArcos: np.ndarray) -> float:
+    # calcula el costo total de una solucion en arreglo con una sola lectura vectorizada
+    # de todos los tramos consecutivos del arreglo de paradas
+    paradas = solucion.paradas
+    tramos = matrizArcos[paradas[:-1], paradas[1:]]
+
+    # los tramos del CD final de una ruta al CD inicial de la siguiente no existen
+    finRutas = solucion.inicios[1:-1] - 1
+    return float(tramos.sum() - tramos[finRutas].sum())
+
+def deltaSwap(ruta, idx1: int, idx2: int, matrizArcos: np.ndarray) -> float:
+    # calcula la diferencia de costo de intercambiar ruta[idx1] y ruta[idx2]
+    # solo cambian los tramos que entran y salen de las dos posiciones (maximo 4)
+    # por lo que el costo es O(1) sin importar el tamaño de la solucion
+    # ruta puede ser una lista o el arreglo de paradas (con posiciones absolutas)
+    if idx1 > idx2:
+        idx1, idx2 = idx2, idx1
+    a, b = ruta[idx1], ruta[idx2]
+    anteriorA, siguienteB = ruta[idx1 - 1], ruta[idx2 + 1]
+
+    # posiciones adyacentes: comparten el tramo a -> b
+    if idx2 == idx1 + 1:
+        costoAntes = matrizArcos[anteriorA, a] + matrizArcos[a, b] + matrizArcos[b, siguienteB]
+        costoDespues = matrizArcos[anteriorA, b] + matrizArcos[b, a] + matrizArcos[a, siguienteB]
+    else:
+        siguienteA, anteriorB = ruta[idx1 + 1], ruta[idx2 - 1]
+        costoAntes = (matrizArcos[anteriorA, a] + matrizArcos[a, siguienteA]
+                      + matrizArcos[anteriorB, b] + matrizArcos[b, siguienteB])
+        costoDespues = (matrizArcos[anteriorA, b] + matrizArcos[b, siguienteA]
+                        + matrizArcos[anteriorB, a] + matrizArcos[a, siguienteB])
+
+    return float(costoDespues - costoAntes)
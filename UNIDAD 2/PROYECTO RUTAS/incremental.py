@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import numpy as np
+import pandas as pd
+from typing import List, Tuple, Optional, Dict, Any
+
+from funcionDeCosto import Solucion, calcularCostoArcos
+from solucion import indicesNodos
+from recocidoSimulado import recocidoSimulado
+from proveedorDistancia import MatrizDistancia
+from vecindario import Vecindario
+
+# mezcla para el repaso de las rutas afectadas: movimientos dentro y entre esas rutas
+MEZCLA_INCREMENTAL = {"2opt": 0.35, "oropt": 0.25, "reubicar": 0.25, "intercambio": 0.15}
+
+
+# funcion para guardar una solucion con los nombres de los nodos
+def guardarSolucion(ruta: str, solucion: Solucion, coordenadas: pd.DataFrame, costo: Optional[float] = None) -> None:
+    # se guardan nombres y no indices: al cambiar la lista de tiendas los indices se recorren
+    nombres = coordenadas['Nombre'].values
+    datos = {"costo": costo, "rutas": [[str(nombres[nodo]) for nodo in r] for r in solucion]}
+    temporal = ruta + ".tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False, indent=1)
+    os.replace(temporal, ruta)
+
+# funcion para cargar una solucion guardada sobre la lista de nodos actual
+def cargarSolucion(ruta: str, coordenadas: pd.DataFrame) -> Tuple[Solucion, List[int], List[str], List[int]]:
+    # devuelve (rutas con los indices actuales, tiendas sin ruta, nombres que ya no existen,
+    # rutas que perdieron tiendas)
+    # las tiendas cerradas se quitan de su ruta; las rutas de un CD cerrado se disuelven y
+    # sus tiendas quedan sin ruta junto con las tiendas nuevas
+    with open(ruta, encoding='utf-8') as f:
+        datos = json.load(f)
+    indice = {nombre: k for k, nombre in enumerate(coordenadas['Nombre'].values)}
+    indices_cds, indices_tiendas = indicesNodos(coordenadas)
+    esTienda = np.zeros(len(coordenadas), dtype=bool)
+    esTienda[indices_tiendas] = True
+
+    rutas: Solucion = []
+    cerrados: List[str] = []
+    conBajas: List[int] = []
+    for nombres in datos["rutas"]:
+        cd = indice.get(nombres[0])
+        tiendas = []
+        for nombre in nombres[1:-1]:
+            k = indice.get(nombre)
+            if k is None or not esTienda[k]:
+                cerrados.append(nombre)
+            else:
+                tiendas.append(k)
+        if cd is None:
+            cerrados.append(nombres[0])
+            continue
+        if len(tiendas) < len(nombres) - 2:
+            conBajas.append(len(rutas))
+        rutas.append([cd] + tiendas + [cd])
+
+    # los CDs nuevos empiezan con una ruta vacia
+    conRuta = {r[0] for r in rutas}
+    rutas.extend([cd, cd] for cd in indices_cds.tolist() if cd not in conRuta)
+
+    asignadas = {t for r in rutas for t in r[1:-1]}
+    sinRuta = [t for t in indices_tiendas.tolist() if t not in asignadas]
+    return rutas, sinRuta, cerrados, conBajas
+
+# funcion para insertar una tienda en la posicion mas barata de un conjunto de rutas
+def insercionMasBarata(rutas: Solucion, tienda: int, matrizArcos: MatrizDistancia, candidatas: Optional[List[int]] = None) -> Tuple[int, int, float]:
+    # para cada ruta el costo de insertar x entre u y v es A[u, x] + A[x, v] - A[u, v],
+    # evaluado para todos los tramos de la ruta a la vez; devuelve (ruta, posicion, delta)
+    mejor = (-1, -1, np.inf)
+    for k in (candidatas if candidatas is not None else range(len(rutas))):
+        ruta = np.asarray(rutas[k])
+        u, v = ruta[:-1], ruta[1:]
+        deltas = np.asarray(matrizArcos[u, tienda]) + np.asarray(matrizArcos[tienda, v]) - np.asarray(matrizArcos[u, v])
+        j = int(np.argmin(deltas))
+        if deltas[j] < mejor[2]:
+            mejor = (k, j + 1, float(deltas[j]))
+    return mejor
+
+# funcion para re-optimizar una solucion guardada despues de cambios en las tiendas
+def reoptimizarIncremental(
+    coordenadas: pd.DataFrame,
+    matrizDistancia: MatrizDistancia,
+    matrizArcos: MatrizDistancia,
+    archivoSolucion: str,
+    rutasVecinas: int = 3,          # rutas candidatas para cada insercion (las de los CDs mas cercanos)
+    T0: float = 0.5,                # temperatura baja: solo se acomodan los cambios
+    TF: float = 0.05,
+    alpha: float = 0.9,
+    L: int = 200,
+    semilla: Optional[int] = 0,
+    verbose: bool = True
+) -> Tuple[Solucion, float, Dict[str, Any]]:
+    # carga la solucion anterior, quita las tiendas cerradas, inserta las nuevas con la
+    # insercion mas barata y recuece a baja temperatura solo las rutas que cambiaron
+    inicio = time.perf_counter()
+    rutas, sinRuta, cerrados, conBajas = cargarSolucion(archivoSolucion, coordenadas)
+
+    # para cada tienda nueva solo se prueban las rutas de sus CDs mas cercanos
+    afectadas = set(conBajas)
+    if sinRuta:
+        cds = np.array([r[0] for r in rutas])
+        distancias = np.asarray(matrizDistancia[np.asarray(sinRuta)[:, None], cds[None, :]])
+        cercanas = np.argsort(distancias, axis=1)[:, :rutasVecinas]
+    for t, tienda in enumerate(sinRuta):
+        k, posicion, _ = insercionMasBarata(rutas, tienda, matrizArcos, cercanas[t].tolist())
+        rutas[k].insert(posicion, tienda)
+        afectadas.add(k)
+
+    # rutas afectadas: las que perdieron o recibieron tiendas
+    afectadas = sorted(afectadas)
+    costoInsercion = calcularCostoArcos(rutas, matrizArcos)
+
+    # recocido corto solo sobre las rutas afectadas (el resto de la solucion no se toca)
+    if afectadas and T0 > TF:
+        subSolucion, _, _ = recocidoSimulado(
+            matrizDistancia,
+            None,
+            T0=T0,
+            TF=TF,
+            alpha=alpha,
+            L=L,
+            matrizArcos=matrizArcos,
+            semilla=semilla,
+            verbose=False,
+            vecindario=Vecindario(MEZCLA_INCREMENTAL if len(afectadas) > 1 else {"2opt": 0.6, "oropt": 0.4}),
+            solucionInicio=[rutas[k] for k in afectadas]
+        )
+        for k, ruta in zip(afectadas, subSolucion):
+            rutas[k] = ruta
+
+    costo = calcularCostoArcos(rutas, matrizArcos)
+    estadisticas = {
+        "tiendasNuevas": len(sinRuta),
+        "nodosCerrados": cerrados,
+        "rutasAfectadas": len(afectadas),
+        "costoInsercion": costoInsercion,
+        "costoFinal": costo,
+        "segundos": time.perf_counter() - inicio,
+    }
+    if verbose:
+        print(f"Re-optimizacion incremental: {len(sinRuta)} tiendas insertadas, {len(cerrados)} nodos cerrados, "
+              f"{len(afectadas)} rutas afectadas, ${costoInsercion:,.2f} -> ${costo:,.2f} MXN "
+              f"en {estadisticas['segundos']:.2f} s")
+    return rutas, costo, estadisticas
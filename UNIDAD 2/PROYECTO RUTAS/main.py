@@ -1,108 +1,260 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
-import folium
 import os
+import sys
 from typing import List, Tuple 
 from cargarDatos import cargarDatos
 from recocidoSimulado import recocidoSimulado
+from multiInicio import recocidoMultiInicio
+from templadoParalelo import templadoParalelo
+from descomposicion import recocidoDescomposicion
+from incremental import guardarSolucion, reoptimizarIncremental
+from vecindario import Vecindario, MEZCLA_DEFAULT
+from recocidoLotes import MEZCLA_LOTES
+from candidatos import cargarCandidatos
+from telemetria import crearHistorial, EstadisticasMovimientos
+from enfriamiento import EnfriamientoGeometrico, EnfriamientoAdaptativo, CriterioParada
 from funcionDeCosto import calcularCosto, Solucion
 from solucion import solucionInicial
+from mapa import mapaRutas
 
 # parametros 
 DIR_BASE = os.path.dirname(os.path.abspath(__file__))
 ARCH_COORDS = os.path.join(DIR_BASE, "datos", "coordenadas.csv")
 ARCH_DIST = os.path.join(DIR_BASE, "datos", "distancia.csv")
 ARCH_COSTO = os.path.join(DIR_BASE, "datos", "costo_combustible.csv")
+
+# red vial local (lista de aristas .csv o extracto .osm) para distancias por calle en lugar
+# de haversine, p. ej. os.path.join(DIR_BASE, "datos", "red_vial.osm") (None = haversine)
+ARCH_RED = None
+# como se vuelve simetrica la red con calles de un solo sentido: "media" o "minima" de ambos sentidos
+SIMETRIA_RED = "media"
 SALIDA_HTML = "rutas_optimas_culiacan.html"
 
+# mapa: "auto" (capas GeoJSON con muchas tiendas), "marcadores" o "geojson"; tolerancia en metros
+# para simplificar las lineas de las rutas (None = sin simplificar) y tiendas agrupadas en geojson
+MAPA_MODO = "auto"
+MAPA_TOLERANCIA = None
+MAPA_AGRUPAR = False
+
+# almacenamiento de las matrices: "densa", "condensada" o "haversine" (instancias grandes)
+ALMACENAMIENTO = "densa"
+
 # parametros del recocido simulado
-T_INICIAL = 100.0  
+# con movimientos entre rutas la temperatura inicial debe ser del orden del costo de un tramo,
+# a T = 100 las tiendas se reparten al azar entre CDs y el enfriamiento no alcanza a ordenarlas
+T_INICIAL = 2.0    
 T_FINAL = 0.1       
 ALPHA = 0.95       
 L = 200 
 
-# funcion para generar el mapa de rutas
-def mapaRutas(coords: pd.DataFrame, solucion: Solucion, html: str):
+# enfriamiento: "geometrico" (T *= ALPHA) o "adaptativo" (segun la tasa de aceptacion, con recalentamiento)
+ENFRIAMIENTO = "geometrico"
+TASA_OBJETIVO = 0.3
 
-    # paleta de colores para las rutas
-    colors = ['darkred', 'blue', 'green', 'purple', 'orange', 'darkblue', 'darkgreen', 'cadetblue', 'black', 'red']
-    
-    # determinar el centro del mapa
-    latitudCentro = coords['Latitud_WGS84'].mean()
-    longitudCentro = coords['Longitud_WGS84'].mean()
-    
-    # crear el mapa base
-    m = folium.Map(location=[latitudCentro, longitudCentro], zoom_start=11)
-    
-    # trazar las rutas y agregar marcadores
-    for i, route in enumerate(solucion):
-        color = colors[i % len(colors)]
-        route_coords = []
-        
-        if not route: continue
-
-        cd_index = route[0]
-
-        # recolectar coordenadas y marcar nodos
-        for j, node_index in enumerate(route):
-            lat = coords.loc[node_index, 'Latitud_WGS84']
-            lon = coords.loc[node_index, 'Longitud_WGS84']
-            route_coords.append((lat, lon))
-            
-            nombre = coords.loc[node_index, 'Nombre']
-            tipo = coords.loc[node_index, 'Tipo']
-            
-            # marcar CD
-            if tipo == 'Centro de Distribución' and j == 0:
-                folium.Marker(
-                    location=[lat, lon],
-                    popup=f"CD {cd_index+1}",
-                    icon=folium.Icon(color=color, icon='warehouse', prefix='fa')
-                ).add_to(m)
-            # marcar tiendas
-            elif tipo == 'Tienda':
-                folium.CircleMarker(
-                    location=[lat, lon],
-                    radius=5,
-                    color=color,
-                    fill=True,
-                    fill_color=color,
-                    fill_opacity=0.7,
-                    popup=nombre
-                ).add_to(m)
-
-        # dibujar la linea de la ruta
-        if len(route_coords) > 1:
-            folium.PolyLine(
-                locations=route_coords,
-                color=color,
-                weight=3.5,
-                opacity=0.8,
-                popup=f"Ruta {i+1} (CD {cd_index+1})"
-            ).add_to(m)
-
-    m.save(html)
-    print(f"\nMapa de rutas generado y guardado como '{html}'")
+# reglas de parada ademas de T_FINAL (None = desactivada)
+VENTANA_ESTANCAMIENTO = None    # ciclos seguidos sin mejorar la mejor solucion
+TIEMPO_MAXIMO = None            # segundos
+COSTO_OBJETIVO = None           # MXN
+
+# evaluacion por lotes de los L movimientos de cada temperatura (solo swap y 2opt)
+LOTES = False
+
+# mezcla de operadores del vecindario (pesos relativos): swap, 2opt, oropt, reubicar, intercambio
+OPERADORES = MEZCLA_LOTES if LOTES else MEZCLA_DEFAULT
+
+# solucion inicial: "cercano" (cada tienda a su CD mas cercano) o "barrido" (ordenadas por angulo)
+INICIAL = "cercano"
+
+# listas de candidatos: los movimientos eligen pareja entre las K tiendas mas cercanas (0 = al azar)
+K_CANDIDATOS = 8
+
+# historial del costo por iteracion: "completo", "anillo" (ultimas N), "muestreo" (1 de cada K)
+# o "archivo" (se escribe a disco mientras corre, .bin o .csv)
+HISTORIAL = "completo"
+HISTORIAL_CAPACIDAD = 100_000
+HISTORIAL_CADA = 100
+ARCH_HISTORIAL = os.path.join(DIR_BASE, "historial_costo.bin")
+
+# segundos minimos entre filas de la tabla de progreso
+INTERVALO_PROGRESO = 1.0
+
+# perfil del modo simple: tiempo de generacion vs evaluacion de movimientos y conteos de
+# movimientos por temperatura y por operador (None en ARCH_ESTADISTICAS = solo por consola)
+ESTADISTICAS = False
+ARCH_ESTADISTICAS = os.path.join(DIR_BASE, "estadisticas_movimientos.json")
+
+# punto de control del modo simple (desactivado por defecto): con PUNTO_CONTROL = True o
+# `python main.py --punto-control` se guarda cada CADA_PUNTO_CONTROL ciclos de temperatura
+# y con `python main.py --reanudar` la corrida continua exactamente donde se quedo
+# (solo si los datos y parametros son los mismos); el historial solo registra la parte reanudada
+PUNTO_CONTROL = False
+ARCH_PUNTO_CONTROL = os.path.join(DIR_BASE, "punto_control.npz")
+CADA_PUNTO_CONTROL = 10
+
+# solucion de la ultima corrida (por nombres de nodo), punto de partida del modo "incremental"
+ARCH_SOLUCION = os.path.join(DIR_BASE, "solucion_rutas.json")
+
+# modo de ejecucion: "simple" (una cadena), "multiinicio", "templado" (intercambio de replicas),
+# "descomposicion" (un recocido por CD en paralelo y reparacion de la frontera)
+# o "incremental" (re-optimiza la solucion guardada despues de abrir o cerrar tiendas)
+MODO = "simple"
+SEMILLA = 0
+
+# multi-inicio: numero de cadenas independientes y procesos (None = todos los nucleos)
+CADENAS = 4
+PROCESOS = None
+
+# descomposicion: pasadas de la busqueda local sobre las tiendas de frontera (necesita candidatos)
+PASADAS_REPARACION = 3
+
+# templado paralelo: numero de replicas y rondas de L iteraciones entre intercambios
+REPLICAS = 8
+RONDAS = 135
 
 # funcion principal
-def main():
+def main(reanudar: bool = False, puntoControl: bool = PUNTO_CONTROL):
+    # el modo incremental parte de la solucion guardada: sin ella no se hace una corrida completa a escondidas
+    if MODO == "incremental" and not os.path.exists(ARCH_SOLUCION):
+        raise FileNotFoundError(
+            f"El modo incremental necesita la solucion guardada '{ARCH_SOLUCION}'; "
+            f"ejecute primero otro modo (p. ej. MODO = \"simple\") para generarla"
+        )
+
     # cargar datos
-    coords_df, dist_matriz, cost_matriz = cargarDatos(
+    coords_df, dist_matriz, cost_matriz, arcos_matriz = cargarDatos(
         ARCH_COORDS, 
         ARCH_DIST, 
-        ARCH_COSTO
+        ARCH_COSTO,
+        almacenamiento=ALMACENAMIENTO,
+        archivoRed=ARCH_RED,
+        simetria=SIMETRIA_RED,
+        procesos=PROCESOS
     )
     
+    # vecindario de movimientos, guiado por las tiendas mas cercanas si hay candidatos
+    candidatos = cargarCandidatos(ARCH_COORDS, coords_df, K_CANDIDATOS) if K_CANDIDATOS > 0 else None
+    vecindario = Vecindario(OPERADORES, candidatos=candidatos)
+
+    # solucion de partida, CDs y tiendas segun la columna Tipo de las coordenadas
+    solucion0 = solucionInicial(dist_matriz, coords_df, INICIAL)
+
+    # esquema de enfriamiento y reglas de parada
+    if ENFRIAMIENTO == "adaptativo":
+        enfriamiento = EnfriamientoAdaptativo(ALPHA, tasaObjetivo=TASA_OBJETIVO)
+    else:
+        enfriamiento = EnfriamientoGeometrico(ALPHA)
+    parada = CriterioParada(VENTANA_ESTANCAMIENTO, TIEMPO_MAXIMO, COSTO_OBJETIVO)
+
     # ejecuta el recocido simulado
-    mejorSolucion, costoFinal, historialCost = recocidoSimulado(
-        dist_matriz,
-        cost_matriz,
-        T0=T_INICIAL,
-        TF=T_FINAL,
-        alpha=ALPHA,
-        L=L
-    )
+    if MODO == "incremental":
+        # solo se insertan las tiendas nuevas y se recuecen las rutas que cambiaron
+        mejorSolucion, costoFinal, estadisticasIncremental = reoptimizarIncremental(
+            coords_df,
+            dist_matriz,
+            arcos_matriz,
+            ARCH_SOLUCION,
+            semilla=SEMILLA
+        )
+    elif MODO == "multiinicio":
+        # varias cadenas independientes en paralelo, se queda la mejor
+        mejorSolucion, costoFinal, estadisticasCadenas = recocidoMultiInicio(
+            dist_matriz,
+            cost_matriz,
+            numCadenas=CADENAS,
+            procesos=PROCESOS,
+            semillaBase=SEMILLA,
+            matrizArcos=arcos_matriz,
+            vecindario=vecindario,
+            solucionInicio=solucion0,
+            lotes=LOTES,
+            enfriamiento=enfriamiento,
+            parada=parada,
+            T0=T_INICIAL,
+            TF=T_FINAL,
+            alpha=ALPHA,
+            L=L
+        )
+        print("\n| Cadena | Semilla    | Costo Inicial | Costo Final | Tiempo (s) | Parada            |")
+        print("|--------|------------|---------------|-------------|------------|-------------------|")
+        for e in estadisticasCadenas:
+            print(f"| {e['cadena']:^6} | {e['semilla']:<10} | ${e['costoInicial']:^11.2f} | ${e['costoFinal']:^9.2f} | {e['segundos']:^10.2f} | {e['motivoParada']:<17} |")
+    elif MODO == "descomposicion":
+        # cada CD con sus tiendas se resuelve por separado y luego se repara la frontera
+        mejorSolucion, costoFinal, estadisticasDescomposicion = recocidoDescomposicion(
+            dist_matriz,
+            cost_matriz,
+            solucionInicio=solucion0,
+            candidatos=candidatos,
+            procesos=PROCESOS,
+            semillaBase=SEMILLA,
+            matrizArcos=arcos_matriz,
+            pasadasReparacion=PASADAS_REPARACION,
+            enfriamiento=enfriamiento,
+            parada=parada,
+            T0=T_INICIAL,
+            TF=T_FINAL,
+            alpha=ALPHA,
+            L=L
+        )
+        print("\n| CD  | Tiendas | Costo Inicial | Costo Final | Tiempo (s) |")
+        print("|-----|---------|---------------|-------------|------------|")
+        for e in estadisticasDescomposicion["clusters"]:
+            print(f"| {e['cd']:^3} | {e['tiendas']:^7} | ${e['costoInicial']:^11.2f} | ${e['costoFinal']:^9.2f} | {e['segundos']:^10.2f} |")
+        print(f"\nCosto al unir los clusters: ${estadisticasDescomposicion['costoUnido']:,.2f} MXN")
+        print(f"Reparacion de frontera: {estadisticasDescomposicion['tiendasFrontera']} tiendas, "
+              f"{estadisticasDescomposicion['movimientosReparacion']} movimientos aplicados")
+        print(f"Tiempo: {estadisticasDescomposicion['segundos']:.2f} s")
+    elif MODO == "templado":
+        # replicas a temperaturas fijas que intercambian estados entre temperaturas vecinas
+        mejorSolucion, costoFinal, estadisticasTemplado = templadoParalelo(
+            dist_matriz,
+            cost_matriz,
+            numReplicas=REPLICAS,
+            Tmin=T_FINAL,
+            Tmax=T_INICIAL,
+            rondas=RONDAS,
+            L=L,
+            semillaBase=SEMILLA,
+            matrizArcos=arcos_matriz,
+            vecindario=vecindario,
+            solucionInicio=solucion0,
+            lotes=LOTES
+        )
+        tasas = ", ".join(f"{t:.2f}" for t in estadisticasTemplado["tasaIntercambio"])
+        print(f"\nTasa de intercambio entre temperaturas vecinas: {tasas}")
+        print(f"Tiempo: {estadisticasTemplado['segundos']:.2f} s")
+    else:
+        estadisticas = EstadisticasMovimientos() if ESTADISTICAS else None
+        mejorSolucion, costoFinal, historialCost = recocidoSimulado(
+            dist_matriz,
+            cost_matriz,
+            T0=T_INICIAL,
+            TF=T_FINAL,
+            alpha=ALPHA,
+            L=L,
+            matrizArcos=arcos_matriz,
+            vecindario=vecindario,
+            solucionInicio=solucion0,
+            lotes=LOTES,
+            historial=crearHistorial(HISTORIAL, HISTORIAL_CAPACIDAD, HISTORIAL_CADA, ARCH_HISTORIAL),
+            intervaloProgreso=INTERVALO_PROGRESO,
+            enfriamiento=enfriamiento,
+            parada=parada,
+            puntoControl=ARCH_PUNTO_CONTROL if puntoControl or reanudar else None,
+            cadaPuntoControl=CADA_PUNTO_CONTROL,
+            reanudar=reanudar,
+            estadisticas=estadisticas
+        )
+        if estadisticas is not None:
+            estadisticas.reporte()
+            if ARCH_ESTADISTICAS:
+                estadisticas.guardarJson(ARCH_ESTADISTICAS)
+                print(f"Estadisticas de movimientos guardadas en '{ARCH_ESTADISTICAS}'")
+
+    # la solucion se guarda para poder re-optimizarla despues de cambios en las tiendas
+    guardarSolucion(ARCH_SOLUCION, mejorSolucion, coords_df, costoFinal)
     
     # resultados por consola
     print("\n--- RESULTADOS FINALES DE LA OPTIMIZACIÓN ---")
@@ -116,7 +268,11 @@ def main():
         print(f"Ruta {i+1}: {ruta_str}")
         
     # generar mapa de rutas
-    mapaRutas(coords_df, mejorSolucion, SALIDA_HTML)
+    mapaRutas(coords_df, mejorSolucion, SALIDA_HTML, MAPA_MODO, MAPA_TOLERANCIA, MAPA_AGRUPAR)
     
+# funcion para continuar una corrida interrumpida desde su punto de control
+def reanudarCorrida():
+    main(reanudar=True)
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(reanudar="--reanudar" in sys.argv[1:], puntoControl=PUNTO_CONTROL or "--punto-control" in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+import folium
+from folium.plugins import FastMarkerCluster
+from typing import List, Optional
+
+from funcionDeCosto import Solucion
+from solucion import TIPO_CD, TIPO_TIENDA
+
+# paleta de colores para las rutas
+COLORES = ['darkred', 'blue', 'green', 'purple', 'orange', 'darkblue', 'darkgreen', 'cadetblue', 'black', 'red']
+
+# modos del mapa: "marcadores" (un objeto folium por tienda, el mapa original),
+# "geojson" (una capa GeoJSON por ruta) o "auto" (geojson arriba de UMBRAL_GEOJSON tiendas)
+MODOS_MAPA = ("auto", "marcadores", "geojson")
+UMBRAL_GEOJSON = 1000
+
+# metros por grado de latitud (para la tolerancia de la simplificacion)
+METROS_POR_GRADO = 111_320.0
+
+
+# funcion para simplificar una linea con Douglas-Peucker
+def simplificarLinea(xy: np.ndarray, tolerancia: float) -> np.ndarray:
+    # devuelve la mascara de los puntos que se conservan: se queda con el punto mas alejado
+    # del segmento entre los extremos si pasa la tolerancia y se repite en cada mitad
+    # (con una pila en lugar de recursion para rutas largas)
+    n = len(xy)
+    conservar = np.ones(n, dtype=bool)
+    if n <= 2 or not tolerancia or tolerancia <= 0:
+        return conservar
+    conservar[1:-1] = False
+    pila = [(0, n - 1)]
+    while pila:
+        i, j = pila.pop()
+        if j <= i + 1:
+            continue
+        segmento = xy[j] - xy[i]
+        puntos = xy[i + 1:j] - xy[i]
+        largo = np.hypot(segmento[0], segmento[1])
+        # una ruta empieza y termina en su CD: con extremos iguales se usa la distancia al punto
+        if largo == 0:
+            distancias = np.hypot(puntos[:, 0], puntos[:, 1])
+        else:
+            distancias = np.abs(segmento[0] * puntos[:, 1] - segmento[1] * puntos[:, 0]) / largo
+        k = int(np.argmax(distancias))
+        if distancias[k] > tolerancia:
+            medio = i + 1 + k
+            conservar[medio] = True
+            pila.append((i, medio))
+            pila.append((medio, j))
+    return conservar
+
+# funcion para obtener los puntos (lat, lon) de la linea de una ruta
+def lineaRuta(lats: np.ndarray, lons: np.ndarray, ruta: np.ndarray, tolerancia: Optional[float]) -> np.ndarray:
+    # la tolerancia va en metros; la longitud se escala por cos(lat) para medir en un plano
+    puntos = np.column_stack((lats[ruta], lons[ruta]))
+    if tolerancia:
+        escala = np.array([1.0, np.cos(np.radians(puntos[:, 0].mean()))]) * METROS_POR_GRADO
+        puntos = puntos[simplificarLinea(puntos * escala, tolerancia)]
+    return puntos
+
+# funcion para generar el mapa de rutas
+def mapaRutas(
+    coords: pd.DataFrame,
+    solucion: Solucion,
+    html: str,
+    modo: str = "auto",
+    tolerancia: Optional[float] = None,  # metros para simplificar las lineas (None = sin simplificar)
+    agrupar: bool = False                # en modo geojson, tiendas en un solo grupo de marcadores agrupados
+):
+    if modo not in MODOS_MAPA:
+        raise ValueError(f"Modo de mapa desconocido: {modo} (opciones: {', '.join(MODOS_MAPA)})")
+
+    # coordenadas, nombres y tipos como arreglos: se indexan con la ruta completa de una vez
+    lats = coords['Latitud_WGS84'].values.astype(np.float64)
+    lons = coords['Longitud_WGS84'].values.astype(np.float64)
+    nombres = coords['Nombre'].values
+    esTienda = (coords['Tipo'] == TIPO_TIENDA).values
+    esCD = (coords['Tipo'] == TIPO_CD).values
+
+    if modo == "auto":
+        modo = "geojson" if int(esTienda.sum()) > UMBRAL_GEOJSON else "marcadores"
+
+    # crear el mapa base centrado en los nodos
+    m = folium.Map(location=[float(lats.mean()), float(lons.mean())], zoom_start=11)
+
+    tiendasAgrupadas: List[np.ndarray] = []
+    for i, route in enumerate(solucion):
+        if not route:
+            continue
+        color = COLORES[i % len(COLORES)]
+        ruta = np.asarray(route)
+        cd_index = int(ruta[0])
+
+        # marcar CD (son pocos, siempre como marcador con icono)
+        if esCD[cd_index]:
+            folium.Marker(
+                location=[lats[cd_index], lons[cd_index]],
+                popup=f"CD {cd_index+1}",
+                icon=folium.Icon(color=color, icon='warehouse', prefix='fa')
+            ).add_to(m)
+
+        tiendas = ruta[esTienda[ruta]]
+        linea = lineaRuta(lats, lons, ruta, tolerancia) if len(ruta) > 1 else None
+
+        if modo == "marcadores":
+            # marcar tiendas
+            for t in tiendas.tolist():
+                folium.CircleMarker(
+                    location=[lats[t], lons[t]],
+                    radius=5,
+                    color=color,
+                    fill=True,
+                    fill_color=color,
+                    fill_opacity=0.7,
+                    popup=nombres[t]
+                ).add_to(m)
+            # dibujar la linea de la ruta
+            if linea is not None:
+                folium.PolyLine(
+                    locations=linea.tolist(),
+                    color=color,
+                    weight=3.5,
+                    opacity=0.8,
+                    popup=f"Ruta {i+1} (CD {cd_index+1})"
+                ).add_to(m)
+            continue
+
+        # modo geojson: la linea y las tiendas de la ruta van en una sola capa
+        # (GeoJSON usa el orden lon, lat; 6 decimales son ~0.1 m)
+        caracteristicas = []
+        if linea is not None:
+            caracteristicas.append({
+                "type": "Feature",
+                "properties": {"nombre": f"Ruta {i+1} (CD {cd_index+1})"},
+                "geometry": {"type": "LineString", "coordinates": np.round(linea[:, ::-1], 6).tolist()},
+            })
+        if agrupar:
+            tiendasAgrupadas.append(tiendas)
+        else:
+            puntos = np.round(np.column_stack((lons[tiendas], lats[tiendas])), 6).tolist()
+            caracteristicas.extend(
+                {"type": "Feature", "properties": {"nombre": str(nombre)}, "geometry": {"type": "Point", "coordinates": punto}}
+                for nombre, punto in zip(nombres[tiendas], puntos)
+            )
+        folium.GeoJson(
+            {"type": "FeatureCollection", "features": caracteristicas},
+            name=f"Ruta {i+1}",
+            style_function=lambda _, color=color: {"color": color, "weight": 3.5, "opacity": 0.8, "fillColor": color, "fillOpacity": 0.7},
+            marker=folium.CircleMarker(radius=4, fill=True),
+            tooltip=folium.GeoJsonTooltip(fields=["nombre"], labels=False),
+        ).add_to(m)
+
+    # tiendas de todas las rutas en un grupo de marcadores que se arma en el navegador
+    if tiendasAgrupadas:
+        todas = np.concatenate(tiendasAgrupadas)
+        FastMarkerCluster(np.round(np.column_stack((lats[todas], lons[todas])), 6).tolist(), name="Tiendas").add_to(m)
+
+    m.save(html)
+    print(f"\nMapa de rutas generado y guardado como '{html}'")
@@ -0,0 +1,153 @@
+import os
+import time
+import traceback
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple, Optional, Dict, Any
+
+from funcionDeCosto import Solucion
+from recocidoSimulado import recocidoSimulado
+from telemetria import HistorialAnillo
+from enfriamiento import CriterioParada
+from proveedorDistancia import MatrizDistancia, ProveedorCondensado, ProveedorArcos, ProveedorDenso, matrizArcosDe
+
+# descriptor de un arreglo en memoria compartida: (nombre, forma, tipo)
+Descriptor = Tuple[str, Tuple[int, ...], str]
+
+
+# funcion para copiar un arreglo a un bloque de memoria compartida
+def compartirArreglo(arreglo: np.ndarray, bloques: List[shared_memory.SharedMemory]) -> Descriptor:
+    bloque = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+    vista = np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=bloque.buf)
+    vista[...] = arreglo
+    del vista
+    bloques.append(bloque)
+    return bloque.name, arreglo.shape, arreglo.dtype.str
+
+# funcion para abrir un arreglo compartido desde un proceso trabajador
+def abrirArreglo(descriptor: Descriptor, bloques: List[shared_memory.SharedMemory]) -> np.ndarray:
+    nombre, forma, tipo = descriptor
+    bloque = shared_memory.SharedMemory(name=nombre)
+    bloques.append(bloque)
+    return np.ndarray(forma, dtype=np.dtype(tipo), buffer=bloque.buf)
+
+# funcion para preparar una matriz (o proveedor) para enviarla a los trabajadores
+def compartirMatriz(matriz, bloques: List[shared_memory.SharedMemory]):
+    # los arreglos grandes se copian una sola vez a memoria compartida y solo se
+    # envia su descriptor; los proveedores condensados comparten su arreglo de valores
+    if isinstance(matriz, np.ndarray):
+        return ("arreglo", compartirArreglo(np.asarray(matriz), bloques))
+    if isinstance(matriz, ProveedorDenso):
+        return ("denso", compartirArreglo(np.asarray(matriz.matriz), bloques))
+    if isinstance(matriz, ProveedorCondensado):
+        return ("condensado", compartirArreglo(matriz.valores, bloques), matriz.n)
+    if isinstance(matriz, ProveedorArcos):
+        return ("arcos", compartirMatriz(matriz.distancia, bloques), compartirMatriz(matriz.costo, bloques))
+    # otros casos (haversine al vuelo, costo escalar) son pequeños y se envian tal cual
+    return ("objeto", matriz)
+
+# funcion para reconstruir una matriz compartida dentro del trabajador
+def abrirMatriz(compartida, bloques: List[shared_memory.SharedMemory]):
+    tipo = compartida[0]
+    if tipo == "arreglo":
+        return abrirArreglo(compartida[1], bloques)
+    if tipo == "denso":
+        return ProveedorDenso(abrirArreglo(compartida[1], bloques))
+    if tipo == "condensado":
+        return ProveedorCondensado(abrirArreglo(compartida[1], bloques), compartida[2])
+    if tipo == "arcos":
+        return ProveedorArcos(abrirMatriz(compartida[1], bloques), abrirMatriz(compartida[2], bloques))
+    return compartida[1]
+
+# funcion que ejecuta una cadena de recocido en un proceso trabajador
+def ejecutarCadena(
+    indice: int,
+    semilla: int,
+    distanciaCompartida,
+    arcosCompartida,
+    parametros: Dict[str, Any]
+) -> Dict[str, Any]:
+    bloques: List[shared_memory.SharedMemory] = []
+    inicio = time.perf_counter()
+    matrizDistancia = matrizArcos = None
+    try:
+        matrizDistancia = abrirMatriz(distanciaCompartida, bloques)
+        matrizArcos = abrirMatriz(arcosCompartida, bloques)
+        # cada cadena tiene su copia de las reglas de parada, de ahi se lee su motivo
+        parametros = dict(parametros)
+        parada = parametros.pop("parada", None) or CriterioParada()
+        solucion, costo, historial = recocidoSimulado(
+            matrizDistancia,
+            None,
+            matrizArcos=matrizArcos,
+            semilla=semilla,
+            verbose=False,
+            historial=HistorialAnillo(1024),  # solo se reportan el costo inicial y las iteraciones
+            parada=parada,
+            **parametros
+        )
+    except BaseException as error:
+        # los marcos del traceback (el recocido y sus funciones) tambien guardan vistas
+        # de la memoria compartida; se limpian para que close() no oculte el error real
+        traceback.clear_frames(error.__traceback__)
+        raise
+    finally:
+        # se sueltan las vistas antes de cerrar la memoria compartida (tambien si hubo error)
+        matrizDistancia = matrizArcos = None
+        for bloque in bloques:
+            bloque.close()
+
+    return {
+        "cadena": indice,
+        "semilla": semilla,
+        "costoInicial": historial.primero,
+        "costoFinal": costo,
+        "iteraciones": len(historial) - 1,
+        "motivoParada": parada.motivo,
+        "segundos": time.perf_counter() - inicio,
+        "pid": os.getpid(),
+        "solucion": solucion,
+    }
+
+# funcion para ejecutar varias cadenas de recocido independientes en paralelo
+def recocidoMultiInicio(
+    matrizDistancia: MatrizDistancia,
+    matrizCosto: Optional[MatrizDistancia],
+    numCadenas: int = 4,
+    procesos: Optional[int] = None,  # None usa todos los nucleos
+    semillaBase: int = 0,
+    matrizArcos: Optional[MatrizDistancia] = None,
+    **parametros                     # T0, TF, alpha, L, vecindario, enfriamiento, parada... del recocido
+) -> Tuple[Solucion, float, List[Dict[str, Any]]]:
+    # lanza numCadenas recocidos independientes en un pool de procesos y devuelve
+    # la mejor solucion junto con las estadisticas de cada cadena
+
+    if matrizArcos is None:
+        matrizArcos = matrizArcosDe(matrizDistancia, matrizCosto)
+
+    # cada cadena recibe su propio flujo aleatorio derivado de la semilla base
+    semillas = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(semillaBase).spawn(numCadenas)]
+
+    # las matrices se publican una sola vez en memoria compartida (no se copian a cada proceso)
+    bloques: List[shared_memory.SharedMemory] = []
+    try:
+        distanciaCompartida = compartirMatriz(matrizDistancia, bloques)
+        arcosCompartida = compartirMatriz(matrizArcos, bloques)
+
+        print(f"Ejecutando {numCadenas} cadenas de recocido en {procesos or os.cpu_count()} procesos...")
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            futuros = [
+                ejecutor.submit(ejecutarCadena, i, semilla, distanciaCompartida, arcosCompartida, parametros)
+                for i, semilla in enumerate(semillas)
+            ]
+            resultados = [futuro.result() for futuro in futuros]
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+
+    # la mejor cadena define la solucion final
+    mejor = min(resultados, key=lambda r: r["costoFinal"])
+    estadisticas = [{k: v for k, v in r.items() if k != "solucion"} for r in resultados]
+    return mejor["solucion"], mejor["costoFinal"], estadisticas
@@ -0,0 +1,308 @@
+import numpy as np
+import pandas as pd
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Tuple, Union, Optional
+from distancia import trigCoordenadas, haversineTrig
+
+# tipos de almacenamiento disponibles para las matrices de la instancia
+ALMACENAMIENTOS = ("densa", "condensada", "haversine")
+
+
+class ProveedorDistancia(ABC):
+    # interfaz comun para las matrices n x n de la instancia (distancia, costo o tramos)
+    # se indexa igual que un arreglo de numpy: prov[i, j], prov[i, lista] o prov[filas, columnas]
+    # por eso calcularCosto, cdCercano y el recocido funcionan igual con cualquier backend
+
+    def __init__(self, n: int):
+        self.n = n
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.n, self.n)
+
+    def __len__(self) -> int:
+        return self.n
+
+    def __getitem__(self, indices):
+        i, j = indices
+        # par de nodos escalar (caso del delta en el recocido)
+        if np.isscalar(i) and np.isscalar(j):
+            return self.valor(int(i), int(j))
+        # los slice se convierten a arreglos de indices
+        if isinstance(i, slice):
+            i = np.arange(self.n)[i]
+        if isinstance(j, slice):
+            j = np.arange(self.n)[j]
+        # una sola fila contra varias columnas (caso de cdCercano)
+        if np.isscalar(i):
+            return self.fila(int(i))[np.asarray(j)]
+        # pares de nodos con broadcasting (caso de calcularCosto)
+        i, j = np.broadcast_arrays(np.asarray(i, dtype=np.int64), np.asarray(j, dtype=np.int64))
+        return self.pares(i, j)
+
+    def __array__(self, dtype=None, copy=None):
+        # permite np.asarray(proveedor) para instancias que si caben en memoria
+        filas = np.stack([self.fila(i) for i in range(self.n)])
+        return filas if dtype is None else filas.astype(dtype)
+
+    @abstractmethod
+    def valor(self, i: int, j: int) -> float:
+        ...
+
+    @abstractmethod
+    def fila(self, i: int) -> np.ndarray:
+        ...
+
+    @abstractmethod
+    def pares(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        ...
+
+    @property
+    def nbytes(self) -> int:
+        # memoria ocupada por el backend
+        return 0
+
+
+class ProveedorDenso(ProveedorDistancia):
+    # backend denso: envuelve una matriz n x n normal (o mapeada en memoria)
+
+    def __init__(self, matriz: np.ndarray):
+        super().__init__(len(matriz))
+        self.matriz = matriz
+
+    def valor(self, i: int, j: int) -> float:
+        return float(self.matriz[i, j])
+
+    def fila(self, i: int) -> np.ndarray:
+        return self.matriz[i]
+
+    def pares(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        return self.matriz[i, j]
+
+    @property
+    def nbytes(self) -> int:
+        return self.matriz.nbytes
+
+
+class ProveedorCondensado(ProveedorDistancia):
+    # backend simetrico: guarda solo el triangulo superior sin la diagonal
+    # en un arreglo plano de n(n-1)/2 valores (float32 por defecto), menos de la cuarta
+    # parte de la memoria de la matriz densa en float64
+
+    def __init__(self, valores: np.ndarray, n: int):
+        super().__init__(n)
+        self.valores = valores
+
+    @classmethod
+    def desdeMatriz(cls, matriz: np.ndarray, dtype: type = np.float32) -> "ProveedorCondensado":
+        # copia el triangulo superior fila por fila para no crear indices de tamaño n^2
+        n = len(matriz)
+        valores = np.empty(n * (n - 1) // 2, dtype=dtype)
+        k = 0
+        for i in range(n - 1):
+            valores[k:k + n - i - 1] = matriz[i, i + 1:]
+            k += n - i - 1
+        return cls(valores, n)
+
+    @classmethod
+    def desdeCSV(
+        cls,
+        archivo: str,
+        dtype: type = np.float32,
+        tamBloque: int = 512,
+        rtol: float = 1e-5,
+        atol: float = 1e-8
+    ) -> "ProveedorCondensado":
+        # lee una matriz simetrica de un CSV por bloques de filas directo al triangulo superior:
+        # la memoria maxima es un bloque de filas mas el arreglo condensado, nunca n x n
+        # la parte inferior de cada fila se compara con los valores ya guardados (como np.allclose)
+        valores = None
+        n = 0
+        fila = 0
+        k = 0
+        for bloque in pd.read_csv(archivo, encoding='latin1', chunksize=tamBloque):
+            bloque = bloque.values.astype(np.float64)
+            if valores is None:
+                n = bloque.shape[1]
+                valores = np.empty(n * (n - 1) // 2, dtype=dtype)
+            for renglon in bloque:
+                if fila >= n:
+                    raise ValueError(f"la matriz de '{archivo}' tiene mas filas que columnas ({n})")
+                valores[k:k + n - fila - 1] = renglon[fila + 1:]
+                k += n - fila - 1
+                # (j, fila) con j < fila ya estan guardados en las filas anteriores
+                if fila > 0:
+                    j = np.arange(fila)
+                    guardados = valores[j * n - j * (j + 1) // 2 + (fila - j - 1)].astype(np.float64)
+                    if not np.all(np.abs(renglon[:fila] - guardados) <= atol + rtol * np.abs(guardados)):
+                        raise ValueError("la matriz de costo no es simetrica, use almacenamiento denso")
+                fila += 1
+        if fila != n:
+            raise ValueError(f"la matriz de '{archivo}' no es cuadrada ({fila} filas, {n} columnas)")
+        return cls(valores, n)
+
+    @classmethod
+    def desdeCoordenadas(
+        cls,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        dtype: type = np.float32,
+        tamBloque: int = 512
+    ) -> "ProveedorCondensado":
+        # calcula haversine por bloques de filas y guarda solo la parte superior de cada fila
+        n = len(lats)
+        trig = trigCoordenadas(lats, lons)
+        valores = np.empty(n * (n - 1) // 2, dtype=dtype)
+        k = 0
+        for inicio in range(0, n, tamBloque):
+            fin = min(inicio + tamBloque, n)
+            bloque = haversineTrig(trig, (slice(inicio, fin), None), (None, slice(inicio, n)))
+            for i in range(inicio, fin):
+                segmento = bloque[i - inicio, i - inicio + 1:]
+                valores[k:k + len(segmento)] = segmento
+                k += len(segmento)
+        return cls(valores, n)
+
+    def indice(self, a, b):
+        # posicion en el arreglo condensado del par (a, b) con a < b
+        return a * self.n - a * (a + 1) // 2 + (b - a - 1)
+
+    def valor(self, i: int, j: int) -> float:
+        if i == j:
+            return 0.0
+        if i > j:
+            i, j = j, i
+        return float(self.valores[self.indice(i, j)])
+
+    def fila(self, i: int) -> np.ndarray:
+        fila = np.zeros(self.n, dtype=self.valores.dtype)
+        # columnas antes de i: se leen de las filas anteriores (simetria)
+        anteriores = np.arange(i, dtype=np.int64)
+        fila[:i] = self.valores[self.indice(anteriores, i)]
+        # columnas despues de i: segmento contiguo de la fila i
+        inicio = self.indice(i, i + 1)
+        fila[i + 1:] = self.valores[inicio:inicio + self.n - i - 1]
+        return fila
+
+    def pares(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        a = np.minimum(i, j)
+        b = np.maximum(i, j)
+        diagonal = a == b
+        # en la diagonal se lee cualquier posicion valida y luego se pone en cero
+        k = np.where(diagonal, 0, self.indice(a, b))
+        resultado = self.valores[k]
+        resultado[diagonal] = 0
+        return resultado
+
+    @property
+    def nbytes(self) -> int:
+        return self.valores.nbytes
+
+
+class ProveedorHaversine(ProveedorDistancia):
+    # backend sin matriz: calcula haversine al vuelo con senos y cosenos precalculados
+    # y guarda las ultimas filas usadas en una cache LRU pequeña
+
+    def __init__(self, lats: np.ndarray, lons: np.ndarray, filasCache: int = 256, dtype: type = np.float32):
+        super().__init__(len(lats))
+        self.trig = trigCoordenadas(lats, lons)
+        self.filasCache = filasCache
+        self.dtype = dtype
+        self.cache: "OrderedDict[int, np.ndarray]" = OrderedDict()
+
+    def valor(self, i: int, j: int) -> float:
+        # si alguna de las dos filas esta en la cache se evita el calculo
+        if i in self.cache:
+            self.cache.move_to_end(i)
+            return float(self.cache[i][j])
+        if j in self.cache:
+            self.cache.move_to_end(j)
+            return float(self.cache[j][i])
+        return float(haversineTrig(self.trig, i, j))
+
+    def fila(self, i: int) -> np.ndarray:
+        if i in self.cache:
+            self.cache.move_to_end(i)
+            return self.cache[i]
+        fila = haversineTrig(self.trig, i, slice(None)).astype(self.dtype)
+        fila[i] = 0
+        self.cache[i] = fila
+        # se descarta la fila usada hace mas tiempo
+        if len(self.cache) > self.filasCache:
+            self.cache.popitem(last=False)
+        return fila
+
+    def pares(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        resultado = haversineTrig(self.trig, i, j).astype(self.dtype)
+        resultado[i == j] = 0
+        return resultado
+
+    @property
+    def nbytes(self) -> int:
+        return sum(t.nbytes for t in self.trig) + sum(f.nbytes for f in self.cache.values())
+
+
+class ProveedorArcos(ProveedorDistancia):
+    # costo por tramo = distancia * costo de combustible, sin formar la matriz producto
+    # el costo puede ser otra matriz, otro proveedor o un costo por km constante
+
+    def __init__(self, distancia: ProveedorDistancia, costo: Union[np.ndarray, ProveedorDistancia, float]):
+        super().__init__(len(distancia))
+        self.distancia = distancia
+        self.costo = costo
+
+    def valor(self, i: int, j: int) -> float:
+        if np.isscalar(self.costo):
+            return self.distancia[i, j] * self.costo
+        return float(self.distancia[i, j] * self.costo[i, j])
+
+    def fila(self, i: int) -> np.ndarray:
+        if np.isscalar(self.costo):
+            return self.distancia[i, :] * self.costo
+        return self.distancia[i, :] * self.costo[i, :]
+
+    def pares(self, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+        if np.isscalar(self.costo):
+            return self.distancia[i, j] * self.costo
+        return self.distancia[i, j] * self.costo[i, j]
+
+    @property
+    def nbytes(self) -> int:
+        return self.distancia.nbytes + getattr(self.costo, 'nbytes', 0)
+
+
+# tipo para las funciones que aceptan matriz densa o proveedor
+MatrizDistancia = Union[np.ndarray, ProveedorDistancia]
+
+
+# funcion para crear el proveedor de distancias segun el tipo de almacenamiento
+def crearProveedor(
+    almacenamiento: str,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    matriz: Optional[np.ndarray] = None,
+    dtype: type = np.float32,
+    filasCache: int = 256
+) -> ProveedorDistancia:
+    if almacenamiento == "densa":
+        if matriz is None:
+            raise ValueError("el almacenamiento denso necesita la matriz de distancias")
+        return ProveedorDenso(matriz)
+    if almacenamiento == "condensada":
+        if matriz is not None:
+            return ProveedorCondensado.desdeMatriz(matriz, dtype)
+        return ProveedorCondensado.desdeCoordenadas(lats, lons, dtype)
+    if almacenamiento == "haversine":
+        return ProveedorHaversine(lats, lons, filasCache, dtype)
+    raise ValueError(f"almacenamiento '{almacenamiento}' no valido, opciones: {ALMACENAMIENTOS}")
+
+# funcion para obtener la matriz de costo por tramo de cualquier backend
+def matrizArcosDe(matrizDistancia: MatrizDistancia, matrizCosto: Union[MatrizDistancia, float]) -> MatrizDistancia:
+    # con matrices densas se forma el producto contiguo una sola vez
+    # con proveedores el producto se calcula al vuelo para no ocupar n^2 de memoria
+    if isinstance(matrizDistancia, np.ndarray) and isinstance(matrizCosto, np.ndarray):
+        return np.ascontiguousarray(matrizDistancia * matrizCosto)
+    if isinstance(matrizDistancia, np.ndarray):
+        matrizDistancia = ProveedorDenso(matrizDistancia)
+    return ProveedorArcos(matrizDistancia, matrizCosto)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from funcionDeCosto import calcularCostoArcos, deltaSwap
+from solucionArreglo import SolucionArreglo
+from recocidoLotes import muestrearLote, deltasLote, cicloTemperaturaLotes
+from recocidoSimulado import EstadoCadena
+
+# --- Datos de prueba ---
+# 6 nodos: 0 y 1 son CDs, 2..5 tiendas; costo por tramo aleatorio y simetrico
+generadorPrueba = np.random.default_rng(0)
+matrizPrueba = generadorPrueba.random((6, 6)) * 10
+matrizPrueba = (matrizPrueba + matrizPrueba.T) / 2
+np.fill_diagonal(matrizPrueba, 0)
+
+# funcion para probar el modo por lotes con una ruta corta al final del giant tour
+def pruebaLoteRutaCorta(nombre, rutas):
+    print(f"Iniciando Prueba: Lote con {nombre}")
+    solucion = SolucionArreglo.desdeRutas(rutas)
+    gen = np.random.default_rng(1)
+    i, j, es2opt, valido = muestrearLote(solucion, 500, gen, probDosOpt=0.5)
+
+    # las posiciones de todos los movimientos deben caer dentro del arreglo
+    if (i - 1).min() >= -1 and (j + 1).max() < len(solucion.paradas):
+        print("PASO: Las posiciones del lote quedan dentro del arreglo")
+    else:
+        print(f"FALLO: Posiciones fuera del arreglo (j + 1 maximo = {(j + 1).max()}, paradas = {len(solucion.paradas)})")
+
+    try:
+        deltas = deltasLote(solucion.paradas, i, j, es2opt, matrizPrueba, valido)
+    except IndexError as error:
+        print(f"FALLO: deltasLote lanzo IndexError: {error}")
+        print("-" * 50)
+        return
+
+    # los no validos quedan en +inf y los swaps validos coinciden con deltaSwap
+    esperados = [deltaSwap(solucion.paradas, p1, p2, matrizPrueba)
+                 for p1, p2, v, d in zip(i.tolist(), j.tolist(), valido.tolist(), es2opt.tolist()) if v and not d]
+    obtenidos = deltas[valido & ~es2opt]
+    if np.isinf(deltas[~valido]).all() and np.allclose(obtenidos, esperados):
+        print("PASO: Los deltas validos coinciden con deltaSwap y los no validos son +inf")
+    else:
+        print("FALLO: Los deltas del lote no coinciden con deltaSwap")
+
+    # un ciclo completo conserva las rutas y un costo consistente
+    estado = EstadoCadena(solucion, matrizPrueba)
+    cicloTemperaturaLotes(estado, 5.0, 500, matrizPrueba, gen, probDosOpt=0.5)
+    tiendas = sorted(n for ruta in solucion.comoRutas() for n in ruta[1:-1])
+    if tiendas == [2, 3, 4, 5] and np.isclose(estado.costoActual, calcularCostoArcos(solucion, matrizPrueba)):
+        print("PASO: El ciclo por lotes conserva las tiendas y el costo")
+    else:
+        print(f"FALLO: El ciclo por lotes dejo las rutas {solucion.comoRutas()}")
+    print("-" * 50)
+
+if __name__ == '__main__':
+    print("== PRUEBAS DEL PROYECTO RUTAS ==")
+
+    pruebaLoteRutaCorta("ruta vacia al final", [[0, 2, 3, 4, 5, 0], [1, 1]])
+    pruebaLoteRutaCorta("ruta de una tienda al final", [[0, 2, 3, 4, 0], [1, 5, 1]])
+
+    print("\nPruebas finalizadas.")
@@ -0,0 +1,125 @@
+import os
+import json
+import hashlib
+import numpy as np
+from typing import Any, Dict, Optional
+
+from solucionArreglo import SolucionArreglo
+
+# version del formato del punto de control
+VERSION_PUNTO_CONTROL = 3
+
+# pares de nodos con los que se identifica una instancia que no es un arreglo denso
+PARES_HUELLA = 1024
+
+
+# funcion para pasar el estado de random (modulo o random.Random) a arreglo + metadatos
+def estadoRandom(rng) -> Dict[str, Any]:
+    version, interno, gauss = rng.getstate()
+    return {"version": version, "interno": np.asarray(interno, dtype=np.uint64), "gauss": gauss}
+
+# funcion para identificar la instancia (matriz de costo por tramo) de una cadena
+def huellaInstancia(matrizArcos) -> str:
+    # con un arreglo denso se usa el hash de la matriz completa; con un proveedor
+    # (condensado, haversine) el de una muestra fija de pares para no formar n x n
+    h = hashlib.blake2b(digest_size=16)
+    n = len(matrizArcos)
+    h.update(str(n).encode())
+    if isinstance(matrizArcos, np.ndarray):
+        h.update(np.ascontiguousarray(matrizArcos, dtype=np.float64).tobytes())
+    else:
+        gen = np.random.default_rng(0)
+        i = gen.integers(0, n, PARES_HUELLA)
+        j = gen.integers(0, n, PARES_HUELLA)
+        h.update(np.asarray(matrizArcos[i, j], dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+# funcion para describir los parametros de una cadena que deben coincidir al reanudar
+def configuracionCadena(matrizArcos, T0: float, TF: float, alpha: float, L: int, lotes: bool, vecindario, enfriamiento) -> Dict[str, Any]:
+    # las reglas de parada no se incluyen: se puede reanudar con mas tiempo o mas ciclos
+    pesos = np.diff(np.concatenate(([0.0], vecindario.acumulados))).tolist()
+    candidatos = vecindario.operadores[0].candidatos
+    return {
+        "instancia": huellaInstancia(matrizArcos),
+        "T0": T0,
+        "TF": TF,
+        "alpha": alpha,
+        "L": L,
+        "lotes": lotes,
+        "vecindario": [[o.nombre, p] for o, p in zip(vecindario.operadores, pesos)],
+        "candidatos": None if candidatos is None else list(np.shape(candidatos)),
+        "probCandidatos": vecindario.operadores[0].probCandidatos,
+        "enfriamiento": {"tipo": type(enfriamiento).__name__, "parametros": enfriamiento.parametros()},
+    }
+
+# funcion para verificar que un punto de control sea de la misma instancia y parametros
+def validarPuntoControl(punto: Dict[str, Any], configuracion: Dict[str, Any], ruta: str) -> None:
+    # reanudar con otros datos o parametros continuaria un estado que no les corresponde
+    guardada = punto["configuracion"]
+    diferentes = [clave for clave in configuracion if guardada.get(clave) != configuracion[clave]]
+    if diferentes:
+        detalle = ", ".join(f"{c}: {guardada.get(c)!r} -> {configuracion[c]!r}" for c in diferentes if c != "instancia")
+        if "instancia" in diferentes:
+            detalle = "instancia (otros datos)" + (", " + detalle if detalle else "")
+        raise ValueError(f"El punto de control '{ruta}' es de otra corrida, difiere en {detalle}")
+
+# funcion para guardar el estado completo de una cadena de recocido
+def guardarPuntoControl(
+    ruta: str,
+    estado,
+    T: float,
+    ciclo: int,
+    rng,
+    gen: Optional[np.random.Generator],
+    enfriamiento,
+    parada,
+    configuracion: Dict[str, Any]
+) -> None:
+    # un solo .npz: los arreglos de las soluciones y del generador van como arreglos,
+    # lo demas (temperatura, contadores, estado del enfriamiento) como JSON
+    # se escribe a un temporal y se renombra para no dejar un punto de control a medias
+    aleatorio = estadoRandom(rng)
+    meta = {
+        "version": VERSION_PUNTO_CONTROL,
+        "configuracion": configuracion,
+        "T": T,
+        "ciclo": ciclo,
+        "costoActual": estado.costoActual,
+        "mejorCosto": estado.mejorCosto,
+        "randomVersion": aleatorio["version"],
+        "randomGauss": aleatorio["gauss"],
+        "numpy": gen.bit_generator.state if gen is not None else None,
+        "enfriamiento": enfriamiento.estado(),
+        "parada": {"ciclos": parada.ciclos, "ciclosSinMejora": parada.ciclosSinMejora, "segundos": parada.segundos},
+    }
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    os.makedirs(directorio, exist_ok=True)
+    temporal = ruta + ".tmp"
+    with open(temporal, 'wb') as f:
+        np.savez(
+            f,
+            paradas=estado.solucionActual.paradas,
+            inicios=estado.solucionActual.inicios,
+            posiciones=estado.solucionActual.posiciones,
+            mejorParadas=estado.mejorSolucion.paradas,
+            mejorInicios=estado.mejorSolucion.inicios,
+            mejorPosiciones=estado.mejorSolucion.posiciones,
+            random=aleatorio["interno"],
+            meta=np.array(json.dumps(meta))
+        )
+    os.replace(temporal, ruta)
+
+# funcion para leer un punto de control
+def cargarPuntoControl(ruta: str) -> Optional[Dict[str, Any]]:
+    # devuelve None si no existe; las soluciones se regresan ya como SolucionArreglo
+    if not os.path.exists(ruta):
+        return None
+    with np.load(ruta) as datos:
+        meta = json.loads(str(datos["meta"]))
+        if meta["version"] != VERSION_PUNTO_CONTROL:
+            raise ValueError(f"Punto de control con version {meta['version']}, se esperaba {VERSION_PUNTO_CONTROL}")
+        meta["solucionActual"] = SolucionArreglo(datos["paradas"], datos["inicios"], datos["posiciones"])
+        meta["mejorSolucion"] = SolucionArreglo(datos["mejorParadas"], datos["mejorInicios"], datos["mejorPosiciones"])
+        interno = tuple(int(x) for x in datos["random"])
+    meta["random"] = (meta.pop("randomVersion"), interno, meta.pop("randomGauss"))
+    return meta
@@ -0,0 +1,184 @@
+import time
+import numpy as np
+from typing import Optional, Tuple
+
+from funcionDeCosto import calcularCostoArcos, deltaSwap
+from solucionArreglo import SolucionArreglo
+from proveedorDistancia import MatrizDistancia
+from vecindario import Vecindario
+from telemetria import HistorialCosto, EstadisticasMovimientos
+
+# evaluacion por lotes: los L movimientos de una temperatura se muestrean juntos como
+# arreglos de posiciones y sus deltas se calculan en una sola pasada vectorizada
+# solo admite movimientos dentro de una ruta (swap y 2opt): no cambian los inicios de las
+# rutas, asi que las posiciones muestreadas al inicio del ciclo siguen siendo validas
+OPERADORES_LOTE = ("swap", "2opt")
+
+# mezcla por defecto para el modo por lotes
+MEZCLA_LOTES = {"2opt": 0.7, "swap": 0.3}
+
+
+# funcion para obtener la probabilidad de 2opt a partir de la mezcla del vecindario
+def probabilidadDosOpt(vecindario: Vecindario) -> float:
+    pesos = {}
+    anterior = 0.0
+    for operador, acumulado in zip(vecindario.operadores, vecindario.acumulados):
+        pesos[operador.nombre] = acumulado - anterior
+        anterior = acumulado
+    otros = set(pesos) - set(OPERADORES_LOTE)
+    if otros:
+        raise ValueError(f"el modo por lotes solo admite {OPERADORES_LOTE}, la mezcla incluye {sorted(otros)}")
+    return pesos.get("2opt", 0.0)
+
+# funcion para muestrear L movimientos dentro de rutas como arreglos de posiciones
+def muestrearLote(
+    solucion: SolucionArreglo,
+    L: int,
+    gen: np.random.Generator,
+    probDosOpt: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # devuelve (i, j, es2opt, valido) con i < j posiciones absolutas de tiendas
+    # como en proponerSwap, la ruta se elige al azar y las de menos de 2 tiendas no proponen nada
+    rutas = gen.integers(0, solucion.numRutas, size=L)
+    inicios = solucion.inicios[rutas]
+    tiendas = solucion.inicios[rutas + 1] - inicios - 2
+    valido = tiendas >= 2
+    n = np.maximum(tiendas, 2)
+
+    # dos posiciones distintas en [1, n]: la segunda se salta a la primera
+    a = gen.integers(0, n) + 1
+    b = gen.integers(0, n - 1) + 1
+    b += b >= a
+    # los movimientos no validos quedan en el CD de su ruta (i = j = inicio): asi los
+    # tramos vecinos que lee deltasLote caen dentro del arreglo aunque la ruta este vacia
+    i = np.where(valido, inicios + np.minimum(a, b), inicios)
+    j = np.where(valido, inicios + np.maximum(a, b), inicios)
+    es2opt = gen.random(L) < probDosOpt if probDosOpt > 0 else np.zeros(L, dtype=bool)
+    return i, j, es2opt, valido
+
+# funcion para calcular los deltas de un lote de movimientos sobre la solucion actual
+def deltasLote(
+    paradas: np.ndarray,
+    i: np.ndarray,
+    j: np.ndarray,
+    es2opt: np.ndarray,
+    matrizArcos: MatrizDistancia,
+    valido: Optional[np.ndarray] = None
+) -> np.ndarray:
+    # mismos tramos que deltaSwap y OperadorDosOpt.delta, con indices en arreglos
+    # con valido solo se evaluan esos movimientos; los demas quedan con delta +inf
+    if valido is not None:
+        deltas = np.full(len(i), np.inf)
+        deltas[valido] = deltasLote(paradas, i[valido], j[valido], es2opt[valido], matrizArcos)
+        return deltas
+    A = matrizArcos
+    antes, a, b, despues = paradas[i - 1], paradas[i], paradas[j], paradas[j + 1]
+    quitados = A[antes, a] + A[b, despues]
+
+    # 2opt: solo cambian los tramos de los extremos del segmento invertido
+    dosOpt = A[antes, b] + A[a, despues] - quitados
+
+    # swap: en posiciones adyacentes las dos tiendas comparten el tramo a -> b
+    siguienteA, anteriorB = paradas[i + 1], paradas[j - 1]
+    adyacente = j == i + 1
+    swap = np.where(
+        adyacente,
+        A[antes, b] + A[b, a] + A[a, despues] - quitados - A[a, b],
+        A[antes, b] + A[b, siguienteA] + A[anteriorB, a] + A[a, despues]
+        - quitados - A[a, siguienteA] - A[anteriorB, b]
+    )
+    return np.where(es2opt, dosOpt, swap)
+
+# funcion para realizar L iteraciones a una temperatura fija evaluando por lotes
+def cicloTemperaturaLotes(
+    estado,
+    T: float,
+    L: int,
+    matrizArcos: MatrizDistancia,
+    gen: np.random.Generator,
+    historialCosto: Optional[HistorialCosto] = None,
+    probDosOpt: float = 0.0,
+    estadisticas: Optional[EstadisticasMovimientos] = None,
+    ciclo: int = 0
+) -> int:
+    # misma cadena de Metropolis que cicloTemperatura: el movimiento k se acepta si
+    # u_k < exp(-delta_k / T), es decir si delta_k < -T * ln(u_k), con los u_k generados
+    # de una vez; los deltas del lote se calculan antes de aplicar nada y solo se
+    # recalculan (uno por uno) los de movimientos que leen una parada ya modificada
+    # con estadisticas se mide el muestreo del lote (generacion), los deltas en bloque
+    # (evaluacion) y el recorrido secuencial (aplicacion, incluye los deltas recalculados)
+    if estadisticas is not None:
+        inicio = time.perf_counter()
+    solucion = estado.solucionActual
+    paradas = solucion.paradas
+    A = matrizArcos
+    i, j, es2opt, valido = muestrearLote(solucion, L, gen, probDosOpt)
+    with np.errstate(divide='ignore'):
+        umbrales = -T * np.log(gen.random(L))
+    if estadisticas is not None:
+        generado = time.perf_counter()
+    deltas = deltasLote(paradas, i, j, es2opt, A, valido)
+    if estadisticas is not None:
+        evaluado = time.perf_counter()
+
+    # el recorrido secuencial trabaja con listas de python (acceso escalar mas rapido)
+    il, jl, dosOptl, validol = i.tolist(), j.tolist(), es2opt.tolist(), valido.tolist()
+    deltasl, umbralesl = deltas.tolist(), umbrales.tolist()
+
+    # posiciones cuyas paradas cambiaron desde que se evaluo el lote
+    modificadas = set()
+    aceptados = 0
+    # aceptados y de mejora por tipo de movimiento (indice 0 = swap, 1 = 2opt)
+    aceptadosTipo = [0, 0]
+    mejorasTipo = [0, 0]
+    for k in range(L):
+        # los movimientos sin tiendas suficientes no cambian nada (delta 0)
+        if validol[k]:
+            p1, p2 = il[k], jl[k]
+            delta = deltasl[k]
+            if modificadas and not modificadas.isdisjoint((p1 - 1, p1, p1 + 1, p2 - 1, p2, p2 + 1)):
+                if dosOptl[k]:
+                    delta = float(A[paradas[p1 - 1], paradas[p2]] + A[paradas[p1], paradas[p2 + 1]]
+                                  - A[paradas[p1 - 1], paradas[p1]] - A[paradas[p2], paradas[p2 + 1]])
+                else:
+                    delta = deltaSwap(paradas, p1, p2, A)
+
+            if delta < umbralesl[k]:
+                # aplicar el movimiento aceptado en sitio
+                if dosOptl[k]:
+                    paradas[p1:p2 + 1] = paradas[p1:p2 + 1][::-1]
+                    solucion.actualizarPosiciones(p1, p2 + 1)
+                    modificadas.update(range(p1, p2 + 1))
+                else:
+                    solucion.aplicarSwap(p1, p2)
+                    modificadas.add(p1)
+                    modificadas.add(p2)
+                estado.costoActual += delta
+                aceptados += 1
+                aceptadosTipo[dosOptl[k]] += 1
+                if delta < 0:
+                    mejorasTipo[dosOptl[k]] += 1
+
+                # actualiza la mejor solucion global
+                if estado.costoActual < estado.mejorCosto:
+                    estado.mejorSolucion.copiarDesde(solucion)
+                    estado.mejorCosto = estado.costoActual
+
+        if historialCosto is not None:
+            historialCosto.append(estado.costoActual)
+
+    # recalcular el costo exacto para evitar acumular error de redondeo en los deltas
+    estado.costoActual = calcularCostoArcos(solucion, A)
+
+    if estadisticas is not None:
+        fin = time.perf_counter()
+        estadisticas.tiempoGeneracion += generado - inicio
+        estadisticas.tiempoEvaluacion += evaluado - generado
+        estadisticas.tiempoAplicacion += fin - evaluado
+        estadisticas.registrarCiclo(ciclo, T, L, int(valido.sum()), aceptados, sum(mejorasTipo), fin - inicio)
+        for tipo, nombre in enumerate(OPERADORES_LOTE):
+            esTipo = es2opt == bool(tipo)
+            estadisticas.registrarOperador(
+                nombre, int(esTipo.sum()), int((valido & esTipo).sum()), aceptadosTipo[tipo], mejorasTipo[tipo]
+            )
+    return aceptados
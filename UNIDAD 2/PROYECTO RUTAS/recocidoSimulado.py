@@ -1,74 +1,253 @@
 import math
+import time
 import random
-from typing import List, Tuple
+from typing import Tuple, Optional
 import numpy as np
+import pandas as pd
 
-from funcionDeCosto import calcularCosto, Solucion
-from solucion import solucionInicial, generarVecinos
+from funcionDeCosto import calcularCostoArcos, Solucion
+from solucion import solucionInicial
+from solucionArreglo import SolucionArreglo
+from proveedorDistancia import MatrizDistancia, matrizArcosDe
+from vecindario import Vecindario
+from recocidoLotes import cicloTemperaturaLotes, probabilidadDosOpt
+from telemetria import HistorialCosto, HistorialCompleto, Progreso, EstadisticasMovimientos
+from enfriamiento import Enfriamiento, EnfriamientoGeometrico, CriterioParada
+from puntoControl import guardarPuntoControl, cargarPuntoControl, configuracionCadena, validarPuntoControl
+
+# vecindario original: solo swap de dos tiendas dentro de una ruta
+VECINDARIO_SWAP = Vecindario({"swap": 1.0})
+
+class EstadoCadena:
+    # estado de una cadena de recocido: solucion actual, mejor solucion y sus costos
+    # se comparte entre el recocido serial, el templado paralelo y los trabajadores
+
+    def __init__(self, solucion: SolucionArreglo, matrizArcos: MatrizDistancia):
+        self.solucionActual = solucion
+        self.costoActual = calcularCostoArcos(solucion, matrizArcos)
+        # los arreglos de la mejor solucion se reservan una sola vez y luego se sobreescriben
+        self.mejorSolucion = solucion.copia()
+        self.mejorCosto = self.costoActual
+
+# criterio de aceptacion de Metropolis
+def criterioMetropolis(delta: float, T: float, rng=random) -> bool:
+    # un movimiento que mejora siempre se acepta
+    if delta < 0:
+        return True
+    # se acepta con probabilidad de aceptacion si es peor
+    probabilidad_aceptacion = math.exp(-delta / T)
+    return rng.random() < probabilidad_aceptacion
+
+# funcion para realizar L iteraciones a una temperatura fija
+def cicloTemperatura(
+    estado: EstadoCadena,
+    T: float,
+    L: int,
+    matrizArcos: MatrizDistancia,
+    rng=random,
+    historialCosto: Optional[HistorialCosto] = None,
+    vecindario: Vecindario = VECINDARIO_SWAP,
+    estadisticas: Optional[EstadisticasMovimientos] = None,
+    ciclo: int = 0
+) -> int:
+    # devuelve el numero de movimientos aceptados en el ciclo
+    # (las propuestas sin movimiento valido no cuentan, no cambian la solucion)
+    # con estadisticas se mide tambien el tiempo de la propuesta, la evaluacion y la
+    # aplicacion de cada movimiento y se cuentan por operador; el recorrido y los numeros
+    # aleatorios son los mismos, y sin estadisticas el ciclo no llama al reloj
+    solucionActual = estado.solucionActual
+    aceptados = 0
+    perfilar = estadisticas is not None
+    if perfilar:
+        reloj = time.perf_counter
+        conteos = {}    # operador -> [propuestos, validos, aceptados, mejoras]
+        generacion = evaluacion = aplicacion = 0.0
+        mejoras = validos = 0
+        inicioCiclo = reloj()
+
+    for _ in range(L):  # realiza L iteraciones a esta temperatura
+        if perfilar:
+            t0 = reloj()
+
+        # el vecindario elige un operador y propone un movimiento sin copiar la solucion
+        operador, movimiento = vecindario.proponer(solucionActual, rng)
+        if perfilar:
+            t1 = reloj()
+
+        # diferencia de costo entre la nueva solucion y la actual
+        # solo se evaluan los tramos que cambian con el movimiento
+        if movimiento is None:
+            delta = 0.0
+        else:
+            delta = operador.delta(solucionActual, movimiento, matrizArcos)
+        acepta = criterioMetropolis(delta, T, rng)
+
+        if perfilar:
+            t2 = reloj()
+            conteo = conteos.get(operador)
+            if conteo is None:
+                conteo = conteos[operador] = [0, 0, 0, 0]
+            conteo[0] += 1
+            if movimiento is not None:
+                conteo[1] += 1
+                validos += 1
+
+        # el movimiento solo se aplica (en sitio) si fue aceptado
+        if acepta:
+            if movimiento is not None:
+                operador.aplicar(solucionActual, movimiento)
+                aceptados += 1
+                if perfilar:
+                    conteo[2] += 1
+                    if delta < 0:
+                        conteo[3] += 1
+                        mejoras += 1
+            estado.costoActual += delta
+
+        # actualiza la mejor solucion global
+        if estado.costoActual < estado.mejorCosto:
+            estado.mejorSolucion.copiarDesde(solucionActual)
+            estado.mejorCosto = estado.costoActual
+
+        if historialCosto is not None:
+            historialCosto.append(estado.costoActual)
+
+        if perfilar:
+            t3 = reloj()
+            generacion += t1 - t0
+            evaluacion += t2 - t1
+            aplicacion += t3 - t2
+
+    # recalcular el costo exacto para evitar acumular error de redondeo en los deltas
+    estado.costoActual = calcularCostoArcos(solucionActual, matrizArcos)
+
+    if perfilar:
+        estadisticas.tiempoGeneracion += generacion
+        estadisticas.tiempoEvaluacion += evaluacion
+        estadisticas.tiempoAplicacion += aplicacion
+        for operador, (p, v, a, m) in conteos.items():
+            estadisticas.registrarOperador(operador.nombre, p, v, a, m)
+        estadisticas.registrarCiclo(ciclo, T, L, validos, aceptados, mejoras, reloj() - inicioCiclo)
+    return aceptados
 
 def recocidoSimulado(
-    matrizDistancia: np.ndarray,
-    matrizCosto: np.ndarray,
+    matrizDistancia: MatrizDistancia,
+    matrizCosto: MatrizDistancia,
     T0: float = 100.0,              # Temperatura inicial
     TF: float = 0.1,                # Temperatura final 
     alpha: float = 0.95,            # Factor de enfriamiento
-    L: int = 200                    # Iteraciones por temperatura
-) -> Tuple[Solucion, float, List[float]]:
-    
-    # inicializacion de la solucion y calculo de su costo
-    solucionActual = solucionInicial(matrizDistancia)
-    costoActual = calcularCosto(solucionActual, matrizDistancia, matrizCosto)
-    
-    # guardar la mejor solucion encontrada y su costo
-    mejorSolucion = [list(ruta) for ruta in solucionActual]
-    mejorCosto = costoActual 
-    
-    T = T0  # temperatura actual
-    historialCosto = [costoActual]
-    ciclo_temp = 0 # contador para los ciclos de enfriamiento
-    
-    # impresion inicial
-    print(f"Temperatura inicial: {T0}, Factor de enfriamiento: {alpha}")
-    print(f"Costo de la solución inicial: ${costoActual:,.2f} MXN")
-    
-    print("\n| Ciclo | Temperatura | Costo Actual | Mejor Costo |")
-    print("|-------|-------------|--------------|-------------|")
-    print(f"| {ciclo_temp:^5} | {T:11.4f} | ${costoActual:^8.2f} | ${mejorCosto:^7.2f} |")
-    
-    # bucle principal del recocido como criterio de parada la temperatura final 
-    while T > TF:
+    L: int = 200,                   # Iteraciones por temperatura
+    matrizArcos: Optional[MatrizDistancia] = None, # Costo por tramo precalculado (distancia * costo)
+    semilla: Optional[int] = None,  # Semilla del generador aleatorio propio de esta cadena
+    verbose: bool = True,           # Imprime la tabla de progreso
+    historial: Optional[HistorialCosto] = None, # Destino del costo por iteracion (None = todo en memoria)
+    intervaloProgreso: float = 1.0, # Segundos minimos entre filas de la tabla de progreso
+    vecindario: Optional[Vecindario] = None,  # Operadores y su mezcla (None = solo swap)
+    solucionInicio: Optional[Solucion] = None, # Solucion de partida (None = cada tienda a su CD mas cercano)
+    coordenadas: Optional[pd.DataFrame] = None, # Nodos con su columna Tipo (necesarias si no hay solucionInicio)
+    lotes: bool = False,            # Evalua los L movimientos de cada temperatura en lote (solo swap y 2opt)
+    enfriamiento: Optional[Enfriamiento] = None,  # Esquema de enfriamiento (None = geometrico con alpha)
+    parada: Optional[CriterioParada] = None,      # Reglas de parada extra; guarda el motivo de parada
+    puntoControl: Optional[str] = None,     # Archivo .npz donde se guarda el estado de la cadena
+    cadaPuntoControl: int = 10,             # Ciclos de temperatura entre puntos de control
+    reanudar: bool = False,                 # Continua desde puntoControl si el archivo existe
+    estadisticas: Optional[EstadisticasMovimientos] = None  # Perfil de movimientos y tiempos (None = sin medir)
+) -> Tuple[Solucion, float, HistorialCosto]:
+
+    if vecindario is None:
+        vecindario = VECINDARIO_SWAP
+
+    # generador aleatorio de la cadena, sin semilla se usa el modulo random global
+    rng = random.Random(semilla) if semilla is not None else random
+    # el modo por lotes genera sus numeros aleatorios en bloque con numpy
+    gen = np.random.default_rng(semilla) if lotes else None
+    if lotes:
+        probDosOpt = probabilidadDosOpt(vecindario)
+
+    # la matriz de costo por tramo se calcula una sola vez si no viene de la cache
+    if matrizArcos is None:
+        matrizArcos = matrizArcosDe(matrizDistancia, matrizCosto)
+
+    if enfriamiento is None:
+        enfriamiento = EnfriamientoGeometrico(alpha)
+    if parada is None:
+        parada = CriterioParada()
+    enfriamiento.iniciar()
+    parada.iniciar()
+    historialCosto = historial if historial is not None else HistorialCompleto()
+
+    # el punto de control guarda la instancia y los parametros para no reanudar otra corrida
+    configuracion = configuracionCadena(matrizArcos, T0, TF, alpha, L, lotes, vecindario, enfriamiento) if puntoControl else None
+    punto = cargarPuntoControl(puntoControl) if reanudar and puntoControl else None
+    if punto is not None:
+        validarPuntoControl(punto, configuracion, puntoControl)
+    if punto is None:
+        # inicializacion de la solucion y calculo de su costo
+        # la solucion se maneja como arreglo (giant tour) para aplicar movimientos en sitio
+        if solucionInicio is None:
+            solucionInicio = solucionInicial(matrizDistancia, coordenadas)
+        estado = EstadoCadena(SolucionArreglo.desdeRutas(solucionInicio), matrizArcos)
+        T = T0  # temperatura actual
+        ciclo_temp = 0 # contador para los ciclos de enfriamiento
+        historialCosto.append(estado.costoActual)
+    else:
+        # se restauran soluciones, costos, temperatura, contadores y generadores aleatorios
+        # tal como quedaron al guardar, la cadena sigue exactamente igual que sin interrupcion
+        estado = EstadoCadena(punto["solucionActual"], matrizArcos)
+        estado.costoActual = punto["costoActual"]
+        estado.mejorSolucion = punto["mejorSolucion"]
+        estado.mejorCosto = punto["mejorCosto"]
+        T = punto["T"]
+        ciclo_temp = punto["ciclo"]
+        rng.setstate(punto["random"])
+        if gen is not None:
+            gen.bit_generator.state = punto["numpy"]
+        enfriamiento.restaurar(punto["enfriamiento"])
+        parada.ciclos = punto["parada"]["ciclos"]
+        parada.ciclosSinMejora = punto["parada"]["ciclosSinMejora"]
+        parada.inicio -= punto["parada"]["segundos"]
+
+    # impresion inicial, despues una fila como maximo cada intervaloProgreso segundos
+    progreso = Progreso(intervaloProgreso, activo=verbose)
+    if punto is None:
+        progreso.encabezado(T0, alpha, estado.costoActual)
+    elif verbose:
+        print(f"Reanudando desde '{puntoControl}': ciclo {ciclo_temp}, T = {T:.4f}, mejor costo ${estado.mejorCosto:,.2f} MXN")
+    progreso.reportar(ciclo_temp, T, estado.costoActual, estado.mejorCosto)
+
+    # bucle principal del recocido: termina al llegar a la temperatura final o con la
+    # primera regla de parada que se cumpla (estancamiento, tiempo, costo objetivo)
+    while not parada.evaluar(T, TF, estado.mejorCosto):
         ciclo_temp += 1
-        
-        for _ in range(L):  # realiza L iteraciones a esta temperatura
-            
-            #generamos vecino y evaluamos su costo
-            nuevaSolucion = generarVecinos(solucionActual, matrizDistancia)
-            nuevoCosto = calcularCosto(nuevaSolucion, matrizDistancia, matrizCosto)
-            
-            # diferencia de costo entre la nueva solucion y la actual
-            delta = nuevoCosto - costoActual
-            
-            # criterio de aceptacion
-            if delta < 0:
-                solucionActual = nuevaSolucion
-                costoActual = nuevoCosto
-            else:
-                # se acepta con probabilidad de aceptacion si es peor
-                probabilidad_aceptacion = math.exp(-delta / T)
-                if random.random() < probabilidad_aceptacion:
-                    solucionActual = nuevaSolucion
-                    costoActual = nuevoCosto
-            
-            # actualiza la mejor solucion global
-            if costoActual < mejorCosto:
-                mejorSolucion = [list(ruta) for ruta in solucionActual]
-                mejorCosto = costoActual
-            
-            historialCosto.append(costoActual)
-        
-        # enfriamiento geometrico
-        T *= alpha
-    
-        print(f"| {ciclo_temp:^5} | {T:11.4f} | ${costoActual:^8.2f} | ${mejorCosto:^7.2f} |")
-    # retornamos la mejor solucion encontrada y su costo
-    return mejorSolucion, mejorCosto, historialCosto
\ No newline at end of file
+        mejorAntes = estado.mejorCosto
+
+        # L iteraciones a esta temperatura
+        if lotes:
+            aceptados = cicloTemperaturaLotes(estado, T, L, matrizArcos, gen, historialCosto, probDosOpt, estadisticas, ciclo_temp)
+        else:
+            aceptados = cicloTemperatura(estado, T, L, matrizArcos, rng, historialCosto, vecindario, estadisticas, ciclo_temp)
+
+        # siguiente temperatura segun el esquema de enfriamiento
+        mejoro = estado.mejorCosto < mejorAntes
+        parada.registrarCiclo(mejoro)
+        T = enfriamiento.siguiente(T, aceptados / L, mejoro)
+
+        progreso.reportar(ciclo_temp, T, estado.costoActual, estado.mejorCosto)
+
+        # punto de control periodico (al final del ciclo, con la temperatura del siguiente)
+        if puntoControl and ciclo_temp % cadaPuntoControl == 0:
+            guardarPuntoControl(puntoControl, estado, T, ciclo_temp, rng, gen, enfriamiento, parada, configuracion)
+
+    # el ultimo estado tambien se guarda (por ejemplo si paro por tiempo y se quiere continuar)
+    if puntoControl:
+        guardarPuntoControl(puntoControl, estado, T, ciclo_temp, rng, gen, enfriamiento, parada, configuracion)
+
+    progreso.reportar(ciclo_temp, T, estado.costoActual, estado.mejorCosto, forzar=True)
+    if verbose:
+        print(f"Fin del recocido por {parada.motivo} ({parada.ciclos} ciclos, {parada.segundos:.2f} s)")
+
+    # se escriben los valores pendientes del historial (y se cierra su archivo si lo tiene)
+    historialCosto.cerrar()
+
+    # retornamos la mejor solucion encontrada (como lista de rutas) y su costo
+    return estado.mejorSolucion.comoRutas(), estado.mejorCosto, historialCosto
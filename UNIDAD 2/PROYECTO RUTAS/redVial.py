@@ -0,0 +1,288 @@
+import os
+import time
+import heapq
+import numpy as np
+import pandas as pd
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Tuple, Optional
+
+from distancia import trigCoordenadas, haversineTrig
+from multiInicio import Descriptor, compartirArreglo, abrirArreglo
+
+# valores de la etiqueta oneway de OSM que hacen una calle de un solo sentido
+SENTIDO_UNICO = {"yes", "true", "1"}
+
+# como se hace simetrica la matriz con calles de un solo sentido: los deltas de 2opt
+# invierten tramos y suponen A[i, j] == A[j, i]; con "media" el costo de cada ruta es el
+# promedio de recorrerla en un sentido y en el otro, con "minima" se toma el sentido mas corto
+SIMETRIAS = ("media", "minima")
+
+# decimales con los que se identifican los vertices de una lista de aristas por coordenadas
+DECIMALES_VERTICE = 7
+
+
+class GrafoVial:
+    # red vial dirigida en formato CSR: las aristas que salen del vertice v son
+    # destinos[inicios[v]:inicios[v + 1]] con sus pesos (km) en la misma posicion
+
+    def __init__(self, lats: np.ndarray, lons: np.ndarray, origenes: np.ndarray, destinos: np.ndarray, pesos: np.ndarray):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lons = np.asarray(lons, dtype=np.float64)
+        # las aristas se ordenan por su origen para formar los renglones del CSR
+        orden = np.argsort(origenes, kind='stable')
+        self.destinos = np.asarray(destinos, dtype=np.int64)[orden]
+        self.pesos = np.asarray(pesos, dtype=np.float64)[orden]
+        conteo = np.bincount(np.asarray(origenes, dtype=np.int64), minlength=len(self.lats))
+        self.inicios = np.concatenate(([0], np.cumsum(conteo))).astype(np.int64)
+
+    @property
+    def numVertices(self) -> int:
+        return len(self.lats)
+
+    @property
+    def numAristas(self) -> int:
+        return len(self.destinos)
+
+
+# funcion para calcular la longitud en km de un conjunto de aristas
+def longitudAristas(lats: np.ndarray, lons: np.ndarray, origenes: np.ndarray, destinos: np.ndarray) -> np.ndarray:
+    trig = trigCoordenadas(lats, lons)
+    return haversineTrig(trig, origenes, destinos)
+
+# funcion para leer una lista de aristas en CSV
+def leerListaAristas(archivo: str) -> GrafoVial:
+    # columnas: lat_origen, lon_origen, lat_destino, lon_destino y opcionales
+    # distancia_km (si falta se usa haversine del tramo) y sentido_unico (0/1, por defecto 0)
+    # los vertices se identifican por sus coordenadas
+    aristas = pd.read_csv(archivo)
+    faltantes = {"lat_origen", "lon_origen", "lat_destino", "lon_destino"} - set(aristas.columns)
+    if faltantes:
+        raise ValueError(f"la lista de aristas no tiene las columnas {sorted(faltantes)}")
+
+    extremos = np.concatenate((
+        aristas[["lat_origen", "lon_origen"]].values,
+        aristas[["lat_destino", "lon_destino"]].values,
+    )).round(DECIMALES_VERTICE)
+    vertices, indices = np.unique(extremos, axis=0, return_inverse=True)
+    indices = indices.ravel()
+    origenes, destinos = indices[:len(aristas)], indices[len(aristas):]
+    lats, lons = vertices[:, 0], vertices[:, 1]
+
+    if "distancia_km" in aristas.columns:
+        pesos = aristas["distancia_km"].values.astype(np.float64)
+    else:
+        pesos = longitudAristas(lats, lons, origenes, destinos)
+    dobleSentido = ~aristas["sentido_unico"].astype(bool).values if "sentido_unico" in aristas.columns else np.ones(len(aristas), dtype=bool)
+
+    return GrafoVial(
+        lats, lons,
+        np.concatenate((origenes, destinos[dobleSentido])),
+        np.concatenate((destinos, origenes[dobleSentido])),
+        np.concatenate((pesos, pesos[dobleSentido]))
+    )
+
+# funcion para leer un extracto de OpenStreetMap (.osm en XML)
+def leerOSM(archivo: str) -> GrafoVial:
+    # solo se usan las vias con etiqueta highway; cada par de nodos consecutivos de una
+    # via es una arista con su longitud haversine, en un sentido si la via es oneway
+    coordenadas = {}
+    vias: List[Tuple[List[int], str]] = []
+    for _, elemento in ET.iterparse(archivo, events=("end",)):
+        if elemento.tag == "node":
+            coordenadas[int(elemento.get("id"))] = (float(elemento.get("lat")), float(elemento.get("lon")))
+        elif elemento.tag == "way":
+            etiquetas = {t.get("k"): t.get("v") for t in elemento.iter("tag")}
+            if "highway" in etiquetas:
+                nodos = [int(nd.get("ref")) for nd in elemento.iter("nd")]
+                vias.append((nodos, etiquetas.get("oneway", "no")))
+            elemento.clear()
+        elif elemento.tag == "relation":
+            elemento.clear()
+
+    # solo los nodos que aparecen en alguna via son vertices del grafo
+    usados = sorted({n for nodos, _ in vias for n in nodos if n in coordenadas})
+    indice = {n: k for k, n in enumerate(usados)}
+    lats = np.array([coordenadas[n][0] for n in usados])
+    lons = np.array([coordenadas[n][1] for n in usados])
+
+    origenes, destinos, dobleSentido = [], [], []
+    for nodos, oneway in vias:
+        nodos = [indice[n] for n in nodos if n in indice]
+        # oneway = -1 indica que el sentido es contrario al orden de los nodos
+        if oneway == "-1":
+            nodos = nodos[::-1]
+        origenes.extend(nodos[:-1])
+        destinos.extend(nodos[1:])
+        dobleSentido.extend([oneway not in SENTIDO_UNICO and oneway != "-1"] * (len(nodos) - 1))
+    origenes, destinos = np.array(origenes, dtype=np.int64), np.array(destinos, dtype=np.int64)
+    dobleSentido = np.array(dobleSentido, dtype=bool)
+    pesos = longitudAristas(lats, lons, origenes, destinos)
+
+    return GrafoVial(
+        lats, lons,
+        np.concatenate((origenes, destinos[dobleSentido])),
+        np.concatenate((destinos, origenes[dobleSentido])),
+        np.concatenate((pesos, pesos[dobleSentido]))
+    )
+
+# funcion para cargar la red vial segun la extension del archivo
+def cargarGrafo(archivo: str) -> GrafoVial:
+    if archivo.endswith(".osm"):
+        grafo = leerOSM(archivo)
+    else:
+        grafo = leerListaAristas(archivo)
+    print(f"Red vial cargada: {grafo.numVertices} vertices, {grafo.numAristas} aristas")
+    return grafo
+
+# funcion para asignar cada nodo de la instancia a su vertice mas cercano de la red
+def verticesCercanos(grafo: GrafoVial, lats: np.ndarray, lons: np.ndarray, tamBloque: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
+    # devuelve (vertice, distancia en km del nodo a su vertice) por bloques de nodos
+    trigNodos = trigCoordenadas(lats, lons)
+    trigRed = trigCoordenadas(grafo.lats, grafo.lons)
+    # se arma un trig combinado para usar haversineTrig entre nodos y vertices
+    trig = tuple(np.concatenate((a, b)) for a, b in zip(trigNodos, trigRed))
+    n = len(lats)
+    vertices = np.empty(n, dtype=np.int64)
+    distancias = np.empty(n, dtype=np.float64)
+    columnas = n + np.arange(grafo.numVertices)
+    for inicio in range(0, n, tamBloque):
+        filas = np.arange(inicio, min(inicio + tamBloque, n))
+        bloque = haversineTrig(trig, filas[:, None], columnas[None, :])
+        cercano = np.argmin(bloque, axis=1)
+        vertices[filas] = cercano
+        distancias[filas] = bloque[np.arange(len(filas)), cercano]
+    return vertices, distancias
+
+# funcion para calcular caminos mas cortos desde un grupo de vertices (corre en un trabajador)
+def dijkstraLote(
+    origenes: List[int],
+    objetivos: List[int],
+    inicios: Descriptor,
+    destinos: Descriptor,
+    pesos: Descriptor
+) -> np.ndarray:
+    # un Dijkstra con heapq por origen; se detiene en cuanto se fijan todos los objetivos
+    # devuelve la matriz len(origenes) x len(objetivos) (inf si no hay camino)
+    bloques: List[shared_memory.SharedMemory] = []
+    try:
+        # el grafo se pasa a listas de python una vez por lote (acceso escalar mas rapido)
+        inicio = abrirArreglo(inicios, bloques).tolist()
+        destino = abrirArreglo(destinos, bloques).tolist()
+        peso = abrirArreglo(pesos, bloques).tolist()
+    finally:
+        for bloque in bloques:
+            bloque.close()
+
+    columna = {v: k for k, v in enumerate(objetivos)}
+    resultado = np.full((len(origenes), len(objetivos)), np.inf)
+    infinito = float("inf")
+    for fila, origen in enumerate(origenes):
+        distancia = {origen: 0.0}
+        fijados = set()
+        pendientes = len(columna)
+        cola = [(0.0, origen)]
+        while cola and pendientes:
+            d, v = heapq.heappop(cola)
+            if v in fijados:
+                continue
+            fijados.add(v)
+            k = columna.get(v)
+            if k is not None:
+                resultado[fila, k] = d
+                pendientes -= 1
+            for e in range(inicio[v], inicio[v + 1]):
+                w = destino[e]
+                nueva = d + peso[e]
+                if nueva < distancia.get(w, infinito):
+                    distancia[w] = nueva
+                    heapq.heappush(cola, (nueva, w))
+    return resultado
+
+# funcion para construir la matriz de distancias por la red vial
+def construirMatrizRed(
+    grafo: GrafoVial,
+    lats: np.ndarray,
+    lons: np.ndarray,
+    dtype: type = np.float64,
+    procesos: Optional[int] = None,     # None usa todos los nucleos, 1 calcula en este proceso
+    verbose: bool = True,
+    simetria: str = "media"             # "media" o "minima" de los dos sentidos (ver SIMETRIAS)
+) -> np.ndarray:
+    # distancia(i, j) = tramo recto de i a su vertice + camino mas corto por la red
+    # + tramo recto del vertice de j a j; los pares sin camino (red desconectada)
+    # se quedan con la distancia haversine y se reportan
+    if simetria not in SIMETRIAS:
+        raise ValueError(f"simetria '{simetria}' no valida, opciones: {SIMETRIAS}")
+    inicio = time.perf_counter()
+    n = len(lats)
+    vertices, acceso = verticesCercanos(grafo, lats, lons)
+
+    # un Dijkstra por vertice distinto: varios nodos pueden caer en el mismo vertice
+    unicos, deNodo = np.unique(vertices, return_inverse=True)
+    objetivos = unicos.tolist()
+    procesos = procesos or os.cpu_count() or 1
+    tamLote = max(1, len(objetivos) // (4 * procesos))
+    lotes = [objetivos[k:k + tamLote] for k in range(0, len(objetivos), tamLote)]
+
+    # el grafo se copia una sola vez a memoria compartida y cada lote de origenes
+    # se resuelve en un proceso del pool (con un proceso, aqui mismo)
+    bloques: List[shared_memory.SharedMemory] = []
+    try:
+        descriptores = [compartirArreglo(a, bloques) for a in (grafo.inicios, grafo.destinos, grafo.pesos)]
+        if procesos == 1:
+            filas = [dijkstraLote(lote, objetivos, *descriptores) for lote in lotes]
+        else:
+            with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+                futuros = [ejecutor.submit(dijkstraLote, lote, objetivos, *descriptores) for lote in lotes]
+                filas = [futuro.result() for futuro in futuros]
+    finally:
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+    entreVertices = np.vstack(filas)
+
+    # de vertices a nodos, mas los tramos de acceso a la red
+    matriz = entreVertices[deNodo[:, None], deNodo[None, :]] + acceso[:, None] + acceso[None, :]
+    sinCamino = ~np.isfinite(matriz)
+    if sinCamino.any():
+        trig = trigCoordenadas(lats, lons)
+        filasSin, columnasSin = np.nonzero(sinCamino)
+        matriz[filasSin, columnasSin] = haversineTrig(trig, filasSin, columnasSin)
+    # con calles de un solo sentido la matriz no es simetrica y los movimientos que
+    # invierten tramos se evaluarian con costos equivocados: se combinan los dos sentidos
+    asimetria = float(np.abs(matriz - matriz.T).max())
+    if asimetria > 0:
+        matriz = (matriz + matriz.T) / 2 if simetria == "media" else np.minimum(matriz, matriz.T)
+    np.fill_diagonal(matriz, 0)
+    matriz = matriz.astype(dtype)
+
+    if verbose:
+        print(f"Matriz por red vial {n}x{n} en {time.perf_counter() - inicio:.2f} s "
+              f"({len(objetivos)} busquedas de Dijkstra en {procesos} proceso(s), "
+              f"acceso promedio {acceso.mean() * 1000:,.0f} m)")
+        if sinCamino.any():
+            print(f"{int(sinCamino.sum())} pares sin camino en la red usan la distancia haversine")
+        if asimetria > 0:
+            print(f"Calles de un solo sentido: diferencia maxima entre sentidos {asimetria * 1000:,.0f} m, "
+                  f"la matriz se hizo simetrica con la {simetria}")
+    return matriz
+
+# funcion para generar la matriz de distancias por red vial de las coordenadas
+def generarMatrizRed(
+    coordenadas: pd.DataFrame,
+    archivoRed: str,
+    dtype: type = np.float64,
+    procesos: Optional[int] = None,
+    simetria: str = "media"
+) -> np.ndarray:
+    grafo = cargarGrafo(archivoRed)
+    return construirMatrizRed(
+        grafo,
+        coordenadas['Latitud_WGS84'].values,
+        coordenadas['Longitud_WGS84'].values,
+        dtype=dtype,
+        procesos=procesos,
+        simetria=simetria
+    )
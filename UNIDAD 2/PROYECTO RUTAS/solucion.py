@@ -1,59 +1,74 @@
-import random
 import numpy as np
-from typing import List, Tuple
+import pandas as pd
+from typing import Tuple
 from funcionDeCosto import Solucion
-from distancia import cdCercano 
+from proveedorDistancia import MatrizDistancia
 
-# definimos numero de nodos, CD y tiendas
-num_nodos = 100
-num_CDS = 10
-num_tiendas = 90
+TIPO_CD = 'Centro de Distribución'
+TIPO_TIENDA = 'Tienda'
+
+# metodos para construir la solucion inicial
+METODOS_INICIALES = ("cercano", "barrido")
+
+# funcion para obtener los indices de CDs y tiendas a partir de la columna Tipo
+def indicesNodos(coordenadas: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    tipos = coordenadas['Tipo'].values
+    return np.flatnonzero(tipos == TIPO_CD), np.flatnonzero(tipos == TIPO_TIENDA)
+
+# funcion para asignar cada tienda a su CD mas cercano
+def asignarTiendas(
+    matriz_distancia: MatrizDistancia,
+    indices_cds: np.ndarray,
+    indices_tiendas: np.ndarray,
+    tamBloque: int = 65536
+) -> np.ndarray:
+    # un solo argmin sobre el bloque tiendas x CDs (por bloques de filas para no formar
+    # arreglos enormes); devuelve la posicion en indices_cds del CD de cada tienda
+    asignacion = np.empty(len(indices_tiendas), dtype=np.int64)
+    columnas = np.asarray(indices_cds)[None, :]
+    for inicio in range(0, len(indices_tiendas), tamBloque):
+        filas = np.asarray(indices_tiendas[inicio:inicio + tamBloque])[:, None]
+        bloque = np.asarray(matriz_distancia[filas, columnas])
+        asignacion[inicio:inicio + len(filas)] = np.argmin(bloque, axis=1)
+    return asignacion
 
 # funcion para crear una solucion inicial
-def solucionInicial(matriz_distancia: np.ndarray) -> Solucion:
+def solucionInicial(
+    matriz_distancia: MatrizDistancia,
+    coordenadas: pd.DataFrame,
+    metodo: str = "cercano"
+) -> Solucion:
 
     # crea una solucion inicial asignando cada tienda a su CD mas cercano
+    # "cercano": las tiendas de cada CD en el orden de sus indices (comportamiento original)
+    # "barrido": las tiendas de cada CD ordenadas por angulo alrededor del CD (sweep)
+    if metodo not in METODOS_INICIALES:
+        raise ValueError(f"Metodo inicial desconocido: {metodo} (opciones: {', '.join(METODOS_INICIALES)})")
+    # los CDs y las tiendas salen de la columna Tipo, la instancia puede ser de cualquier tamano
+    if coordenadas is None:
+        raise ValueError("La solucion inicial necesita las coordenadas con la columna Tipo")
+    if len(coordenadas) != len(matriz_distancia):
+        raise ValueError(f"Las coordenadas tienen {len(coordenadas)} nodos y la matriz {len(matriz_distancia)}")
+
     # separar indices de CDs y tiendas
-    indices_cds = list(range(num_CDS))
-    indices_tiendas = list(range(num_CDS, num_nodos))
-    
-    # crea una lista de listas para las rutas una para cada CD
-    solucion = [[] for _ in indices_cds]
-    
-    # asignar cada tienda a su CD mas cercano
-    for tienda_idx in indices_tiendas:
-        #funcion que encuentra el CD mas cercano a la tienda
-        cd_cercano = cdCercano(tienda_idx, matriz_distancia, indices_cds)
-        solucion[cd_cercano].append(tienda_idx)
-        
+    indices_cds, indices_tiendas = indicesNodos(coordenadas)
+    asignacion = asignarTiendas(matriz_distancia, indices_cds, indices_tiendas)
+
+    # orden de las tiendas: agrupadas por CD y dentro de cada grupo segun el metodo
+    if metodo == "barrido":
+        lats = coordenadas['Latitud_WGS84'].values
+        lons = coordenadas['Longitud_WGS84'].values
+        cdDeTienda = indices_cds[asignacion]
+        # angulo polar de cada tienda respecto a su CD (longitud escalada por cos(lat))
+        dLat = lats[indices_tiendas] - lats[cdDeTienda]
+        dLon = (lons[indices_tiendas] - lons[cdDeTienda]) * np.cos(np.radians(lats[cdDeTienda]))
+        orden = np.lexsort((np.arctan2(dLat, dLon), asignacion))
+    else:
+        orden = np.argsort(asignacion, kind='stable')
+
+    # partir el arreglo ordenado en un grupo de tiendas por CD
+    conteos = np.bincount(asignacion, minlength=len(indices_cds))
+    grupos = np.split(indices_tiendas[orden], np.cumsum(conteos)[:-1])
+
     # formatear la solucion final: [CD, tienda1, tienda2, ..., CD]
-    rutas_finales = []
-    for i, tiendas_asignadas in enumerate(solucion):
-        # cada ruta inicia y termina en el CD
-        ruta = [i] + tiendas_asignadas + [i]
-        rutas_finales.append(ruta)
-        
-    return rutas_finales
-
-def generarVecinos(solucionActual: Solucion, matrizDistancia: np.ndarray) -> Solucion:
-    # generar una solucion vecina haciendo un swap de dos tiendas en una ruta aleatoria
-
-    nuevaSolucion = [list(ruta) for ruta in solucionActual] # copia de la solucion actual
-    
-    # seleccionar una ruta aleatoria
-    indiceRuta = random.randint(0, num_CDS - 1) 
-    ruta = nuevaSolucion[indiceRuta]
-    
-    # Una ruta debe tener al menos 2 tiendas para poder intercambiar y minimo 4 nodos: CD, T1, T2, CD
-    if len(ruta) < 4:
-        return nuevaSolucion # devuelve la misma solucion si no hay tiendas para mover
-        
-    # seleccionar dos indices de tienda para intercambiar
-    # excluimos el CD inicial y el final 
-    swap = random.sample(range(1, len(ruta) - 1), 2)
-    idx1, idx2 = swap[0], swap[1]
-    
-    # realizar el intercambio 
-    ruta[idx1], ruta[idx2] = ruta[idx2], ruta[idx1]
-    # retornar la nueva solucion vecina
-    return nuevaSolucion
\ No newline at end of file
+    return [[cd] + grupo.tolist() + [cd] for cd, grupo in zip(indices_cds.tolist(), grupos)]
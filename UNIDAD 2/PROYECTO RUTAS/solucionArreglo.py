@@ -0,0 +1,121 @@
+import random
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+class SolucionArreglo:
+    # solucion compacta tipo "giant tour": todas las rutas [CD, tiendas..., CD] van
+    # concatenadas en un solo arreglo int32 de paradas y un arreglo de inicios indica
+    # donde empieza cada ruta (la ruta k ocupa paradas[inicios[k]:inicios[k+1]])
+    # los movimientos se aplican en sitio y copiar la mejor solucion no crea arreglos nuevos
+    # posiciones[nodo] guarda donde esta cada tienda en paradas (para las listas de candidatos)
+
+    def __init__(self, paradas: np.ndarray, inicios: np.ndarray, posiciones: Optional[np.ndarray] = None):
+        self.paradas = paradas
+        self.inicios = inicios
+        if posiciones is None:
+            posiciones = np.full(int(paradas.max()) + 1 if len(paradas) else 0, -1, dtype=np.int32)
+            posiciones[paradas] = np.arange(len(paradas), dtype=np.int32)
+        self.posiciones = posiciones
+
+    @classmethod
+    def desdeRutas(cls, rutas: List[List[int]]) -> "SolucionArreglo":
+        # convierte una solucion en lista de rutas al formato de arreglo
+        longitudes = [len(ruta) for ruta in rutas]
+        inicios = np.zeros(len(rutas) + 1, dtype=np.int64)
+        inicios[1:] = np.cumsum(longitudes)
+        paradas = np.fromiter((nodo for ruta in rutas for nodo in ruta), dtype=np.int32, count=int(inicios[-1]))
+        return cls(paradas, inicios)
+
+    def comoRutas(self) -> List[List[int]]:
+        # convierte de regreso a lista de rutas (para imprimir y generar el mapa)
+        return [self.paradas[self.inicios[k]:self.inicios[k + 1]].tolist() for k in range(self.numRutas)]
+
+    @property
+    def numRutas(self) -> int:
+        return len(self.inicios) - 1
+
+    def ruta(self, k: int) -> np.ndarray:
+        # vista (sin copia) de la ruta k
+        return self.paradas[self.inicios[k]:self.inicios[k + 1]]
+
+    def __len__(self) -> int:
+        return self.numRutas
+
+    def __iter__(self):
+        for k in range(self.numRutas):
+            yield self.ruta(k)
+
+    def copia(self) -> "SolucionArreglo":
+        return SolucionArreglo(self.paradas.copy(), self.inicios.copy(), self.posiciones.copy())
+
+    def copiarDesde(self, otra: "SolucionArreglo") -> None:
+        # copia el contenido de otra solucion sobre los arreglos existentes (sin asignar memoria)
+        np.copyto(self.paradas, otra.paradas)
+        np.copyto(self.inicios, otra.inicios)
+        np.copyto(self.posiciones, otra.posiciones)
+
+    def actualizarPosiciones(self, inicio: int, fin: int) -> None:
+        # recalcula las posiciones de las paradas en [inicio, fin) despues de moverlas
+        self.posiciones[self.paradas[inicio:fin]] = np.arange(inicio, fin, dtype=np.int32)
+
+    def proponerSwap(self, rng=random) -> Optional[Tuple[int, int]]:
+        # propone un swap de dos tiendas en una ruta aleatoria
+        # devuelve las posiciones absolutas dentro de paradas
+        # rng puede ser un random.Random propio (cadenas en paralelo) o el modulo random
+
+        # seleccionar una ruta aleatoria
+        k = rng.randint(0, self.numRutas - 1)
+        inicio = int(self.inicios[k])
+        longitud = int(self.inicios[k + 1]) - inicio
+
+        # Una ruta debe tener al menos 2 tiendas para poder intercambiar y minimo 4 nodos: CD, T1, T2, CD
+        if longitud < 4:
+            return None
+
+        # seleccionar dos indices de tienda para intercambiar, excluyendo el CD inicial y el final
+        idx1, idx2 = rng.sample(range(1, longitud - 1), 2)
+        return inicio + idx1, inicio + idx2
+
+    def aplicarSwap(self, p1: int, p2: int) -> None:
+        # intercambia en sitio las paradas de las posiciones absolutas p1 y p2
+        paradas = self.paradas
+        paradas[p1], paradas[p2] = paradas[p2], paradas[p1]
+        self.posiciones[paradas[p1]] = p1
+        self.posiciones[paradas[p2]] = p2
+
+    def rutaDe(self, posicion: int) -> int:
+        # indice de la ruta que contiene la posicion absoluta dada
+        return int(np.searchsorted(self.inicios, posicion, side='right')) - 1
+
+    def esCD(self, posicion: int) -> bool:
+        # las posiciones de inicio y fin de cada ruta son CDs
+        k = self.rutaDe(posicion)
+        return posicion == self.inicios[k] or posicion == self.inicios[k + 1] - 1
+
+    def posicionTiendaAleatoria(self, rng=random, intentos: int = 32) -> Optional[int]:
+        # posicion absoluta de una tienda elegida al azar (uniforme sobre las tiendas)
+        # los CDs son pocos, por eso basta con muestreo por rechazo
+        for _ in range(intentos):
+            p = rng.randrange(len(self.paradas))
+            if not self.esCD(p):
+                return p
+        return None
+
+    def moverParada(self, origen: int, destino: int) -> None:
+        # saca la parada de la posicion origen y la inserta antes de la parada que
+        # estaba en destino (posiciones antes del movimiento), desplazando en sitio
+        # el bloque intermedio y ajustando los inicios de las rutas que se recorren
+        paradas = self.paradas
+        x = paradas[origen]
+        if origen < destino:
+            paradas[origen:destino - 1] = paradas[origen + 1:destino]
+            paradas[destino - 1] = x
+            self.inicios[(self.inicios > origen) & (self.inicios < destino)] -= 1
+            self.actualizarPosiciones(origen, destino)
+        elif origen > destino:
+            paradas[destino + 1:origen + 1] = paradas[destino:origen]
+            paradas[destino] = x
+            self.inicios[(self.inicios > destino) & (self.inicios < origen)] += 1
+            self.actualizarPosiciones(destino, origen + 1)
+
@@ -0,0 +1,305 @@
+import os
+import json
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import List, Optional, Dict, Any
+
+# modos de historial de costo disponibles
+MODOS_HISTORIAL = ("completo", "anillo", "muestreo", "archivo")
+
+
+class HistorialCosto(ABC):
+    # registro del costo por iteracion del recocido
+    # se usa como una lista (append / extend) para no cambiar los ciclos de temperatura,
+    # los valores se juntan en un bufer de python y se vacian por bloques al destino,
+    # asi el costo por iteracion es el de un append y la memoria no crece con la corrida
+
+    def __init__(self, tamBuffer: int = 4096):
+        self.tamBuffer = tamBuffer
+        self.pendientes: List[float] = []
+        self.total = 0          # iteraciones registradas (incluye el costo inicial)
+        self.primero: Optional[float] = None
+        self.ultimo: Optional[float] = None
+
+    def append(self, costo: float) -> None:
+        self.pendientes.append(costo)
+        if len(self.pendientes) >= self.tamBuffer:
+            self.vaciar()
+
+    def extend(self, costos) -> None:
+        self.pendientes.extend(costos)
+        if len(self.pendientes) >= self.tamBuffer:
+            self.vaciar()
+
+    def vaciar(self) -> None:
+        # pasa los valores pendientes al destino del historial
+        if not self.pendientes:
+            return
+        bloque = np.asarray(self.pendientes, dtype=np.float64)
+        if self.primero is None:
+            self.primero = float(bloque[0])
+        self.ultimo = float(bloque[-1])
+        self.guardarBloque(bloque, self.total)
+        self.total += len(bloque)
+        self.pendientes = []
+
+    @abstractmethod
+    def guardarBloque(self, bloque: np.ndarray, inicio: int) -> None:
+        # bloque = costos de las iteraciones inicio, inicio + 1, ...
+        ...
+
+    @abstractmethod
+    def valores(self) -> np.ndarray:
+        # costos conservados en orden cronologico
+        ...
+
+    def cerrar(self) -> None:
+        self.vaciar()
+
+    def __len__(self) -> int:
+        return self.total + len(self.pendientes)
+
+
+class HistorialCompleto(HistorialCosto):
+    # conserva todas las iteraciones (comportamiento original, crece con la corrida)
+
+    def __init__(self, tamBuffer: int = 4096):
+        super().__init__(tamBuffer)
+        self.bloques: List[np.ndarray] = []
+
+    def guardarBloque(self, bloque, inicio):
+        self.bloques.append(bloque)
+
+    def valores(self):
+        self.vaciar()
+        return np.concatenate(self.bloques) if self.bloques else np.empty(0)
+
+
+class HistorialAnillo(HistorialCosto):
+    # conserva solo las ultimas `capacidad` iteraciones en un arreglo circular
+
+    def __init__(self, capacidad: int = 100_000, tamBuffer: int = 4096):
+        super().__init__(tamBuffer)
+        self.anillo = np.empty(capacidad, dtype=np.float64)
+
+    def guardarBloque(self, bloque, inicio):
+        capacidad = len(self.anillo)
+        if len(bloque) > capacidad:
+            inicio += len(bloque) - capacidad
+            bloque = bloque[-capacidad:]
+        posiciones = (inicio + np.arange(len(bloque))) % capacidad
+        self.anillo[posiciones] = bloque
+
+    def valores(self):
+        self.vaciar()
+        capacidad = len(self.anillo)
+        if self.total <= capacidad:
+            return self.anillo[:self.total].copy()
+        corte = self.total % capacidad
+        return np.concatenate((self.anillo[corte:], self.anillo[:corte]))
+
+
+class HistorialMuestreo(HistorialCosto):
+    # conserva una de cada `cada` iteraciones (la 0, la cada, la 2*cada, ...)
+
+    def __init__(self, cada: int = 100, tamBuffer: int = 4096):
+        super().__init__(tamBuffer)
+        self.cada = cada
+        self.bloques: List[np.ndarray] = []
+
+    def guardarBloque(self, bloque, inicio):
+        # primer indice del bloque que cae en la malla de muestreo
+        desfase = (-inicio) % self.cada
+        self.bloques.append(bloque[desfase::self.cada])
+
+    def valores(self):
+        self.vaciar()
+        return np.concatenate(self.bloques) if self.bloques else np.empty(0)
+
+
+class HistorialArchivo(HistorialCosto):
+    # escribe el historial a disco mientras corre el recocido
+    # "bin": float64 crudo (se lee con np.fromfile), "csv": columnas iteracion,costo
+    # con cada > 1 solo se escribe una de cada `cada` iteraciones
+
+    def __init__(self, ruta: str, formato: str = "bin", cada: int = 1, tamBuffer: int = 4096):
+        super().__init__(tamBuffer)
+        if formato not in ("bin", "csv"):
+            raise ValueError(f"Formato de historial desconocido: {formato} (opciones: bin, csv)")
+        self.ruta = ruta
+        self.formato = formato
+        self.cada = cada
+        directorio = os.path.dirname(os.path.abspath(ruta))
+        os.makedirs(directorio, exist_ok=True)
+        self.archivo = open(ruta, "wb" if formato == "bin" else "w")
+        if formato == "csv":
+            self.archivo.write("iteracion,costo\n")
+
+    def guardarBloque(self, bloque, inicio):
+        desfase = (-inicio) % self.cada
+        muestra = bloque[desfase::self.cada]
+        if self.formato == "bin":
+            muestra.tofile(self.archivo)
+        else:
+            iteraciones = inicio + desfase + self.cada * np.arange(len(muestra))
+            np.savetxt(self.archivo, np.column_stack((iteraciones, muestra)), fmt=("%d", "%.6f"), delimiter=",")
+
+    def valores(self):
+        if not self.archivo.closed:
+            self.vaciar()
+            self.archivo.flush()
+        return leerHistorial(self.ruta)
+
+    def cerrar(self):
+        if not self.archivo.closed:
+            self.vaciar()
+            self.archivo.close()
+
+
+# funcion para leer un historial escrito por HistorialArchivo
+def leerHistorial(ruta: str) -> np.ndarray:
+    if ruta.endswith(".csv"):
+        return np.loadtxt(ruta, delimiter=",", skiprows=1, ndmin=2)[:, 1]
+    return np.fromfile(ruta, dtype=np.float64)
+
+# funcion para crear el historial segun el modo
+def crearHistorial(
+    modo: str = "completo",
+    capacidad: int = 100_000,       # anillo: iteraciones conservadas
+    cada: int = 100,                # muestreo / archivo: una de cada `cada` iteraciones
+    ruta: Optional[str] = None,     # archivo: destino (.bin o .csv)
+) -> HistorialCosto:
+    if modo == "completo":
+        return HistorialCompleto()
+    if modo == "anillo":
+        return HistorialAnillo(capacidad)
+    if modo == "muestreo":
+        return HistorialMuestreo(cada)
+    if modo == "archivo":
+        if ruta is None:
+            raise ValueError("El modo 'archivo' necesita la ruta del historial")
+        formato = "csv" if ruta.endswith(".csv") else "bin"
+        return HistorialArchivo(ruta, formato, cada)
+    raise ValueError(f"Modo de historial desconocido: {modo} (opciones: {', '.join(MODOS_HISTORIAL)})")
+
+
+class Progreso:
+    # reporte de avance con limite de frecuencia: imprime una fila de la tabla como
+    # maximo cada `intervalo` segundos en vez de una por ciclo de temperatura
+
+    def __init__(self, intervalo: float = 1.0, activo: bool = True):
+        self.intervalo = intervalo
+        self.activo = activo
+        self.ultimoReporte = -np.inf
+        self.cicloReportado = None
+
+    def encabezado(self, T0: float, alpha: float, costoInicial: float) -> None:
+        if not self.activo:
+            return
+        print(f"Temperatura inicial: {T0}, Factor de enfriamiento: {alpha}")
+        print(f"Costo de la solución inicial: ${costoInicial:,.2f} MXN")
+        print("\n| Ciclo | Temperatura | Costo Actual | Mejor Costo |")
+        print("|-------|-------------|--------------|-------------|")
+
+    def reportar(self, ciclo: int, T: float, costoActual: float, mejorCosto: float, forzar: bool = False) -> None:
+        if not self.activo:
+            return
+        # un ciclo ya impreso no se repite (la fila final se fuerza al terminar)
+        if ciclo == self.cicloReportado:
+            return
+        ahora = time.perf_counter()
+        if forzar or ahora - self.ultimoReporte >= self.intervalo:
+            self.ultimoReporte = ahora
+            self.cicloReportado = ciclo
+            print(f"| {ciclo:^5} | {T:11.4f} | ${costoActual:^8.2f} | ${mejorCosto:^7.2f} |")
+
+
+class EstadisticasMovimientos:
+    # perfil del recocido: tiempo en generar movimientos contra el tiempo en evaluarlos,
+    # movimientos propuestos / validos / aceptados / de mejora por temperatura y por
+    # operador, y movimientos por segundo; solo se llena si se pasa al recocido (sin el,
+    # el ciclo de temperatura no mide nada y no tiene costo extra)
+
+    def __init__(self):
+        self.ciclos: List[Dict[str, Any]] = []
+        self.operadores: Dict[str, Dict[str, int]] = {}
+        self.tiempoGeneracion = 0.0     # proponer movimientos (y numeros aleatorios)
+        self.tiempoEvaluacion = 0.0     # deltas de costo y criterio de Metropolis
+        self.tiempoAplicacion = 0.0     # aplicar movimientos, mejor solucion e historial
+        self.tiempoTotal = 0.0          # ciclos de temperatura completos
+
+    def registrarCiclo(
+        self,
+        ciclo: int,
+        T: float,
+        propuestos: int,
+        validos: int,
+        aceptados: int,
+        mejoras: int,
+        segundos: float
+    ) -> None:
+        self.ciclos.append({
+            "ciclo": ciclo,
+            "T": T,
+            "propuestos": propuestos,
+            "validos": validos,
+            "aceptados": aceptados,
+            "mejoras": mejoras,
+            "segundos": segundos,
+        })
+        self.tiempoTotal += segundos
+
+    def registrarOperador(self, nombre: str, propuestos: int, validos: int, aceptados: int, mejoras: int) -> None:
+        conteo = self.operadores.setdefault(nombre, {"propuestos": 0, "validos": 0, "aceptados": 0, "mejoras": 0})
+        conteo["propuestos"] += propuestos
+        conteo["validos"] += validos
+        conteo["aceptados"] += aceptados
+        conteo["mejoras"] += mejoras
+
+    def total(self, campo: str) -> int:
+        return sum(c[campo] for c in self.ciclos)
+
+    @property
+    def movimientosPorSegundo(self) -> float:
+        return self.total("propuestos") / self.tiempoTotal if self.tiempoTotal > 0 else 0.0
+
+    def resumen(self) -> Dict[str, Any]:
+        propuestos = self.total("propuestos")
+        return {
+            "ciclos": len(self.ciclos),
+            "propuestos": propuestos,
+            "validos": self.total("validos"),
+            "aceptados": self.total("aceptados"),
+            "mejoras": self.total("mejoras"),
+            "tasaAceptacion": self.total("aceptados") / propuestos if propuestos else 0.0,
+            "movimientosPorSegundo": self.movimientosPorSegundo,
+            "segundos": {
+                "generacion": self.tiempoGeneracion,
+                "evaluacion": self.tiempoEvaluacion,
+                "aplicacion": self.tiempoAplicacion,
+                "otros": max(self.tiempoTotal - self.tiempoGeneracion - self.tiempoEvaluacion - self.tiempoAplicacion, 0.0),
+                "total": self.tiempoTotal,
+            },
+            "operadores": self.operadores,
+        }
+
+    def guardarJson(self, ruta: str) -> None:
+        # resumen y detalle por temperatura en un solo archivo
+        with open(ruta, 'w', encoding='utf-8') as f:
+            json.dump({"resumen": self.resumen(), "temperaturas": self.ciclos}, f, indent=1)
+
+    def reporte(self) -> None:
+        r = self.resumen()
+        s = r["segundos"]
+        total = s["total"] or 1.0
+        print(f"\nMovimientos: {r['propuestos']:,} propuestos, {r['aceptados']:,} aceptados "
+              f"({r['tasaAceptacion']:.1%}), {r['mejoras']:,} de mejora, {r['movimientosPorSegundo']:,.0f} mov/s")
+        print(f"Tiempo: generacion {s['generacion']:.2f} s ({s['generacion'] / total:.0%}), "
+              f"evaluacion {s['evaluacion']:.2f} s ({s['evaluacion'] / total:.0%}), "
+              f"aplicacion {s['aplicacion']:.2f} s ({s['aplicacion'] / total:.0%}), "
+              f"otros {s['otros']:.2f} s")
+        print("\n| Operador    | Propuestos | Aceptados | Mejoras |")
+        print("|-------------|------------|-----------|---------|")
+        for nombre, c in r["operadores"].items():
+            print(f"| {nombre:<11} | {c['propuestos']:^10} | {c['aceptados']:^9} | {c['mejoras']:^7} |")
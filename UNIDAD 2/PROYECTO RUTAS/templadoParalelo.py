@@ -0,0 +1,236 @@
+import math
+import random
+import time
+import numpy as np
+import pandas as pd
+from multiprocessing import Process, Pipe
+from multiprocessing import shared_memory
+from typing import List, Tuple, Optional, Dict, Any
+
+from funcionDeCosto import Solucion
+from solucion import solucionInicial
+from solucionArreglo import SolucionArreglo
+from recocidoSimulado import EstadoCadena, cicloTemperatura, VECINDARIO_SWAP
+from multiInicio import compartirMatriz, abrirMatriz
+from proveedorDistancia import MatrizDistancia, matrizArcosDe
+from vecindario import Vecindario
+from recocidoLotes import cicloTemperaturaLotes, probabilidadDosOpt
+
+# segundos entre revisiones de que la replica sigue viva mientras se espera su respuesta
+INTERVALO_VIGILANCIA = 0.5
+# segundos que se espera a que una replica termine sola antes de forzar su cierre
+TIEMPO_CIERRE = 5.0
+
+
+# funcion que mantiene una replica viva en un proceso trabajador
+def trabajadorReplica(
+    conexion,
+    distanciaCompartida,
+    arcosCompartida,
+    semilla: int,
+    vecindario: Optional[Vecindario],
+    solucionInicio: Solucion,
+    lotes: bool = False
+) -> None:
+    # la replica conserva su solucion en el trabajador, el proceso principal solo le
+    # indica a que temperatura correr cada ronda; intercambiar temperaturas entre
+    # replicas equivale a intercambiar sus estados sin copiar soluciones
+    bloques: List[shared_memory.SharedMemory] = []
+    try:
+        matrizDistancia = abrirMatriz(distanciaCompartida, bloques)
+        matrizArcos = abrirMatriz(arcosCompartida, bloques)
+        rng = random.Random(semilla)
+        if vecindario is None:
+            vecindario = VECINDARIO_SWAP
+        if lotes:
+            gen = np.random.default_rng(semilla)
+            probDosOpt = probabilidadDosOpt(vecindario)
+        estado = EstadoCadena(SolucionArreglo.desdeRutas(solucionInicio), matrizArcos)
+        conexion.send(estado.costoActual)
+
+        while True:
+            mensaje = conexion.recv()
+            if mensaje[0] == "ciclo":
+                _, T, L = mensaje
+                if lotes:
+                    aceptados = cicloTemperaturaLotes(estado, T, L, matrizArcos, gen, probDosOpt=probDosOpt)
+                else:
+                    aceptados = cicloTemperatura(estado, T, L, matrizArcos, rng, vecindario=vecindario)
+                conexion.send((estado.costoActual, estado.mejorCosto, aceptados))
+            elif mensaje[0] == "resultado":
+                conexion.send((estado.mejorSolucion.comoRutas(), estado.mejorCosto))
+            else:
+                break
+        del matrizDistancia, matrizArcos, estado
+    finally:
+        for bloque in bloques:
+            bloque.close()
+        conexion.close()
+
+# funcion para recibir la respuesta de una replica vigilando que siga viva
+def recibirReplica(conexion, proceso: Process, r: int, tiempoRespuesta: Optional[float]):
+    # si el trabajador muere (excepcion, falta de memoria, senal) o no responde en
+    # tiempoRespuesta segundos se lanza un error en lugar de esperar para siempre
+    limite = None if tiempoRespuesta is None else time.monotonic() + tiempoRespuesta
+    while not conexion.poll(INTERVALO_VIGILANCIA):
+        if not proceso.is_alive():
+            # pudo haber respondido justo antes de terminar
+            if conexion.poll():
+                break
+            raise RuntimeError(f"la replica {r} termino inesperadamente (codigo de salida {proceso.exitcode})")
+        if limite is not None and time.monotonic() > limite:
+            raise TimeoutError(f"la replica {r} no respondio en {tiempoRespuesta} s")
+    try:
+        return conexion.recv()
+    except EOFError:
+        proceso.join(TIEMPO_CIERRE)
+        raise RuntimeError(f"la replica {r} cerro su conexion (codigo de salida {proceso.exitcode})")
+
+# funcion para cerrar los procesos de las replicas
+def cerrarReplicas(conexiones: list, procesos: List[Process], ordenado: bool) -> None:
+    # en un cierre ordenado se pide a cada replica que termine y se le da TIEMPO_CIERRE
+    # segundos; despues de un error (o si no termina a tiempo) se termina a la fuerza
+    if ordenado:
+        for conexion in conexiones:
+            try:
+                conexion.send(("fin",))
+            except (BrokenPipeError, OSError):
+                pass
+        for proceso in procesos:
+            proceso.join(TIEMPO_CIERRE)
+    for proceso in procesos:
+        if proceso.is_alive():
+            proceso.terminate()
+            proceso.join(TIEMPO_CIERRE)
+    for conexion in conexiones:
+        conexion.close()
+
+# funcion para generar la escalera geometrica de temperaturas
+def escaleraTemperaturas(Tmin: float, Tmax: float, numReplicas: int) -> List[float]:
+    if numReplicas == 1:
+        return [Tmin]
+    razon = (Tmax / Tmin) ** (1.0 / (numReplicas - 1))
+    return [Tmin * razon ** k for k in range(numReplicas)]
+
+# funcion para ejecutar el templado paralelo (intercambio de replicas)
+def templadoParalelo(
+    matrizDistancia: MatrizDistancia,
+    matrizCosto: Optional[MatrizDistancia],
+    numReplicas: int = 8,
+    Tmin: float = 0.1,              # Temperatura de la replica mas fria
+    Tmax: float = 100.0,            # Temperatura de la replica mas caliente
+    rondas: int = 135,              # Rondas de L iteraciones seguidas de un intento de intercambio
+    L: int = 200,                   # Iteraciones por replica en cada ronda
+    semillaBase: int = 0,
+    matrizArcos: Optional[MatrizDistancia] = None,
+    temperaturas: Optional[List[float]] = None,
+    verbose: bool = True,
+    vecindario: Optional[Vecindario] = None,  # Operadores y su mezcla (None = solo swap)
+    solucionInicio: Optional[Solucion] = None, # Solucion de partida de todas las replicas
+    coordenadas: Optional[pd.DataFrame] = None, # Nodos con su columna Tipo (necesarias si no hay solucionInicio)
+    lotes: bool = False,                      # Evalua los L movimientos de cada ronda en lote (solo swap y 2opt)
+    tiempoRespuesta: Optional[float] = 300.0  # Segundos maximos de espera por replica en cada ronda (None = sin limite)
+) -> Tuple[Solucion, float, Dict[str, Any]]:
+    # corre K replicas a temperaturas fijas en procesos paralelos con el mismo criterio de
+    # aceptacion del recocido; despues de cada ronda intenta intercambiar las replicas de
+    # temperaturas adyacentes con probabilidad min(1, exp((1/Ti - 1/Tj) * (Ei - Ej)))
+
+    if matrizArcos is None:
+        matrizArcos = matrizArcosDe(matrizDistancia, matrizCosto)
+    if temperaturas is None:
+        temperaturas = escaleraTemperaturas(Tmin, Tmax, numReplicas)
+    numReplicas = len(temperaturas)
+    if lotes:
+        # la mezcla se valida aqui para no fallar dentro de los trabajadores
+        probabilidadDosOpt(vecindario or VECINDARIO_SWAP)
+    # la solucion de partida se construye una vez aqui y se envia a todas las replicas
+    if solucionInicio is None:
+        solucionInicio = solucionInicial(matrizDistancia, coordenadas)
+
+    # flujos aleatorios independientes: uno por replica y uno para los intercambios
+    semillas = [int(s.generate_state(1)[0]) for s in np.random.SeedSequence(semillaBase).spawn(numReplicas + 1)]
+    rng = random.Random(semillas[-1])
+
+    inicio = time.perf_counter()
+    bloques: List[shared_memory.SharedMemory] = []
+    conexiones = []
+    procesos = []
+    completo = False
+    try:
+        distanciaCompartida = compartirMatriz(matrizDistancia, bloques)
+        arcosCompartida = compartirMatriz(matrizArcos, bloques)
+
+        for r in range(numReplicas):
+            principal, trabajador = Pipe()
+            argumentos = (trabajador, distanciaCompartida, arcosCompartida, semillas[r], vecindario, solucionInicio, lotes)
+            proceso = Process(target=trabajadorReplica, args=argumentos, daemon=True)
+            proceso.start()
+            # el principal cierra su copia del extremo del trabajador: si la replica
+            # muere, recv ve el fin de la conexion en lugar de bloquearse
+            trabajador.close()
+            conexiones.append(principal)
+            procesos.append(proceso)
+
+        # costos actuales de cada replica
+        costos = [recibirReplica(conexiones[r], procesos[r], r, tiempoRespuesta) for r in range(numReplicas)]
+        mejoresCostos = list(costos)
+
+        # replicaEn[k] = replica que esta corriendo a la temperatura k
+        replicaEn = list(range(numReplicas))
+        intentos = [0] * (numReplicas - 1)
+        aceptadosIntercambio = [0] * (numReplicas - 1)
+        aceptadosMovimiento = [0] * numReplicas
+        historialMejor = []
+
+        if verbose:
+            print(f"Templado paralelo: {numReplicas} replicas, T = {', '.join(f'{T:.3f}' for T in temperaturas)}")
+            print("\n| Ronda | Costo (T min) | Mejor Costo | Intercambios |")
+            print("|-------|---------------|-------------|--------------|")
+
+        for ronda in range(1, rondas + 1):
+            # todas las replicas corren su ronda al mismo tiempo
+            for k, r in enumerate(replicaEn):
+                conexiones[r].send(("ciclo", temperaturas[k], L))
+            for k, r in enumerate(replicaEn):
+                costos[r], mejoresCostos[r], aceptados = recibirReplica(conexiones[r], procesos[r], r, tiempoRespuesta)
+                aceptadosMovimiento[k] += aceptados
+
+            # intento de intercambio entre temperaturas adyacentes
+            # se alternan los pares pares e impares en cada ronda
+            for k in range(ronda % 2, numReplicas - 1, 2):
+                a, b = replicaEn[k], replicaEn[k + 1]
+                exponente = (1.0 / temperaturas[k] - 1.0 / temperaturas[k + 1]) * (costos[a] - costos[b])
+                intentos[k] += 1
+                if exponente >= 0 or rng.random() < math.exp(exponente):
+                    replicaEn[k], replicaEn[k + 1] = b, a
+                    aceptadosIntercambio[k] += 1
+
+            mejorCosto = min(mejoresCostos)
+            historialMejor.append(mejorCosto)
+            if verbose and (ronda % 10 == 0 or ronda == rondas):
+                print(f"| {ronda:^5} | ${costos[replicaEn[0]]:^11.2f} | ${mejorCosto:^9.2f} | {sum(aceptadosIntercambio):^12} |")
+
+        # se pide la mejor solucion a la replica que la encontro
+        mejorReplica = int(np.argmin(mejoresCostos))
+        conexiones[mejorReplica].send(("resultado",))
+        mejorSolucion, mejorCosto = recibirReplica(conexiones[mejorReplica], procesos[mejorReplica], mejorReplica, tiempoRespuesta)
+        completo = True
+    finally:
+        # si una replica fallo, las demas se terminan antes de liberar la memoria compartida
+        cerrarReplicas(conexiones, procesos, ordenado=completo)
+        for bloque in bloques:
+            bloque.close()
+            bloque.unlink()
+
+    segundos = time.perf_counter() - inicio
+    estadisticas = {
+        "temperaturas": temperaturas,
+        "intentosIntercambio": intentos,
+        "aceptadosIntercambio": aceptadosIntercambio,
+        "tasaIntercambio": [a / i if i else 0.0 for a, i in zip(aceptadosIntercambio, intentos)],
+        "tasaAceptacion": [a / (rondas * L) for a in aceptadosMovimiento],
+        "historialMejor": historialMejor,
+        "movimientosEvaluados": numReplicas * rondas * L,
+        "segundos": segundos,
+    }
+    return mejorSolucion, mejorCosto, estadisticas
@@ -0,0 +1,303 @@
+import random
+import itertools
+import bisect
+from abc import ABC, abstractmethod
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from funcionDeCosto import deltaSwap
+from solucionArreglo import SolucionArreglo
+from proveedorDistancia import MatrizDistancia
+
+# los deltas de 2-opt asumen costos simetricos (A[i, j] == A[j, i]), como la distancia
+# haversine, la de red vial (se hace simetrica, ver redVial.SIMETRIAS) y el costo de
+# combustible de los datos; los demas operadores no lo requieren
+
+
+class Operador(ABC):
+    # interfaz de un operador de vecindario sobre una SolucionArreglo:
+    # proponer -> movimiento (o None), delta -> cambio de costo O(1), aplicar -> en sitio
+    # con listas de candidatos (k tiendas mas cercanas de cada tienda) los operadores que
+    # las aprovechan eligen su pareja entre los vecinos cercanos en lugar de al azar
+    nombre = "operador"
+    candidatos: Optional[np.ndarray] = None
+    probCandidatos: float = 1.0
+
+    def proponer(self, solucion: SolucionArreglo, rng=random) -> Optional[Tuple[int, ...]]:
+        if self.candidatos is not None and (self.probCandidatos >= 1.0 or rng.random() < self.probCandidatos):
+            return self.proponerCandidato(solucion, rng)
+        return self.proponerAleatorio(solucion, rng)
+
+    @abstractmethod
+    def proponerAleatorio(self, solucion: SolucionArreglo, rng=random) -> Optional[Tuple[int, ...]]:
+        ...
+
+    def proponerCandidato(self, solucion: SolucionArreglo, rng=random) -> Optional[Tuple[int, ...]]:
+        # por defecto el operador no usa candidatos
+        return self.proponerAleatorio(solucion, rng)
+
+    def tiendaYVecino(self, solucion: SolucionArreglo, rng=random) -> Optional[Tuple[int, int]]:
+        # posicion de una tienda al azar y la posicion de uno de sus k vecinos mas cercanos
+        i = solucion.posicionTiendaAleatoria(rng)
+        if i is None:
+            return None
+        vecinos = self.candidatos[solucion.paradas[i]]
+        j = int(solucion.posiciones[vecinos[rng.randrange(len(vecinos))]])
+        if j < 0:
+            return None
+        return i, j
+
+    @abstractmethod
+    def delta(self, solucion: SolucionArreglo, movimiento: Tuple[int, ...], matrizArcos: MatrizDistancia) -> float:
+        ...
+
+    @abstractmethod
+    def aplicar(self, solucion: SolucionArreglo, movimiento: Tuple[int, ...]) -> None:
+        ...
+
+
+class OperadorSwap(Operador):
+    # intercambia dos tiendas de la misma ruta (el movimiento original del recocido)
+    nombre = "swap"
+
+    def proponerAleatorio(self, solucion, rng=random):
+        return solucion.proponerSwap(rng)
+
+    def delta(self, solucion, movimiento, matrizArcos):
+        p1, p2 = movimiento
+        return deltaSwap(solucion.paradas, p1, p2, matrizArcos)
+
+    def aplicar(self, solucion, movimiento):
+        solucion.aplicarSwap(*movimiento)
+
+
+class OperadorDosOpt(Operador):
+    # invierte el tramo de tiendas paradas[i..j] dentro de una ruta
+    # solo cambian los dos tramos de los extremos
+    nombre = "2opt"
+
+    def proponerAleatorio(self, solucion, rng=random):
+        k = rng.randrange(solucion.numRutas)
+        inicio = int(solucion.inicios[k])
+        longitud = int(solucion.inicios[k + 1]) - inicio
+        if longitud < 4:
+            return None
+        i, j = sorted(rng.sample(range(1, longitud - 1), 2))
+        return inicio + i, inicio + j
+
+    def proponerCandidato(self, solucion, rng=random):
+        # invierte el tramo necesario para que la tienda x quede junto a su vecino y
+        par = self.tiendaYVecino(solucion, rng)
+        if par is None:
+            return None
+        a, b = par
+        if solucion.rutaDe(a) != solucion.rutaDe(b):
+            return None
+        # a antes de b: invertir [a+1, b] crea el tramo x -> y
+        # b antes de a: invertir [b, a-1] crea el tramo y -> x
+        i, j = (a + 1, b) if a < b else (b, a - 1)
+        if i >= j:
+            return None
+        return i, j
+
+    def delta(self, solucion, movimiento, matrizArcos):
+        i, j = movimiento
+        p = solucion.paradas
+        antes, a, b, despues = p[i - 1], p[i], p[j], p[j + 1]
+        return float(matrizArcos[antes, b] + matrizArcos[a, despues]
+                     - matrizArcos[antes, a] - matrizArcos[b, despues])
+
+    def aplicar(self, solucion, movimiento):
+        i, j = movimiento
+        p = solucion.paradas
+        p[i:j + 1] = p[i:j + 1][::-1]
+        solucion.actualizarPosiciones(i, j + 1)
+
+
+class OperadorOrOpt(Operador):
+    # mueve un bloque de 1 a largoMax tiendas consecutivas a otra posicion de la misma ruta
+    nombre = "oropt"
+
+    def __init__(self, largoMax: int = 3):
+        self.largoMax = largoMax
+
+    def proponerAleatorio(self, solucion, rng=random):
+        k = rng.randrange(solucion.numRutas)
+        inicio = int(solucion.inicios[k])
+        fin = int(solucion.inicios[k + 1]) - 1  # posicion del CD final
+        tiendas = fin - inicio - 1
+        if tiendas < 2:
+            return None
+        largo = rng.randint(1, min(self.largoMax, tiendas - 1))
+        i = rng.randint(inicio + 1, fin - largo)
+        # u es la posicion tras la cual se inserta el bloque, fuera de [i-1, i+largo-1]
+        opciones = (i - 1 - inicio) + (fin - (i + largo))
+        if opciones <= 0:
+            return None
+        r = rng.randrange(opciones)
+        u = inicio + r if r < i - 1 - inicio else i + largo + (r - (i - 1 - inicio))
+        return i, largo, u
+
+    def proponerCandidato(self, solucion, rng=random):
+        # mueve el bloque que empieza en la tienda x para dejarlo justo despues de su vecino y
+        par = self.tiendaYVecino(solucion, rng)
+        if par is None:
+            return None
+        i, u = par
+        k = solucion.rutaDe(i)
+        if solucion.rutaDe(u) != k:
+            return None
+        fin = int(solucion.inicios[k + 1]) - 1
+        largo = rng.randint(1, self.largoMax)
+        if i + largo > fin or i - 1 <= u <= i + largo - 1:
+            return None
+        return i, largo, u
+
+    def delta(self, solucion, movimiento, matrizArcos):
+        i, largo, u = movimiento
+        p = solucion.paradas
+        primero, ultimo = p[i], p[i + largo - 1]
+        antes, despues = p[i - 1], p[i + largo]
+        # quitar el bloque y unir sus vecinos
+        quitar = matrizArcos[antes, despues] - matrizArcos[antes, primero] - matrizArcos[ultimo, despues]
+        # insertar el bloque entre u y u+1
+        poner = matrizArcos[p[u], primero] + matrizArcos[ultimo, p[u + 1]] - matrizArcos[p[u], p[u + 1]]
+        return float(quitar + poner)
+
+    def aplicar(self, solucion, movimiento):
+        i, largo, u = movimiento
+        p = solucion.paradas
+        bloque = p[i:i + largo].copy()
+        if u < i:
+            p[u + 1 + largo:i + largo] = p[u + 1:i]
+            p[u + 1:u + 1 + largo] = bloque
+            solucion.actualizarPosiciones(u + 1, i + largo)
+        else:
+            p[i:u + 1 - largo] = p[i + largo:u + 1]
+            p[u + 1 - largo:u + 1] = bloque
+            solucion.actualizarPosiciones(i, u + 1)
+
+
+class OperadorReubicar(Operador):
+    # saca una tienda de su ruta y la inserta en otra ruta (otro CD)
+    nombre = "reubicar"
+
+    def proponerAleatorio(self, solucion, rng=random):
+        if solucion.numRutas < 2:
+            return None
+        origen = solucion.posicionTiendaAleatoria(rng)
+        if origen is None:
+            return None
+        a = solucion.rutaDe(origen)
+        b = rng.randrange(solucion.numRutas - 1)
+        if b >= a:
+            b += 1
+        return origen, self.destinoEnRuta(solucion, b, rng)
+
+    def proponerCandidato(self, solucion, rng=random):
+        # inserta la tienda x antes o despues de su vecino y, que esta en otra ruta
+        par = self.tiendaYVecino(solucion, rng)
+        if par is None:
+            return None
+        origen, j = par
+        if solucion.rutaDe(origen) == solucion.rutaDe(j):
+            return None
+        return origen, j + rng.randint(0, 1)
+
+    @staticmethod
+    def destinoEnRuta(solucion, b: int, rng=random) -> int:
+        # posicion de insercion en la ruta b: antes de cualquier parada excepto su CD inicial
+        return rng.randint(int(solucion.inicios[b]) + 1, int(solucion.inicios[b + 1]) - 1)
+
+    def delta(self, solucion, movimiento, matrizArcos):
+        origen, destino = movimiento
+        p = solucion.paradas
+        x, antes, despues = p[origen], p[origen - 1], p[origen + 1]
+        u, v = p[destino - 1], p[destino]
+        quitar = matrizArcos[antes, despues] - matrizArcos[antes, x] - matrizArcos[x, despues]
+        poner = matrizArcos[u, x] + matrizArcos[x, v] - matrizArcos[u, v]
+        return float(quitar + poner)
+
+    def aplicar(self, solucion, movimiento):
+        solucion.moverParada(*movimiento)
+
+
+class OperadorIntercambio(Operador):
+    # intercambia dos tiendas de rutas distintas (cambian de CD entre si)
+    nombre = "intercambio"
+
+    def proponerAleatorio(self, solucion, rng=random):
+        p1 = solucion.posicionTiendaAleatoria(rng)
+        p2 = solucion.posicionTiendaAleatoria(rng)
+        if p1 is None or p2 is None or solucion.rutaDe(p1) == solucion.rutaDe(p2):
+            return None
+        return p1, p2
+
+    def proponerCandidato(self, solucion, rng=random):
+        # intercambia la tienda x con un vecino cercano y de otra ruta
+        par = self.tiendaYVecino(solucion, rng)
+        if par is None or solucion.rutaDe(par[0]) == solucion.rutaDe(par[1]):
+            return None
+        return par
+
+    def delta(self, solucion, movimiento, matrizArcos):
+        # las posiciones estan en rutas distintas, nunca son adyacentes
+        p1, p2 = movimiento
+        return deltaSwap(solucion.paradas, p1, p2, matrizArcos)
+
+    def aplicar(self, solucion, movimiento):
+        solucion.aplicarSwap(*movimiento)
+
+
+# operadores disponibles por nombre
+OPERADORES = {
+    "swap": OperadorSwap,
+    "2opt": OperadorDosOpt,
+    "oropt": OperadorOrOpt,
+    "reubicar": OperadorReubicar,
+    "intercambio": OperadorIntercambio,
+}
+
+# mezcla por defecto con movimientos dentro y entre rutas
+MEZCLA_DEFAULT = {"2opt": 0.3, "oropt": 0.2, "reubicar": 0.25, "intercambio": 0.15, "swap": 0.1}
+
+
+class Vecindario:
+    # motor de vecindario: elige un operador segun su peso y delega en el
+    # la propuesta, el delta y la aplicacion del movimiento
+
+    def __init__(
+        self,
+        mezcla: Optional[Dict[str, float]] = None,
+        candidatos: Optional[np.ndarray] = None,  # matriz n x k de vecinos cercanos (ver candidatos.py)
+        probCandidatos: float = 0.8               # fraccion de propuestas guiadas por candidatos
+    ):
+        if mezcla is None:
+            mezcla = MEZCLA_DEFAULT
+        self.operadores: List[Operador] = []
+        pesos = []
+        for nombre, peso in mezcla.items():
+            if nombre not in OPERADORES:
+                raise ValueError(f"operador '{nombre}' no valido, opciones: {list(OPERADORES)}")
+            if peso > 0:
+                operador = OPERADORES[nombre]()
+                operador.candidatos = candidatos
+                operador.probCandidatos = probCandidatos
+                self.operadores.append(operador)
+                pesos.append(peso)
+        if not self.operadores:
+            raise ValueError("la mezcla de operadores no tiene pesos positivos")
+        # pesos acumulados para elegir el operador con una sola busqueda binaria
+        total = sum(pesos)
+        self.acumulados = [a / total for a in itertools.accumulate(pesos)]
+
+    def elegir(self, rng=random) -> Operador:
+        # con un solo operador no se consume ningun numero aleatorio
+        if len(self.operadores) == 1:
+            return self.operadores[0]
+        indice = bisect.bisect_right(self.acumulados, rng.random())
+        return self.operadores[min(indice, len(self.operadores) - 1)]
+
+    def proponer(self, solucion: SolucionArreglo, rng=random) -> Tuple[Operador, Optional[Tuple[int, ...]]]:
+        operador = self.elegir(rng)
+        return operador, operador.proponer(solucion, rng)
@@ -1,12 +1,18 @@
+import numpy as np
+from municipio import matrizDistancias
+from cacheAptitud import CacheAptitud
+from seleccion import seleccionar
 from operadorGenetico import (
-    poblacionInicial, 
+    poblacionInicialIndices, 
     clasificacionRutas, 
+    clasificacionPoblacion, 
     seleccionRutas, 
     grupoApareamiento, 
     crucePoblacion, 
     mutacionPoblacion)
 
-def siguienteGeneracion(generacionActual, indivSeleccionados, razonMutacion):
+def siguienteGeneracion(generacionActual, indivSeleccionados, razonMutacion, matrizDistancia=None, cache=None, metodoSeleccion="ruleta", tamTorneo=3,
+                        metodoCruce="ordenado"):
     """
         Funcion: Realiza el proceso para las siguientes generaciones.
  
@@ -14,23 +20,47 @@ def siguienteGeneracion(generacionActual, indivSeleccionados, razonMutacion):
             generacionActual (list): La poblacion actual de rutas.
             indivSeleccionados (int): El numero de individuos de elite a preservar.
             razonMutacion (float): La probabilidad de mutacion para cada individuo.
+            matrizDistancia (np.ndarray): Matriz de distancias si las rutas son permutaciones de indices.
+            cache (CacheAptitud): Distancias conocidas de la generacion actual (opcional).
+            metodoSeleccion (str): "ruleta", "universal" (SUS) o "torneo".
+            tamTorneo (int): Participantes de cada torneo.
+            metodoCruce (str): "ordenado", "pmx" o "aristas".
         Retorna:
             Una nueva poblacion (generacion) de rutas.
     """
-    # clasificar rutas
-    poblacionClasificada = clasificacionRutas(generacionActual)
-    # seleccion de los candidatos
-    resultadosSeleccion = seleccionRutas(poblacionClasificada, indivSeleccionados)
+    if matrizDistancia is not None:
+        # clasificar y seleccionar directamente sobre arreglos de numpy
+        orden, aptitudes = clasificacionPoblacion(generacionActual, matrizDistancia, cache)
+        resultadosSeleccion = seleccionar(orden, aptitudes, indivSeleccionados, metodoSeleccion, tamTorneo=tamTorneo)
+    else:
+        # clasificar rutas
+        poblacionClasificada = clasificacionRutas(generacionActual)
+        # seleccion de los candidatos
+        resultadosSeleccion = seleccionRutas(poblacionClasificada, indivSeleccionados, metodoSeleccion, tamTorneo)
     # generar grupo de apareamiento
     grupoApareamientoRutas = grupoApareamiento(generacionActual, resultadosSeleccion)
     # generar nueva poblacion
-    hijos = crucePoblacion(grupoApareamientoRutas, indivSeleccionados)
+    hijos = crucePoblacion(grupoApareamientoRutas, indivSeleccionados, metodoCruce)
+    if matrizDistancia is None:
+        # aplicar mutacion
+        return mutacionPoblacion(hijos, razonMutacion)
+
+    # la elite son vistas de la generacion actual: se copia para que la mutacion
+    # (en su lugar) no altere las rutas ni las distancias de la generacion anterior
+    nuevaGeneracion = np.array(hijos)
     # aplicar mutacion
-    nuevaGeneracion = mutacionPoblacion(hijos, razonMutacion)
-    
+    mutacionPoblacion(nuevaGeneracion, razonMutacion)
+    if cache is not None:
+        # la elite que no muto conserva su distancia; los demas renglones son nuevos
+        elite = orden[:indivSeleccionados]
+        sinCambio = (nuevaGeneracion[:indivSeleccionados] == generacionActual[elite]).all(axis=1)
+        origen = np.full(len(nuevaGeneracion), -1)
+        origen[:indivSeleccionados] = np.where(sinCambio, elite, -1)
+        cache.heredar(nuevaGeneracion, origen)
     return nuevaGeneracion
 
-def algoritmoGenetico(municipios, tampoblacion, indivSeleccionados, razonMutacion, generaciones, verbose):
+def algoritmoGenetico(municipios, tampoblacion, indivSeleccionados, razonMutacion, generaciones, verbose, cacheAptitud=True,
+                      metodoSeleccion="ruleta", tamTorneo=3, metodoCruce="ordenado"):
     """
         Funcion: Ejecuta el algoritmo genetico para resolver el problema del agente viajero.
 
@@ -41,15 +71,26 @@ def algoritmoGenetico(municipios, tampoblacion, indivSeleccionados, razonMutacio
             razonMutacion (float): La tasa de mutacion.
             generaciones (int): El numero de generaciones a ejecutar.
             verbose (bool): Si es True, imprime el progreso durante la ejecucion.
+            cacheAptitud (bool): Reutiliza la distancia de la elite que pasa sin mutar.
+            metodoSeleccion (str): Seleccion de los no elite: "ruleta", "universal" (SUS) o "torneo".
+            tamTorneo (int): Participantes de cada torneo (solo metodo "torneo").
+            metodoCruce (str): Cruce de los no elite: "ordenado", "pmx" (parcialmente mapeado)
+                o "aristas" (recombinacion de aristas).
 
         Retorna:
             Una tupla con la mejor ruta encontrada y su distancia total.
     """
+    # las distancias entre municipios se calculan una sola vez; las rutas son
+    # permutaciones de indices (np.int32) y su distancia se lee de la matriz
+    matriz = matrizDistancias(municipios)
+    # las rutas que sobreviven sin cambios (elite) no se vuelven a evaluar
+    cache = CacheAptitud() if cacheAptitud else None
+
     # se crea la poblacion inicial de manera aleatoria
-    poblacion = poblacionInicial(tampoblacion, municipios)
+    poblacion = poblacionInicialIndices(tampoblacion, len(municipios))
 
     # se calcula la distancia de la mejor ruta en la poblacion inicial
-    mejorAptitudInicial = clasificacionRutas(poblacion)[0][1]
+    mejorAptitudInicial = clasificacionRutas(poblacion, matriz, cache)[0][1]
     distanciaInicial = 1 / mejorAptitudInicial
 
     # si verbose es True, se imprime la distancia inicial
@@ -58,18 +99,19 @@ def algoritmoGenetico(municipios, tampoblacion, indivSeleccionados, razonMutacio
 
     # bucle principal que itera a traves de las generaciones
     for i in range(generaciones):
-        poblacion = siguienteGeneracion(poblacion, indivSeleccionados, razonMutacion)
+        poblacion = siguienteGeneracion(poblacion, indivSeleccionados, razonMutacion, matriz, cache, metodoSeleccion, tamTorneo, metodoCruce)
 
         # imprime el progreso cada 10 generaciones
         if verbose and (i + 1) % 10 == 0: 
-            mejorAptitud = clasificacionRutas(poblacion)[0][1]
+            mejorAptitud = clasificacionRutas(poblacion, matriz, cache)[0][1]
             distancia = 1 / mejorAptitud
             print(f"Generacion {i + 1:4}  Distancia: {distancia:.2f}")
     
     # al final se obtiene la mejor ruta y su distancia de la poblacion final
-    mejorIndice = clasificacionRutas(poblacion)[0][0]
-    mejorRuta = poblacion[mejorIndice]
-    mejorAptitud = clasificacionRutas(poblacion)[0][1]
+    # con una sola clasificacion
+    mejorIndice, mejorAptitud = clasificacionRutas(poblacion, matriz, cache)[0]
+    # los indices se traducen a los municipios para reportar sus nombres
+    mejorRuta = [municipios[i] for i in poblacion[mejorIndice]]
     distanciaFinal = 1 / mejorAptitud
 
     # se imprime la distancia final y la mejor ruta encontrada
@@ -81,5 +123,7 @@ def algoritmoGenetico(municipios, tampoblacion, indivSeleccionados, razonMutacio
         for i, ciudad in enumerate(mejorRuta):
             print(f"  {i + 1:2}: {ciudad}") 
         print(f"  {len(mejorRuta) + 1:2}: Regresa a {mejorRuta[0]}") 
+        if cache is not None:
+            print(cache.reporte())
     # retorna la mejor ruta y su distancia
     return mejorRuta, distanciaFinal
\ No newline at end of file
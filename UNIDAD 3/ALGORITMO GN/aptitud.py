@@ -1,22 +1,28 @@
 
+import numpy as np
+
 class Aptitud:
     """
     Clase: Calcula la aptitud (fitness) de una ruta en el problema del agente viajero.
     La aptitud se basa en la distancia total recorrida: a menor distancia, mayor aptitud.
     """
      
-    def __init__(self, ruta):
+    def __init__(self, ruta, matrizDistancia=None):
         """
         Funcion: Constructor de la clase Aptitud.
 
         Argumentos:
-            ruta (list): Lista de objetos 'municipio' que representan una ruta.
+            ruta (list): Lista de objetos 'municipio' que representan una ruta, o
+                permutacion de indices (np.ndarray int32) si se da matrizDistancia.
+            matrizDistancia (np.ndarray): Matriz de distancias entre municipios (opcional).
 
         Retorna:
             None. Inicializa los atributos distancia y f_aptitud.
         """
         # Lista de municipios que forman la ruta
         self.ruta = ruta     
+        # Matriz de distancias precalculada (None = se usa municipio.distancia)
+        self.matrizDistancia = matrizDistancia
         # Variable para almacenar la distancia total   
         self.distancia = 0    
         # Valor de aptitud (fitness) de la ruta  
@@ -33,7 +39,10 @@ class Aptitud:
             float: Distancia total recorrida por la ruta.
         """
         # Solo calcula la distancia una vez (si aun no se ha hecho)
-        if self.distancia == 0:
+        # con matriz precalculada la ruta es una permutacion de indices
+        if self.distancia == 0 and self.matrizDistancia is not None:
+            self.distancia = distanciaIndices(self.ruta, self.matrizDistancia)
+        elif self.distancia == 0:
             distanciaTotal = 0
             # Recorre todos los municipios de la ruta
             for i in range(len(self.ruta)):
@@ -59,4 +68,45 @@ class Aptitud:
         # Solo calcula la aptitud una vez (si aun no se ha hecho)
         if self.f_aptitud == 0:
             self.f_aptitud = 1 / float(self.distanciaRuta()) # Asigna su inverso como valor de aptitud (menor distancia = mayor aptitud)
-        return self.f_aptitud
\ No newline at end of file
+        return self.f_aptitud
+
+def distanciaIndices(ruta, matrizDistancia):
+    """
+    Funcion: Calcula la distancia de una ruta cerrada representada como permutacion
+    de indices, con una sola lectura indexada de la matriz de distancias.
+
+    Argumentos:
+        ruta (np.ndarray): Permutacion de indices de municipios.
+        matrizDistancia (np.ndarray): Matriz de distancias entre municipios.
+
+    Retorna:
+        float: Distancia total recorrida por la ruta (incluye el regreso al inicio).
+    """
+    # cada municipio con el siguiente; np.roll cierra el ciclo (el ultimo con el primero)
+    return float(matrizDistancia[ruta, np.roll(ruta, -1)].sum())
+
+def distanciasPoblacion(poblacion, matrizDistancia):
+    """
+    Funcion: Calcula la distancia de todas las rutas cerradas de una poblacion en una
+    sola operacion vectorizada.
+
+    Argumentos:
+        poblacion (np.ndarray): Arreglo (tamano de poblacion x numero de municipios)
+            con una permutacion de indices por renglon (o lista de permutaciones).
+        matrizDistancia (np.ndarray): Matriz de distancias entre municipios.
+
+    Retorna:
+        np.ndarray: Distancia de cada ruta, en el orden de la poblacion.
+    """
+    poblacion = np.asarray(poblacion)
+    n = matrizDistancia.shape[1]
+    # siguiente municipio de cada posicion; el ultimo de cada renglon regresa al primero
+    siguientes = np.empty_like(poblacion)
+    siguientes[:, :-1] = poblacion[:, 1:]
+    siguientes[:, -1] = poblacion[:, 0]
+    # indice plano i * n + j: una sola lectura con take sobre la matriz aplanada es mas
+    # rapida que el indexado con dos arreglos
+    tramos = poblacion.astype(np.intp)
+    tramos *= n
+    tramos += siguientes
+    return matrizDistancia.ravel().take(tramos).sum(axis=1)
@@ -0,0 +1,88 @@
+import numpy as np
+from aptitud import distanciasPoblacion
+
+class CacheAptitud:
+    """
+    Clase: Distancias conocidas de la poblacion actual. Los individuos que pasan sin
+    cambios a la siguiente generacion (elite que no muto) conservan su distancia y solo
+    se evaluan los renglones nuevos. La reutilizacion va por posicion en la poblacion,
+    sin hash ni copia de las rutas: buscar la ruta costaria mas que evaluarla.
+    """
+
+    def __init__(self):
+        """
+        Funcion: Constructor de la clase CacheAptitud.
+
+        Argumentos:
+            Ninguno.
+
+        Retorna:
+            None. Inicializa la memoria y los contadores.
+        """
+        # poblacion a la que corresponden las distancias (se compara por identidad)
+        self.poblacion = None
+        # distancia de cada renglon de la poblacion, NaN si falta evaluarlo
+        self.conocidas = None
+        # Rutas cuya distancia se reutilizo
+        self.aciertos = 0
+        # Rutas que se tuvieron que evaluar
+        self.fallos = 0
+
+    def distancias(self, poblacion, matrizDistancia):
+        """
+        Funcion: Obtiene la distancia de cada ruta, evaluando solo los renglones que no se conocen.
+
+        Argumentos:
+            poblacion (np.ndarray): Arreglo (tamano de poblacion x numero de municipios).
+            matrizDistancia (np.ndarray): Matriz de distancias entre municipios.
+
+        Retorna:
+            np.ndarray: Distancia de cada ruta, en el orden de la poblacion.
+        """
+        # otra poblacion (no la heredada ni la ultima evaluada) se evalua completa
+        if poblacion is not self.poblacion or self.conocidas is None:
+            conocidas = np.full(len(poblacion), np.nan)
+        else:
+            conocidas = self.conocidas
+        nuevas = np.isnan(conocidas)
+        numNuevas = int(nuevas.sum())
+        if numNuevas:
+            conocidas = conocidas.copy()
+            conocidas[nuevas] = distanciasPoblacion(np.asarray(poblacion)[nuevas], matrizDistancia)
+        self.aciertos += len(conocidas) - numNuevas
+        self.fallos += numNuevas
+        self.poblacion = poblacion
+        self.conocidas = conocidas
+        return conocidas
+
+    def heredar(self, nuevaPoblacion, origen):
+        """
+        Funcion: Pasa las distancias conocidas a la siguiente generacion.
+
+        Argumentos:
+            nuevaPoblacion (np.ndarray): La nueva generacion.
+            origen (np.ndarray): Para cada renglon de la nueva generacion, el renglon de la
+                poblacion actual del que es copia sin cambios, o -1 si es nuevo.
+
+        Retorna:
+            None.
+        """
+        previas = self.conocidas if self.conocidas is not None else np.full(1, np.nan)
+        origen = np.asarray(origen)
+        self.conocidas = np.where(origen >= 0, previas[np.maximum(origen, 0)], np.nan)
+        self.poblacion = nuevaPoblacion
+
+    def reporte(self):
+        """
+        Funcion: Resume el uso de la memoria.
+
+        Argumentos:
+            Ninguno.
+
+        Retorna:
+            str: Aciertos, fallos y porcentaje de evaluaciones ahorradas.
+        """
+        consultas = self.aciertos + self.fallos
+        ahorro = 100 * self.aciertos / consultas if consultas else 0.0
+        return (f"Cache de aptitud: {self.aciertos} aciertos, {self.fallos} fallos "
+                f"({ahorro:.1f}% de evaluaciones ahorradas)")
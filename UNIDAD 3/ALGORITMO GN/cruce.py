@@ -0,0 +1,213 @@
+import random
+import numpy as np
+from seleccion import generadorDesdeRandom
+
+# metodos de cruce disponibles para permutaciones de indices
+METODOS_CRUCE = ("ordenado", "pmx", "aristas")
+
+def puntosCorte(n):
+    """
+        Funcion: Elige dos puntos de corte aleatorios como el cruce original.
+
+        Argumento:
+            n: Numero de municipios de la ruta.
+
+        Retorna:
+            Una tupla (genInicial, genFinal) con genInicial <= genFinal.
+    """
+    genA = int(random.random() * n)
+    genB = int(random.random() * n)
+    return min(genA, genB), max(genA, genB)
+
+def cruceOrdenado(progenitor1, progenitor2):
+    """
+        Funcion: Cruce ordenado en O(n): el segmento del progenitor 1 seguido de los
+        demas municipios en el orden del progenitor 2.
+
+        Argumento:
+            progenitor1: Permutacion de indices (np.ndarray).
+            progenitor2: Permutacion de indices (np.ndarray).
+
+        Retorna:
+            Una nueva ruta hija del mismo tipo que sus progenitores.
+    """
+    genInicial, genFinal = puntosCorte(len(progenitor1))
+    segmento = progenitor1[genInicial:genFinal]
+    # mascara de presencia: sustituye a `item not in hijoP1`, que era O(n) por municipio
+    presente = np.zeros(len(progenitor1), dtype=bool)
+    presente[segmento] = True
+    return np.concatenate((segmento, progenitor2[~presente[progenitor2]]))
+
+def crucePMX(progenitor1, progenitor2):
+    """
+        Funcion: Cruce parcialmente mapeado (PMX): el segmento del progenitor 1 queda en
+        su lugar y los demas genes vienen del progenitor 2 en su posicion, siguiendo el
+        mapeo del segmento cuando el municipio ya esta en el hijo.
+
+        Argumento:
+            progenitor1: Permutacion de indices (np.ndarray).
+            progenitor2: Permutacion de indices (np.ndarray).
+
+        Retorna:
+            Una nueva ruta hija del mismo tipo que sus progenitores.
+    """
+    genInicial, genFinal = puntosCorte(len(progenitor1))
+    return crucePMXLote(progenitor1[None, :], progenitor2[None, :],
+                        np.array([genInicial]), np.array([genFinal]))[0]
+
+def cruceAristas(progenitor1, progenitor2):
+    """
+        Funcion: Cruce por recombinacion de aristas (ERX): el hijo se arma usando las
+        conexiones de ambos progenitores, eligiendo siempre al vecino con menos
+        conexiones pendientes.
+
+        Argumento:
+            progenitor1: Permutacion de indices (np.ndarray).
+            progenitor2: Permutacion de indices (np.ndarray).
+
+        Retorna:
+            Una nueva ruta hija del mismo tipo que sus progenitores.
+    """
+    n = len(progenitor1)
+    # tabla de aristas: para cada municipio sus vecinos en ambas vueltas (sin repetir)
+    vecinos = np.stack((np.roll(progenitor1, 1), np.roll(progenitor1, -1),
+                        np.roll(progenitor2, 1), np.roll(progenitor2, -1)), axis=1)
+    tabla = np.empty((n, 4), dtype=vecinos.dtype)
+    tabla[progenitor1, :2] = vecinos[:, :2]
+    posicion2 = np.empty(n, dtype=np.int64)
+    posicion2[progenitor2] = np.arange(n)
+    tabla[:, 2:] = vecinos[posicion2, 2:]
+    aristas = [set(fila) for fila in tabla.tolist()]
+
+    # municipios sin visitar; `lugar` permite quitar uno en O(1) intercambiandolo con el ultimo
+    pendientes = list(range(n))
+    lugar = list(range(n))
+    hijo = np.empty(n, dtype=progenitor1.dtype)
+    actual = int(progenitor1[0])
+    for i in range(n):
+        hijo[i] = actual
+        # quitar el municipio actual de los pendientes y de las listas de sus vecinos
+        ultimo = pendientes.pop()
+        if ultimo != actual:
+            pendientes[lugar[actual]] = ultimo
+            lugar[ultimo] = lugar[actual]
+        for vecino in aristas[actual]:
+            aristas[vecino].discard(actual)
+        if not pendientes:
+            break
+        candidatos = aristas[actual]
+        if candidatos:
+            # el vecino con menos aristas pendientes (empates al azar)
+            menor = min(len(aristas[c]) for c in candidatos)
+            actual = random.choice(sorted(c for c in candidatos if len(aristas[c]) == menor))
+        else:
+            # sin vecinos pendientes se salta a un municipio al azar
+            actual = random.choice(pendientes)
+    return hijo
+
+def cruceOrdenadoLote(padres1, padres2, inicios, finales):
+    """
+        Funcion: Cruce ordenado de todas las parejas a la vez.
+
+        Argumento:
+            padres1: Arreglo (parejas x municipios) con el primer progenitor de cada pareja.
+            padres2: Arreglo (parejas x municipios) con el segundo progenitor.
+            inicios: Punto de corte inicial de cada pareja.
+            finales: Punto de corte final de cada pareja.
+
+        Retorna:
+            Arreglo (parejas x municipios) con los hijos.
+    """
+    n = padres1.shape[1]
+    posiciones = np.arange(n)
+    enSegmento = (posiciones >= inicios[:, None]) & (posiciones < finales[:, None])
+    # mascara de presencia por renglon: que municipios ya aporto el segmento del progenitor 1
+    presente = np.zeros(padres1.shape, dtype=bool)
+    np.put_along_axis(presente, padres1, enSegmento, axis=1)
+    faltantes = ~np.take_along_axis(presente, padres2, axis=1)
+    # cada renglon conserva exactamente n genes: su segmento y despues los faltantes en el orden del progenitor 2
+    genes = np.concatenate((padres1, padres2), axis=1)
+    return genes[np.concatenate((enSegmento, faltantes), axis=1)].reshape(padres1.shape)
+
+def crucePMXLote(padres1, padres2, inicios, finales):
+    """
+        Funcion: Cruce PMX de todas las parejas a la vez.
+
+        Argumento:
+            padres1: Arreglo (parejas x municipios) con el primer progenitor de cada pareja.
+            padres2: Arreglo (parejas x municipios) con el segundo progenitor.
+            inicios: Punto de corte inicial de cada pareja.
+            finales: Punto de corte final de cada pareja.
+
+        Retorna:
+            Arreglo (parejas x municipios) con los hijos.
+    """
+    parejas, n = padres1.shape
+    posiciones = np.arange(n)
+    enSegmento = (posiciones >= inicios[:, None]) & (posiciones < finales[:, None])
+    presente = np.zeros(padres1.shape, dtype=bool)
+    np.put_along_axis(presente, padres1, enSegmento, axis=1)
+    # posicion de cada municipio en el progenitor 1 (para seguir el mapeo del segmento)
+    posicion1 = np.empty(padres1.shape, dtype=np.int64)
+    np.put_along_axis(posicion1, padres1, np.broadcast_to(posiciones, padres1.shape), axis=1)
+
+    hijos = np.where(enSegmento, padres1, padres2)
+    renglones = np.arange(parejas)[:, None]
+    # fuera del segmento, un municipio repetido se cambia por el que ocupa su lugar en
+    # el progenitor 2; la cadena termina a lo mas en la longitud del segmento
+    repetido = ~enSegmento & presente[renglones, hijos]
+    while repetido.any():
+        filas, columnas = np.nonzero(repetido)
+        valores = hijos[filas, columnas]
+        hijos[filas, columnas] = padres2[filas, posicion1[filas, valores]]
+        repetido[filas, columnas] = presente[filas, hijos[filas, columnas]]
+    return hijos
+
+def cruceAristasLote(padres1, padres2, inicios=None, finales=None):
+    """
+        Funcion: Cruce por recombinacion de aristas de todas las parejas. Cada hijo se
+        construye paso a paso, asi que se cruza pareja por pareja; los puntos de corte
+        no se usan y solo estan para compartir la interfaz.
+
+        Argumento:
+            padres1: Arreglo (parejas x municipios) con el primer progenitor de cada pareja.
+            padres2: Arreglo (parejas x municipios) con el segundo progenitor.
+
+        Retorna:
+            Arreglo (parejas x municipios) con los hijos.
+    """
+    hijos = np.empty_like(padres1)
+    for k in range(len(padres1)):
+        hijos[k] = cruceAristas(padres1[k], padres2[k])
+    return hijos
+
+# metodo -> (cruce de una pareja, cruce de un lote de parejas)
+CRUCES = {
+    "ordenado": (cruceOrdenado, cruceOrdenadoLote),
+    "pmx": (crucePMX, crucePMXLote),
+    "aristas": (cruceAristas, cruceAristasLote),
+}
+
+def cruzar(padres1, padres2, metodo="ordenado", gen=None):
+    """
+        Funcion: Produce todos los hijos de una generacion a partir de los arreglos de
+        progenitores con el metodo indicado.
+
+        Argumento:
+            padres1: Arreglo (parejas x municipios) con el primer progenitor de cada pareja.
+            padres2: Arreglo (parejas x municipios) con el segundo progenitor.
+            metodo: "ordenado", "pmx" o "aristas".
+            gen: Generador de numpy para los puntos de corte (None = se crea uno a partir de random).
+
+        Retorna:
+            Arreglo (parejas x municipios) con los hijos.
+    """
+    if metodo not in CRUCES:
+        raise ValueError(f"Metodo de cruce desconocido: {metodo} (opciones: {', '.join(METODOS_CRUCE)})")
+    padres1 = np.asarray(padres1)
+    padres2 = np.asarray(padres2)
+    if gen is None:
+        gen = generadorDesdeRandom()
+    parejas, n = padres1.shape
+    cortes = np.sort(gen.integers(0, n, size=(parejas, 2)), axis=1)
+    return CRUCES[metodo][1](padres1, padres2, cortes[:, 0], cortes[:, 1])
@@ -46,4 +46,22 @@ class municipio:
         Retorna:
             str: Cadena que muestra el nombre del municipio y sus coordenadas (x, y).
         """
-        return f"{self.nombre} ({self.x},{self.y})"
\ No newline at end of file
+        return f"{self.nombre} ({self.x},{self.y})"
+
+def matrizDistancias(municipios):
+    """
+    Funcion: Construye una sola vez la matriz de distancias euclidianas entre todos
+    los municipios, para que la aptitud se calcule con busquedas en la matriz.
+
+    Argumentos:
+        municipios (list): Lista de objetos 'municipio'; el indice de cada municipio
+            en la lista es su indice en la matriz.
+
+    Retorna:
+        np.ndarray: Matriz (n x n) con matriz[i, j] = municipios[i].distancia(municipios[j]).
+    """
+    # coordenadas como arreglo (n x 2) y diferencias de todos los pares con broadcasting
+    coordenadas = np.array([[m.x, m.y] for m in municipios], dtype=np.float64)
+    diferencias = coordenadas[:, None, :] - coordenadas[None, :, :]
+    # misma formula que municipio.distancia
+    return np.sqrt((diferencias ** 2).sum(axis=2))
@@ -1,8 +1,9 @@
 import random
-import pandas as pd
 import numpy as np
 import operator
-from aptitud import Aptitud
+from aptitud import Aptitud, distanciasPoblacion
+from seleccion import seleccionar
+from cruce import cruceOrdenado, cruzar, puntosCorte
 
 def crearRuta(listaMunicipios):
     """
@@ -17,6 +18,31 @@ def crearRuta(listaMunicipios):
     # con random.sample creamos municipios aleatorios de la lista de municipios
     return random.sample(listaMunicipios, len(listaMunicipios))
 
+def crearRutaIndices(numMunicipios):
+    """
+        Funcion: Crea una ruta aleatoria como permutacion de indices de municipios.
+
+        Argumento:
+            numMunicipios: Numero de municipios.
+        
+        Retorna:
+            Un arreglo np.int32 con una permutacion aleatoria de 0..numMunicipios-1.
+    """
+    return np.array(random.sample(range(numMunicipios), numMunicipios), dtype=np.int32)
+
+def poblacionInicialIndices(tamanoPob, numMunicipios):
+    """
+        Funcion: Crea una poblacion inicial de rutas como permutaciones de indices.
+
+        Argumento:
+            tamanoPob: El tamano de la poblacion.
+            numMunicipios: Numero de municipios.
+        
+        Retorna:
+            Un arreglo np.int32 (tamanoPob x numMunicipios) con una ruta por renglon.
+    """
+    return np.array([crearRutaIndices(numMunicipios) for _ in range(tamanoPob)], dtype=np.int32)
+
 def poblacionInicial(tamanoPob, listaMunicipios):
     """
         Funcion: Crea una poblacion inicial de rutas.
@@ -34,16 +60,23 @@ def poblacionInicial(tamanoPob, listaMunicipios):
         poblacion.append(crearRuta(listaMunicipios))
     return poblacion
 
-def clasificacionRutas(poblacion):
+def clasificacionRutas(poblacion, matrizDistancia=None, cache=None):
     """
         Funcion: Clasifica las rutas en la poblacion segun su aptitud.
 
         Argumento:
             poblacion: Una lista de rutas.
+            matrizDistancia: Matriz de distancias si las rutas son permutaciones de indices.
+            cache: CacheAptitud con las distancias conocidas de la poblacion (opcional).
 
         Retorna:
             Una lista ordenada de tuplas (indice, aptitud).
     """
+    # con permutaciones de indices toda la poblacion se evalua de una vez
+    if matrizDistancia is not None:
+        orden, aptitudes = clasificacionPoblacion(poblacion, matrizDistancia, cache)
+        return list(zip(orden.tolist(), aptitudes[orden].tolist()))
+
     aptitudRutas = {}
     # calcula la aptitud para cada ruta y la almacena con su indice
     for i in range(0, len(poblacion)):
@@ -51,39 +84,47 @@ def clasificacionRutas(poblacion):
         # ordena el diccionario por el valor de aptitud de forma decendente
     return sorted(aptitudRutas.items(), key=operator.itemgetter(1), reverse=True)
 
-def seleccionRutas(poblacionRanked, numSeleccionados):
+def clasificacionPoblacion(poblacion, matrizDistancia, cache=None):
+    """
+        Funcion: Clasifica toda la poblacion de permutaciones de indices con una sola
+        evaluacion vectorizada.
+
+        Argumento:
+            poblacion: Arreglo (tamano de poblacion x numero de municipios) o lista de permutaciones.
+            matrizDistancia: Matriz de distancias entre municipios.
+            cache: CacheAptitud; solo se evaluan los renglones sin distancia conocida (opcional).
+
+        Retorna:
+            Una tupla (orden, aptitudes): los indices de las rutas de mayor a menor aptitud
+            y la aptitud (1 / distancia) de cada ruta en el orden de la poblacion.
+    """
+    if cache is not None:
+        distancias = cache.distancias(poblacion, matrizDistancia)
+    else:
+        distancias = distanciasPoblacion(poblacion, matrizDistancia)
+    # argsort estable sobre la distancia: a igual aptitud se conserva el orden de la poblacion
+    orden = np.argsort(distancias, kind='stable')
+    return orden, 1 / distancias
+
+def seleccionRutas(poblacionRanked, numSeleccionados, metodo="ruleta", tamTorneo=3):
     """
         Funcion: Selecciona los individuos para la proxima generacion.
 
         Argumento:
             poblacionRanked: Una lista ordenada de tuplas (indice, aptitud).
             numSeleccionados: El numero de individuos de elite a seleccionar.
+            metodo: Seleccion de los demas individuos: "ruleta", "universal" o "torneo".
+            tamTorneo: Participantes de cada torneo (solo metodo "torneo").
         
         Retorna:
             Una lista de indices de los individuos seleccionados.
     """
-    seleccionados = []
-    # convierte la lista clasificada en un DF para facilitar los calculos de ruleta
-    df = pd.DataFrame(np.array(poblacionRanked), columns=["Indice", "Aptitud"])
-    # calcula la suma acumulada de las aptitudes
-    df['sumaAcumulada'] = df.Aptitud.cumsum()
-    # calcula el porcentaje acumulado para simular la ruleta
-    df['porcentajeAcumulado'] = 100 * df.sumaAcumulada / df.Aptitud.sum()
-
-    # Primero se agregan los individuos de elite (los mejores)
-    for i in range(0, numSeleccionados):
-        seleccionados.append(poblacionRanked[i][0])
-
-    # Segundo se seleccionan los demas por el metodo de la ruleta
-    # se selecciona un numero de individuos igual al tamaño de la poblacion menos la elite
-    for _ in range(0, len(poblacionRanked) - numSeleccionados):
-        umbral = random.random() * 100
-        for j in range(len(poblacionRanked)):
-            # si el umbral cae dentro del rango de porcentaje del individuo se selcciona
-            if umbral <= df.iat[j, 3]:
-                seleccionados.append(poblacionRanked[j][0])
-                break # sale del bucle para seleccionar al siguiente individuo
-    return seleccionados
+    # la clasificacion se pasa a arreglos: indices de mejor a peor y aptitud por indice
+    orden = np.array([indice for indice, _ in poblacionRanked], dtype=np.int64)
+    aptitudes = np.empty(len(orden))
+    aptitudes[orden] = [aptitud for _, aptitud in poblacionRanked]
+    # primero la elite y despues la ruleta (suma acumulada + busqueda binaria) u otro metodo
+    return seleccionar(orden, aptitudes, numSeleccionados, metodo, tamTorneo=tamTorneo).tolist()
 
 def grupoApareamiento(poblacion, seleccionados):
     """
@@ -114,31 +155,27 @@ def cruce(progenitor1, progenitor2):
         Retorna:
             Una nueva ruta hija.
     """
-    hijo = []
-    hijoP1 = []
-    hijoP2 = []
+    # las permutaciones de indices usan el cruce ordenado con mascara de presencia (O(n))
+    if isinstance(progenitor1, np.ndarray):
+        return cruceOrdenado(progenitor1, progenitor2)
     # elige dos puntos de corte aleatorios
-    genA = int(random.random() * len(progenitor1))
-    genB = int(random.random() * len(progenitor1))
-
-    genInicial = min(genA, genB)
-    genFinal = max(genA, genB)
+    genInicial, genFinal = puntosCorte(len(progenitor1))
     # el segmento central se toma del progenitor 1
-    for i in range(genInicial, genFinal):
-        hijoP1.append(progenitor1[i])
-    # se toman los genes restantes del progenitor 2
-    hijoP2 = [item for item in progenitor2 if item not in hijoP1]
+    hijoP1 = progenitor1[genInicial:genFinal]
+    # se toman los genes restantes del progenitor 2 (un conjunto para buscar en O(1))
+    enSegmento = set(hijoP1)
+    hijoP2 = [item for item in progenitor2 if item not in enSegmento]
     # combina el segmento del progenitor 1 y los genes del progenitor 2
-    hijo = hijoP1 + hijoP2
-    return hijo
+    return hijoP1 + hijoP2
 
-def crucePoblacion(grupoApareamiento, indivSelecionados):
+def crucePoblacion(grupoApareamiento, indivSelecionados, metodo="ordenado"):
     """
         Funcion: Crea una nueva poblacion a traves de la reproduccion.
 
         Argumento:
             grupoApareamiento: El grupo de rutas para apareamiento.
             indivSelecionados: El numero de individuos de elite.
+            metodo: Cruce de las permutaciones de indices: "ordenado", "pmx" o "aristas".
         
         Retorna:
             Una nueva poblacion de rutas hijas.
@@ -152,6 +189,12 @@ def crucePoblacion(grupoApareamiento, indivSelecionados):
     for i in range(0,indivSelecionados):
         hijos.append(grupoApareamiento[i])
     
+    # con permutaciones de indices todos los hijos se producen de una vez
+    if tamano_no_elite > 0 and isinstance(grupoApareamiento[0], np.ndarray):
+        padres = np.asarray(espacio)
+        hijos.extend(cruzar(padres[:tamano_no_elite], padres[::-1][:tamano_no_elite], metodo))
+        return hijos
+
     # Se cruzan los demas para completar la poblacion
     for i in range(0, tamano_no_elite):
         hijo = cruce(espacio[i], espacio[len(grupoApareamiento)-i-1])
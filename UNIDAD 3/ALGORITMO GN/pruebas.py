@@ -1,7 +1,12 @@
 import random
-from municipio import municipio
-from aptitud import Aptitud
-from operadorGenetico import clasificacionRutas
+import numpy as np
+from municipio import municipio, matrizDistancias
+from aptitud import Aptitud, distanciasPoblacion
+from cacheAptitud import CacheAptitud
+from operadorGenetico import clasificacionRutas, clasificacionPoblacion, seleccionRutas, poblacionInicialIndices
+from algoritmoGenetico import siguienteGeneracion
+from seleccion import seleccionar
+from cruce import cruzar, cruceOrdenadoLote, crucePMXLote, cruceAristas
 
 # --- Datos de prueba ---
 # usamos un conjunto pequeño de municipios para que los resultados
@@ -93,11 +98,165 @@ def pruebaClasificacionRutas():
         print(f"FALLO: Se esperaba que la ruta con indice 1 fuera la mejor, pero fue la de indice {clasificacion[0][0]}")
     print("-" * 50)
 
+def pruebaMatrizDistancias():
+    """Prueba que la matriz precalculada coincida con municipio.distancia y que la aptitud por indices sea la misma"""
+
+    print("Iniciando Prueba: Matriz de distancias y rutas por indices")
+    matriz = matrizDistancias(listaMunicipiosPrueba)
+    esperada = [[a.distancia(b) for b in listaMunicipiosPrueba] for a in listaMunicipiosPrueba]
+    if np.array_equal(matriz, np.array(esperada)):
+        print("PASO: La matriz coincide con la distancia entre municipios")
+    else:
+        print("FALLO: La matriz no coincide con la distancia entre municipios")
+
+    # ruta A -> B -> C -> D -> A como permutacion de indices, distancia esperada 14
+    ruta = np.array([0, 1, 2, 3], dtype=np.int32)
+    distancia_calculada = Aptitud(ruta, matriz).distanciaRuta()
+    if distancia_calculada == 14.0:
+        print(f"PASO: La distancia de la ruta por indices es correcta ({distancia_calculada})")
+    else:
+        print(f"FALLO: La distancia de la ruta por indices debia ser 14.0, pero fue {distancia_calculada}")
+    print("-" * 50)
+
+def pruebaClasificacionPoblacion():
+    """Prueba que la evaluacion vectorizada de la poblacion ordene igual que ruta por ruta"""
+
+    print("Iniciando Prueba: Clasificacion vectorizada de la poblacion")
+    matriz = matrizDistancias(listaMunicipiosPrueba)
+    # A-C-B-D (18), A-B-C-D (14) y A-B-D-C (16) como renglones de la poblacion
+    poblacion = np.array([[0, 2, 1, 3], [0, 1, 2, 3], [0, 1, 3, 2]], dtype=np.int32)
+    orden, aptitudes = clasificacionPoblacion(poblacion, matriz)
+    esperado = [i for i, _ in clasificacionRutas([[listaMunicipiosPrueba[k] for k in r] for r in poblacion])]
+
+    if orden.tolist() == esperado:
+        print(f"PASO: El orden vectorizado coincide con el de Aptitud ({orden.tolist()})")
+    else:
+        print(f"FALLO: El orden debia ser {esperado}, pero fue {orden.tolist()}")
+    if abs(aptitudes[1] - 1 / 14.0) < 1e-9:
+        print("PASO: La aptitud de la mejor ruta es 1/14")
+    else:
+        print(f"FALLO: La aptitud de la mejor ruta debia ser {1 / 14.0:.6f}, pero fue {aptitudes[1]:.6f}")
+    print("-" * 50)
+
+def pruebaCacheAptitud():
+    """Prueba que la elite que pasa sin mutar conserve su distancia y solo se evaluen las rutas nuevas"""
+
+    print("Iniciando Prueba: Cache de aptitud")
+    random.seed(4)
+    matriz = matrizDistancias(listaMunicipiosPrueba)
+    cache = CacheAptitud()
+    poblacion = poblacionInicialIndices(6, len(listaMunicipiosPrueba))
+    # sin mutacion las 2 rutas de elite pasan iguales: solo se evaluan los 4 hijos
+    nueva = siguienteGeneracion(poblacion, 2, 0.0, matriz, cache)
+    cache.distancias(nueva, matriz)
+    if cache.fallos == 6 + 4 and cache.aciertos == 2:
+        print("PASO: La elite sin mutar no se vuelve a evaluar")
+    else:
+        print(f"FALLO: Se esperaban 10 fallos y 2 aciertos, pero hubo {cache.fallos} fallos y {cache.aciertos} aciertos")
+
+    # con mutacion (en su lugar) las distancias heredadas deben seguir siendo exactas
+    for _ in range(5):
+        nueva = siguienteGeneracion(nueva, 2, 0.5, matriz, cache)
+        if not np.array_equal(cache.distancias(nueva, matriz), distanciasPoblacion(nueva, matriz)):
+            print("FALLO: Las distancias reutilizadas no coinciden con una evaluacion completa")
+            break
+    else:
+        print("PASO: Las distancias reutilizadas coinciden con una evaluacion completa")
+    print("-" * 50)
+
+def pruebaSeleccion():
+    """Prueba que la seleccion conserve la elite y devuelva indices validos con cada metodo"""
+
+    print("Iniciando Prueba: Seleccion de individuos")
+    random.seed(3)
+    # 6 individuos, el 4 es el mejor y el 1 el peor
+    orden = np.array([4, 2, 0, 5, 3, 1])
+    aptitudes = np.empty(6)
+    aptitudes[orden] = [0.30, 0.25, 0.20, 0.12, 0.08, 0.05]
+
+    for metodo in ("ruleta", "universal", "torneo"):
+        seleccionados = seleccionar(orden, aptitudes, 2, metodo)
+        if len(seleccionados) == 6 and seleccionados[:2].tolist() == [4, 2] and set(seleccionados.tolist()) <= set(range(6)):
+            print(f"PASO: '{metodo}' conserva la elite [4, 2] y devuelve 6 indices validos")
+        else:
+            print(f"FALLO: '{metodo}' devolvio {seleccionados.tolist()}")
+
+    # la version con tuplas (indice, aptitud) usa la misma seleccion
+    clasificadas = list(zip(orden.tolist(), aptitudes[orden].tolist()))
+    seleccionados = seleccionRutas(clasificadas, 1)
+    if len(seleccionados) == 6 and seleccionados[0] == 4:
+        print("PASO: seleccionRutas conserva al mejor individuo al inicio")
+    else:
+        print(f"FALLO: seleccionRutas devolvio {seleccionados}")
+
+    try:
+        seleccionar(orden, aptitudes, 2, "ranking")
+        print("FALLO: Un metodo desconocido debia lanzar ValueError")
+    except ValueError:
+        print("PASO: Un metodo desconocido lanza ValueError")
+
+    try:
+        # toda la poblacion es elite: no se sortea a nadie, pero el metodo se valida igual
+        seleccionar(orden, aptitudes, len(orden), "ranking")
+        print("FALLO: Un metodo desconocido debia lanzar ValueError aunque todos sean elite")
+    except ValueError:
+        print("PASO: Un metodo desconocido lanza ValueError aunque todos sean elite")
+    print("-" * 50)
+
+def pruebaCruce():
+    """Prueba que cada metodo de cruce produzca permutaciones validas y respete su segmento"""
+
+    print("Iniciando Prueba: Cruce de permutaciones de indices")
+    random.seed(7)
+    padres1 = np.array([[0, 1, 2, 3, 4, 5, 6, 7], [3, 7, 1, 0, 6, 2, 5, 4]], dtype=np.int32)
+    padres2 = np.array([[7, 6, 5, 4, 3, 2, 1, 0], [0, 1, 2, 3, 4, 5, 6, 7]], dtype=np.int32)
+
+    # cortes fijos [2, 5): el segmento 2-3-4 del progenitor 1 y despues 7-6-5-1-0 del progenitor 2
+    hijos = cruceOrdenadoLote(padres1[:1], padres2[:1], np.array([2]), np.array([5]))
+    if hijos[0].tolist() == [2, 3, 4, 7, 6, 5, 1, 0]:
+        print("PASO: El cruce ordenado en lote coincide con el resultado esperado")
+    else:
+        print(f"FALLO: Se esperaba [2, 3, 4, 7, 6, 5, 1, 0], pero fue {hijos[0].tolist()}")
+
+    # PMX: el segmento se queda en su lugar y los repetidos siguen el mapeo (3->4->3... , 2->5)
+    hijos = crucePMXLote(padres1[:1], padres2[:1], np.array([2]), np.array([5]))
+    if hijos[0].tolist() == [7, 6, 2, 3, 4, 5, 1, 0]:
+        print("PASO: PMX conserva el segmento en su lugar y completa con el mapeo")
+    else:
+        print(f"FALLO: Se esperaba [7, 6, 2, 3, 4, 5, 1, 0], pero fue {hijos[0].tolist()}")
+
+    # con progenitores iguales la recombinacion de aristas reproduce la misma vuelta
+    hijo = cruceAristas(padres1[1], padres1[1])
+    aristas = lambda r: {frozenset((int(r[i]), int(r[i - 1]))) for i in range(len(r))}
+    if aristas(hijo) == aristas(padres1[1]):
+        print("PASO: La recombinacion de aristas conserva las aristas comunes")
+    else:
+        print(f"FALLO: El hijo {hijo.tolist()} no conserva las aristas de {padres1[1].tolist()}")
+
+    for metodo in ("ordenado", "pmx", "aristas"):
+        hijos = cruzar(padres1, padres2, metodo)
+        if hijos.shape == padres1.shape and all(sorted(h.tolist()) == list(range(8)) for h in hijos):
+            print(f"PASO: '{metodo}' produce permutaciones validas")
+        else:
+            print(f"FALLO: '{metodo}' produjo {hijos.tolist()}")
+
+    try:
+        cruzar(padres1, padres2, "ciclico")
+        print("FALLO: Un metodo desconocido debia lanzar ValueError")
+    except ValueError:
+        print("PASO: Un metodo de cruce desconocido lanza ValueError")
+    print("-" * 50)
+
 if __name__ == '__main__':
     print("== PRUEBAS DEL ALGORITMO GENETICO ==")
     
     pruebaDistanciaMun()
     pruebaAptitud()
     pruebaClasificacionRutas()
+    pruebaMatrizDistancias()
+    pruebaClasificacionPoblacion()
+    pruebaCacheAptitud()
+    pruebaSeleccion()
+    pruebaCruce()
     
     print("\nPruebas finalizadas.")
\ No newline at end of file
@@ -0,0 +1,108 @@
+import random
+import numpy as np
+
+# metodos de seleccion disponibles para los individuos que no son elite
+METODOS_SELECCION = ("ruleta", "universal", "torneo")
+
+def generadorDesdeRandom():
+    """
+        Funcion: Crea un generador de numpy a partir del modulo random, asi una corrida
+        con random.seed sigue siendo reproducible.
+
+        Retorna:
+            np.random.Generator con semilla tomada de random.
+    """
+    return np.random.default_rng(random.getrandbits(64))
+
+def ruleta(aptitudes, cantidad, gen):
+    """
+        Funcion: Seleccion por ruleta con suma acumulada y busqueda binaria.
+
+        Argumento:
+            aptitudes: Arreglo de aptitudes en el orden de la clasificacion (mejor primero).
+            cantidad: Numero de individuos a seleccionar.
+            gen: Generador de numeros aleatorios de numpy.
+
+        Retorna:
+            Arreglo con las posiciones seleccionadas dentro de la clasificacion.
+    """
+    acumulada = np.cumsum(aptitudes)
+    # cada umbral cae en el primer individuo cuya suma acumulada lo alcanza (O(log P))
+    umbrales = gen.random(cantidad) * acumulada[-1]
+    posiciones = np.searchsorted(acumulada, umbrales, side='left')
+    # el redondeo de la suma acumulada no debe dejar un umbral fuera del arreglo
+    return np.minimum(posiciones, len(aptitudes) - 1)
+
+def muestreoUniversal(aptitudes, cantidad, gen):
+    """
+        Funcion: Muestreo universal estocastico (SUS): un solo numero aleatorio y
+        `cantidad` punteros igualmente espaciados sobre la ruleta.
+
+        Argumento:
+            aptitudes: Arreglo de aptitudes en el orden de la clasificacion (mejor primero).
+            cantidad: Numero de individuos a seleccionar.
+            gen: Generador de numeros aleatorios de numpy.
+
+        Retorna:
+            Arreglo con las posiciones seleccionadas dentro de la clasificacion.
+    """
+    acumulada = np.cumsum(aptitudes)
+    paso = acumulada[-1] / cantidad
+    # a diferencia de la ruleta, cada individuo recibe casi exactamente su parte esperada
+    punteros = gen.random() * paso + paso * np.arange(cantidad)
+    posiciones = np.searchsorted(acumulada, punteros, side='left')
+    # se barajan para que el cruce no empareje siempre a los vecinos de la ruleta
+    return gen.permutation(np.minimum(posiciones, len(aptitudes) - 1))
+
+def torneo(aptitudes, cantidad, gen, tamTorneo=3):
+    """
+        Funcion: Seleccion por torneo: gana el mejor de `tamTorneo` individuos al azar.
+
+        Argumento:
+            aptitudes: Arreglo de aptitudes en el orden de la clasificacion (mejor primero).
+            cantidad: Numero de individuos a seleccionar.
+            gen: Generador de numeros aleatorios de numpy.
+            tamTorneo: Numero de participantes de cada torneo.
+
+        Retorna:
+            Arreglo con las posiciones seleccionadas dentro de la clasificacion.
+    """
+    # como la clasificacion va de mejor a peor, el ganador es la menor posicion del torneo
+    participantes = gen.integers(0, len(aptitudes), size=(cantidad, tamTorneo))
+    return participantes.min(axis=1)
+
+def seleccionar(orden, aptitudes, numElite, metodo="ruleta", gen=None, tamTorneo=3):
+    """
+        Funcion: Selecciona los individuos para la proxima generacion: primero la elite
+        y despues el resto con el metodo indicado.
+
+        Argumento:
+            orden: Indices de la poblacion de mayor a menor aptitud.
+            aptitudes: Aptitud de cada individuo en el orden de la poblacion.
+            numElite: El numero de individuos de elite a conservar.
+            metodo: "ruleta", "universal" o "torneo".
+            gen: Generador de numpy (None = se crea uno a partir de random).
+            tamTorneo: Participantes de cada torneo (solo metodo "torneo").
+
+        Retorna:
+            Arreglo con los indices de la poblacion seleccionados (tantos como individuos).
+    """
+    # el metodo se valida aunque toda la poblacion sea elite y no se sortee a nadie
+    if metodo not in METODOS_SELECCION:
+        raise ValueError(f"Metodo de seleccion desconocido: {metodo} (opciones: {', '.join(METODOS_SELECCION)})")
+    if gen is None:
+        gen = generadorDesdeRandom()
+    orden = np.asarray(orden)
+    aptitudesOrdenadas = np.asarray(aptitudes)[orden]
+    cantidad = len(orden) - numElite
+
+    if cantidad <= 0:
+        posiciones = np.empty(0, dtype=np.int64)
+    elif metodo == "ruleta":
+        posiciones = ruleta(aptitudesOrdenadas, cantidad, gen)
+    elif metodo == "universal":
+        posiciones = muestreoUniversal(aptitudesOrdenadas, cantidad, gen)
+    elif metodo == "torneo":
+        posiciones = torneo(aptitudesOrdenadas, cantidad, gen, tamTorneo)
+
+    return np.concatenate((orden[:numElite], orden[posiciones]))